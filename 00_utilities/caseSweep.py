@@ -0,0 +1,219 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Python script to construct a whole parameter sweep of foam cases at
+#~ once
+#~
+#~ The case constructors (caseConstructorV9.py, caseConstructorV3.py,
+#~ caseConstructorMappedV1.py, ...) build one case from the hard-coded
+#~ parameters in their EDITABLE section. This script runs the chosen
+#~ constructor once for each row of a parameter table (CSV or JSON),
+#~ the rows are processed in parallel (process pool)
+#~
+#~ NOTES:
+#~  - the table columns are names of the constructor variables, their
+#~    values are fixed before the constructor is executed and the
+#~    assignments to these variables in the constructor are skipped
+#~    (derived quantities, e.g. [aD,aT,hC] = meshSizePars(Q0,liqName),
+#~    are thus evaluated with the values from the table)
+#~  - CSV cells are evaluated as python expressions (math available),
+#~    e.g. 60*math.pi/180, cells which are not valid expressions are
+#~    used as strings (e.g. DC05)
+#~  - the variables in fixPars are fixed for all the cases (e.g. the
+#~    control plots of the initial condition are switched off)
+#~  - the output of each constructor run is stored in logDir, a status
+#~    report of all the cases is printed and saved to repNm
+#~
+#~ EXAMPLE OF THE TABLE (sweep.csv):
+#~     Q0,alpha,liqName
+#~     0.26e-6,60*math.pi/180,DC05
+#~     0.52e-6,60*math.pi/180,DC05
+#~     2.00e-6,45*math.pi/180,H2O
+#~ or (sweep.json):
+#~     [{"Q0": 0.26e-6, "alpha": 1.0472, "liqName": "DC05"}, ...]
+
+#USAGE==================================================================
+#  1. Specify the constructor script (scFile) and the table (tabFile)
+#  2. Run the script
+
+#LICENSE================================================================
+#  caseSweep.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import sys
+import ast
+import csv
+import json
+import math
+import time
+import traceback
+from multiprocessing import Pool
+try:
+    from StringIO import StringIO                                       #python 2
+except ImportError:
+    from io import StringIO                                             #python 3
+
+#CUSTOM FUNCTIONS=======================================================
+# A. parameter table----------------------------------------------------
+def parseCell(cell):
+    """ value of the CSV cell (python expression or string)"""
+    cell = cell.strip()
+    try:
+        return ast.literal_eval(cell)
+    except (ValueError,SyntaxError):
+        pass
+    try:
+        return eval(cell,{'math':math,'__builtins__':{}})
+    except Exception:
+        return cell
+
+def readTable(tabFile):
+    """ list of the parameter sets (dictionaries) from CSV or JSON"""
+    if tabFile.endswith('.json'):
+        with open(tabFile,'r') as file:
+            return json.load(file)
+    with open(tabFile,'r') as file:
+        rows = [row for row in csv.DictReader(file)]
+    return [dict((key.strip(),parseCell(val)) for key,val in row.items() if val is not None and val.strip())
+                for row in rows]
+
+# B. constructor execution----------------------------------------------
+class FixedNamespace(dict):
+    """ namespace of the executed constructor, assignments to the fixed
+        variables are skipped"""
+    def __init__(self,glob,fixed):
+        dict.__init__(self)
+        self.glob  = glob                                               #the real (global) namespace
+        self.fixed = set(fixed)
+        glob.update(fixed)
+
+    def __getitem__(self,key):
+        return self.glob[key]
+
+    def __setitem__(self,key,val):
+        if key not in self.fixed:
+            self.glob[key] = val
+
+    def __delitem__(self,key):
+        del self.glob[key]
+
+    def __contains__(self,key):
+        return key in self.glob
+
+    def get(self,key,default=None):
+        return self.glob.get(key,default)
+
+def initWorker(scDir):
+    """ constructors use paths relative to their folder"""
+    import matplotlib
+    matplotlib.use('Agg')                                               #no figure windows in the workers
+    os.chdir(scDir)
+    sys.path.insert(0,scDir)
+
+def buildCase(args):
+    """ run the constructor with the given parameters, returns status"""
+    caseNr,pars = args
+    status = {
+                'caseNr'    : caseNr,
+                'caseDir'   : '',
+                'status'    : 'OK',
+                'time'      : 0.0,
+                'message'   : '',
+             }
+    fixed  = dict(fixPars)
+    fixed.update(pars)
+    glob   = {'__name__':'__main__','__file__':scFile,'__builtins__':__builtins__}
+    out    = StringIO()
+    tStart = time.time()
+    stdout,sys.stdout = sys.stdout,out
+    try:
+        exec(scCode,glob,FixedNamespace(glob,fixed))
+    except BaseException:
+        status['status']  = 'FAILED'
+        status['message'] = traceback.format_exc().strip().split('\n')[-1]
+        out.write(traceback.format_exc())
+    finally:
+        sys.stdout = stdout
+    status['time']    = time.time() - tStart
+    status['caseDir'] = str(glob.get('caseDir',''))
+    with open(os.path.join(logDir,'%03d.log'%caseNr),'w') as file:    #output of the constructor
+        file.write(repr(pars) + '\n\n' + out.getvalue())
+    return status
+
+#INPUT VARIABLES========================================================
+# -- case constructor to run
+scFile  = '../05_freibergExpSetUp/00_Scripts/caseConstructorV9.py'
+
+# -- parameter table
+tabFile = 'sweep.csv'
+
+# -- variables fixed for all the cases
+fixPars = {
+            'pltFlag'   : False,                                        #no control plots of the initial condition
+          }
+
+# -- number of concurrently constructed cases
+nProcs  = 8
+
+#OUTPUT VARIABLE========================================================
+logDir  = 'sweepLogs'                                                   #outputs of the constructor runs
+repNm   = 'sweepReport.csv'                                             #status of all the cases
+
+#DO NOT MODIFY (PREFERABLY)=============================================
+scFile  = os.path.abspath(scFile)
+scDir   = os.path.dirname(scFile)
+logDir  = os.path.abspath(logDir)
+with open(scFile,'r') as file:
+    scCode = compile(file.read(),scFile,'exec')
+
+#PROGRAM ITSELF=========================================================
+if __name__ == '__main__':
+    if not os.path.isdir(logDir):
+        os.makedirs(logDir)
+    parSets = readTable(tabFile)
+    print('Constructing %d cases by %s (%d processes)'%(len(parSets),scFile,nProcs))
+
+    tStart  = time.time()
+    pool    = Pool(nProcs,initWorker,(scDir,))
+    report  = []
+    for status in pool.imap_unordered(buildCase,list(enumerate(parSets))):
+        report.append(status)
+        print('%3d/%d %-7s %6.1f s  %s %s'%(len(report),len(parSets),status['status'],
+                status['time'],status['caseDir'],status['message']))
+    pool.close()
+    pool.join()
+
+    #STATUS REPORT======================================================
+    report.sort(key=lambda status: status['caseNr'])
+    parNames = sorted(set(key for pars in parSets for key in pars))
+    with open(repNm,'w') as file:
+        writer = csv.writer(file)
+        writer.writerow(['caseNr','status','time','caseDir','message'] + parNames)
+        for status in report:
+            pars = parSets[status['caseNr']]
+            writer.writerow([status[key] for key in ['caseNr','status','time','caseDir','message']] +
+                            [pars.get(name,'') for name in parNames])
+
+    nFail = len([status for status in report if status['status'] != 'OK'])
+    print('DONE: %d cases in %.1f s, %d failed (see %s and %s)'%(
+            len(report),time.time() - tStart,nFail,repNm,logDir))
@@ -0,0 +1,147 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Delta transfer of the growing log files from the remote server
+#~
+#~ Instead of re-running rsync (new SSH session + checksum pass over the
+#~ whole file) on each refresh, the fetcher keeps one persistent SSH
+#~ connection (OpenSSH ControlMaster) and asks only for the bytes
+#~ appended after the size of the local mirror. The new bytes are
+#~ appended to the local mirror and returned, so they can be handed over
+#~ directly to the incremental parser (LogParser.feed)
+#~
+#~ NOTES:
+#~  - rServer = None works with a local stand-in directory (testing,
+#~    cases on the same machine), no SSH is used then
+#~  - if the remote file shrinks (case restarted), it is fetched again
+#~    from the beginning
+#~  - large tails are transferred in chunks of maxBytes
+#~
+#~ USAGE:
+#~     fetcher = LogFetcher(rServer,rUser)
+#~     for offset,data in fetcher.fetchTail(caseDir + 'log.interFoam',
+#~                                          checkDir + 'log.interFoam'):
+#~         parser.feed(data,offset)
+
+#LICENSE================================================================
+#  ffetchLog.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import subprocess
+import tempfile
+try:
+    from shlex import quote                                             #python 3
+except ImportError:
+    from pipes import quote                                             #python 2
+
+#CLASS DEFINITION=======================================================
+class LogFetcher(object):
+    """ delta transfer of the appended bytes over a persistent connection"""
+
+    def __init__(self,rServer,rUser='',maxBytes=2**26,persist='10m'):
+        self.rServer  = rServer                                         #None -> local stand-in directory
+        self.rUser    = rUser
+        self.maxBytes = maxBytes                                        #max. bytes transferred at once
+        self.sshCmd   = None
+        if rServer is not None:
+            self.sshCmd = [
+                'ssh',
+                '-o','ControlMaster=auto',                              #share one connection
+                '-o','ControlPath=' + os.path.join(
+                    tempfile.gettempdir(),'procLog-%r@%h:%p'
+                ),
+                '-o','ControlPersist=' + persist,                       #keep it open between refreshes
+                (rUser + '@' if rUser else '') + rServer,
+            ]
+
+    def run(self,cmd):
+        """ run shell command on the server, returns its stdout (bytes)"""
+        proc = subprocess.Popen(self.sshCmd + [cmd],stdout=subprocess.PIPE)
+        return proc.communicate()[0]
+
+    def connect(self):
+        """ open the persistent connection (no-op for local stand-in)"""
+        if self.sshCmd is not None:
+            self.run('true')
+
+    def close(self):
+        """ close the persistent connection"""
+        if self.sshCmd is not None:
+            subprocess.call(self.sshCmd[:-1] + ['-O','exit',self.sshCmd[-1]])
+
+    def readTail(self,rFile,offset):
+        """ size of rFile and (max. maxBytes) bytes after offset"""
+        if self.sshCmd is None:
+            if not os.path.isfile(rFile):
+                return -1,b''
+            size = os.path.getsize(rFile)
+            if size < offset:
+                return size,b''
+            with open(rFile,'rb') as file:
+                file.seek(offset)
+                return size,file.read(self.maxBytes)
+        qFile = quote(rFile)
+        out   = self.run(
+                    'S=$(stat -c %%s %s 2>/dev/null) || S=-1; echo $S; '
+                    'if [ $S -ge %d ]; then tail -c +%d %s | head -c %d; fi'
+                    % (qFile,offset,offset+1,qFile,self.maxBytes)
+                )
+        eInd  = out.find(b'\n')
+        if eInd < 0:                                                    #connection failed
+            return -1,b''
+        return int(out[:eInd]),out[eInd+1:]
+
+    def fetchTail(self,rFile,locFile):
+        """ generator of (offset,data) with the bytes appended to rFile
+            since the last call, data are also appended to locFile"""
+        offset = os.path.getsize(locFile) if os.path.isfile(locFile) else 0
+        while True:
+            size,data = self.readTail(rFile,offset)
+            if size < 0:                                                #file not available
+                return
+            if size < offset:                                           #file was rewritten
+                offset = 0
+                open(locFile,'wb').close()
+                continue
+            if not data:
+                return
+            with open(locFile,'ab') as file:
+                file.write(data)
+            yield offset,data
+            offset += len(data)
+            if len(data) < self.maxBytes:
+                return
+
+    def fetchFile(self,rFile,locFile):
+        """ transfer whole (small) file, e.g. controlDict"""
+        if self.sshCmd is None:
+            if not os.path.isfile(rFile):
+                return
+            with open(rFile,'rb') as file:
+                data = file.read()
+        else:
+            data = self.run('cat ' + quote(rFile) + ' 2>/dev/null')
+            if not data:
+                return
+        with open(locFile,'wb') as file:
+            file.write(data)
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Throughput and completion forecast of the running simulation
+#~
+#~ Uses the columns parsed by fparseLog.LogParser (time, deltaT,
+#~ clockTime, CoMax, linear solver iterations) to estimate
+#~  - throughput in simulated seconds per wall hour (linear regression
+#~    of the simulation time on the wall time over the last nWin steps)
+#~  - time to reach endTime (from controlDict) and the finish date
+#~  - flags for the throughput drops:
+#~      deltaTCollapse ... recent deltaT much smaller than before
+#~                         (coLimited ... the time step is limited by
+#~                         the Courant number)
+#~      slowdown       ... wall time per step grew without the growth of
+#~                         the solver effort (node slowdown, I/O, ...)
+#~      solverEffort   ... wall time per step grew with the number of
+#~                         the linear solver iterations
+#~
+#~ The summary is a flat dictionary which can be exported as JSON
+#~ (saveForecast), e.g. for a sweep scheduler to reprioritize the cases
+#~
+#~ USAGE:
+#~     fcst = forecast(parser,readEndTime(caseDir + 'system/controlDict'))
+#~     saveForecast(checkDir + 'runForecast.json',fcst)
+
+#LICENSE================================================================
+#  fforecastLog.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import json
+import datetime
+import numpy as np
+
+#FUNCTIONS==============================================================
+def readEndTime(ctrlDict):
+    """ endTime of the simulation from the controlDict"""
+    if not os.path.isfile(ctrlDict):
+        return np.nan
+    with open(ctrlDict, 'r') as file:
+        for line in file:
+            if line.startswith('endTime'):
+                return float(line.split()[1].rstrip(';'))
+    return np.nan
+
+def startDate(header):
+    """ start of the simulation from the log header (None if unknown)"""
+    try:
+        return datetime.datetime.strptime(
+            ' '.join(header['Date'].split()) + ' ' + header['Time'],'%b %d %Y %H:%M:%S'
+        )
+    except (KeyError,ValueError):
+        return None
+
+def throughput(clockTime,simTime):
+    """ simulated seconds per wall hour (slope of the linear fit)"""
+    if len(clockTime) < 2 or clockTime[-1] <= clockTime[0]:
+        return np.nan
+    return 3600*np.polyfit(clockTime,simTime,1)[0]
+
+def forecast(parser,endTime,nWin=200,dtDrop=0.5,slowFac=1.5,coFac=0.95,maxCo=np.nan):
+    """ throughput, ETA and throughput drop flags of the parsed run,
+        the last nWin steps are compared to the nWin steps before"""
+    fcst = {
+            'nSteps'        : parser.nSteps,
+            'simTime'       : np.nan,
+            'endTime'       : endTime,
+            'progress'      : np.nan,                                   #[%]
+            'wallTime'      : np.nan,                                   #[h]
+            'throughput'    : np.nan,                                   #simulated s / wall h (last nWin steps)
+            'throughputAll' : np.nan,                                   #simulated s / wall h (whole run)
+            'wallStep'      : np.nan,                                   #wall s / time step (last nWin steps)
+            'deltaT'        : np.nan,                                   #median deltaT (last nWin steps)
+            'ETA'           : np.nan,                                   #[h]
+            'finish'        : None,                                     #estimated finish date
+            'flags'         : [],
+           }
+    if parser.nSteps < 2:
+        return fcst
+    simTime   = parser.col('time')
+    clockTime = parser.col('clockTime')
+    deltaT    = parser.col('deltaT')
+    rec       = slice(max(0,parser.nSteps-nWin),parser.nSteps)          #recent window
+    ref       = slice(max(0,parser.nSteps-2*nWin),rec.start)            #reference window
+
+    fcst['simTime']       = simTime[-1]
+    fcst['progress']      = 100.0*simTime[-1]/endTime
+    fcst['wallTime']      = clockTime[-1]/3600
+    fcst['throughput']    = throughput(clockTime[rec],simTime[rec])
+    fcst['throughputAll'] = throughput(clockTime,simTime)
+    fcst['wallStep']      = np.median(np.diff(clockTime[rec])) if rec.stop-rec.start > 1 else np.nan
+    fcst['deltaT']        = np.nanmedian(deltaT[rec])
+    if fcst['throughput'] > 0 and not np.isnan(endTime):
+        fcst['ETA']       = max(0.0,endTime - simTime[-1])/fcst['throughput']
+        start = startDate(parser.header)
+        if start is not None:
+            fcst['finish'] = (start + datetime.timedelta(
+                hours=fcst['wallTime'] + fcst['ETA'])).strftime('%Y-%m-%d %H:%M')
+
+    # -- throughput drops (recent vs reference window)
+    if ref.stop - ref.start < 2:
+        return fcst
+    if fcst['deltaT'] < dtDrop*np.nanmedian(deltaT[ref]):
+        fcst['flags'].append('deltaTCollapse')
+        CoMax = parser.col('CoMax')
+        maxCo = np.nanmax(CoMax) if np.isnan(maxCo) else maxCo
+        if np.nanmedian(CoMax[rec]) >= coFac*maxCo:
+            fcst['flags'].append('coLimited')
+    wallRef = np.median(np.diff(clockTime[ref]))
+    if fcst['wallStep'] > slowFac*wallRef:
+        nIter   = sum(parser.col(name) for name in parser.cols if name.endswith('_nIter'))
+        if np.ndim(nIter) and np.mean(nIter[rec]) > slowFac*max(np.mean(nIter[ref]),1):
+            fcst['flags'].append('solverEffort')
+        else:
+            fcst['flags'].append('slowdown')
+    return fcst
+
+def saveForecast(fileName,fcst):
+    """ write the forecast(s) as JSON (NaN -> null)"""
+    def clean(val):
+        if isinstance(val,dict):
+            return dict((key,clean(v)) for key,v in val.items())
+        if isinstance(val,(list,tuple)):
+            return [clean(v) for v in val]
+        if isinstance(val,(float,np.floating)):
+            return None if np.isnan(val) else float(val)
+        if isinstance(val,np.integer):
+            return int(val)
+        return val
+    with open(fileName + '.tmp','w') as file:
+        json.dump(clean(fcst),file,indent=2,sort_keys=True)
+    os.rename(fileName + '.tmp',fileName)                               #readers never see a partial file
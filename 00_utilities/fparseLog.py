@@ -0,0 +1,463 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Incremental (tail-follow) parser of the OpenFOAM solver logs
+#~
+#~ The parser remembers the byte offset up to which the log file was
+#~ already processed together with the partial data of the currently
+#~ running time step. On each call of update() only the newly appended
+#~ bytes are read, the finished time steps are appended to in-memory
+#~ numpy columns. The refresh cost is thus proportional to the new
+#~ solver output and not to the total size of the log.
+#~
+#~ NOTES:
+#~  - a time step is closed by the ExecutionTime line, the values read
+#~    before it are stored in the partial step record
+#~  - the unterminated last line (solver is just writing) is kept until
+#~    it is completed by the next update
+#~  - the new bytes can also be handed over directly (feed), e.g. by
+#~    the delta transfer from the remote server (ffetchLog.py)
+#~  - if the log file shrinks (case was restarted), the parser resets
+#~    itself and starts from the beginning
+#~  - raw lines of the last nTail time steps are kept in memory (for
+#~    the residual plots), if more steps are requested (or after load),
+#~    the end of the log is read backwards in blocks (readLastSteps),
+#~    so only the last N time steps are ever decoded
+#~  - the parsed data can be stored in (and restored from) a .npz
+#~    cache next to the case (save/load), after load only the new tail
+#~    of the log is parsed (raw tail lines are read back from the log)
+#~  - all the quantities are extracted in a single pass through the new
+#~    lines (prefix dispatch table + one regexp for the linear solvers),
+#~    the same parser is used for transient (interFoam) and steady state
+#~    (simpleFoam) logs
+#~  - LogWorker runs the refresh in a background thread (the plotting
+#~    thread is not blocked by the transfer and parsing), downsample
+#~    reduces long histories for display
+#~
+#~ USAGE:
+#~  - keep the file in the same folder as the procLog* scripts
+#~     parser = LogParser(checkDir + 'log.interFoam',nTail=nRezSt)
+#~     parser.update()                                #on each refresh
+#~     parser.col('time')                             #numpy view
+#~     parser.col('p_rgh_init')                       #initial residuals
+#~     parser.save(checkDir + 'simAnalysisData.npz')  #columnar cache
+
+#LICENSE================================================================
+#  fparseLog.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import re                                                               #regexp
+import threading
+import numpy as np
+from collections import deque
+try:
+    from queue import Queue,Empty                                       #python 3
+except ImportError:
+    from Queue import Queue,Empty                                       #python 2
+
+#AUXILIARY FUNCTIONS====================================================
+def downsample(x,y,nMax=2000):
+    """ reduce (x,y) to approx. nMax points for plotting, minimum and
+        maximum of y in each bucket are kept (spikes stay visible)"""
+    nPts = len(y)
+    if nPts <= nMax:
+        return x,y
+    nBkt = max(1,nMax//2)                                               #number of buckets
+    bLen = nPts//nBkt                                                   #points per bucket
+    yBkt = np.where(np.isnan(y[:nBkt*bLen]),np.inf,y[:nBkt*bLen]).reshape(nBkt,bLen)
+    iMin = np.argmin(yBkt,axis=1)
+    yBkt[np.isinf(yBkt)] = -np.inf
+    iMax = np.argmax(yBkt,axis=1)
+    base = np.arange(nBkt)*bLen
+    idx  = np.unique(np.concatenate((base + iMin,base + iMax,np.arange(nBkt*bLen,nPts))))
+    return x[idx],y[idx]
+
+def readLastSteps(fileName,nSteps,endOffset=None,blockSize=2**16):
+    """ raw lines of the last nSteps time steps of the log (grouped by
+        the time step), the file is read backwards in blocks until enough 'Time = ' lines are found
+        (cost does not depend on the size of the log)"""
+    marker = b'\nTime = '
+    if nSteps <= 0 or not os.path.isfile(fileName):
+        return []
+    with open(fileName,'rb') as file:
+        file.seek(0,os.SEEK_END)
+        pos   = file.tell() if endOffset is None else min(endOffset,file.tell())
+        buf   = b''
+        nFnd  = 0                                                       #markers found so far
+        while pos > 0 and nFnd < nSteps:
+            bLen  = min(blockSize,pos)
+            pos  -= bLen
+            file.seek(pos)
+            buf   = file.read(bLen) + buf
+            if pos == 0:                                                #first line of the file
+                buf = b'\n' + buf
+                bLen += 1
+            nFnd += buf.count(marker,0,bLen + len(marker) - 1)          #only the new (and boundary) part
+    ind    = len(buf)
+    for i in range(nSteps):                                             #start of the nSteps-th step from the end
+        nInd = buf.rfind(marker,0,ind)
+        if nInd < 0:
+            break
+        ind  = nInd
+    if ind == len(buf):                                                 #no time step found
+        return []
+    lines  = buf[ind+1:].decode('utf-8','replace').splitlines()
+    if not buf.endswith(b'\n'):                                         #unterminated line (solver is writing)
+        lines = lines[:-1]
+    groups = []
+    for line in lines:
+        if line.startswith('Time = '):
+            groups.append([])
+        groups[-1].append(line)
+    return groups
+
+#CLASS DEFINITION=======================================================
+class LogWorker(threading.Thread):
+    """ background refresh of the parsed data, the plotting (main)
+        thread only picks up the prepared snapshots"""
+
+    def __init__(self,refresh,snapshot,updInt):
+        threading.Thread.__init__(self)
+        self.daemon   = True                                            #do not block the exit
+        self.refresh  = refresh                                         #fetch/parse the new data, returns nNew
+        self.snapshot = snapshot                                        #prepare the data for plotting
+        self.updInt   = updInt                                          #update interval in seconds
+        self.queue    = Queue(maxsize=1)                                #only the latest snapshot is kept
+        self.stopEvt  = threading.Event()
+
+    def runOnce(self):
+        """ single refresh in the calling thread, returns the snapshot"""
+        self.refresh()
+        return self.snapshot()
+
+    def run(self):
+        nNew = 1                                                        #always try to deliver the first snapshot
+        while not self.stopEvt.is_set():
+            nNew += self.refresh()
+            if nNew:
+                data = self.snapshot()
+                if data is not None:                                    #None ... nothing to plot yet
+                    try:
+                        self.queue.get_nowait()                         #drop the stale snapshot
+                    except Empty:
+                        pass
+                    self.queue.put(data)
+                    nNew = 0
+            self.stopEvt.wait(self.updInt)
+
+    def latest(self):
+        """ the newest snapshot or None (does not block)"""
+        try:
+            return self.queue.get_nowait()
+        except Empty:
+            return None
+
+    def stop(self):
+        self.stopEvt.set()
+
+class LogParser(object):
+    """ incremental parser of the log.*Foam files (tail-follow)"""
+
+    # -- per time step quantities (name, numpy type)
+    colDefs = [
+                ('time',     'f8'),                                     #simulation time
+                ('deltaT',   'f8'),                                     #adaptive time step
+                ('execTime', 'f8'),                                     #execution time (cpu)
+                ('clockTime','f8'),                                     #clock time (wall)
+                ('CoMean',   'f8'),                                     #courant numbers
+                ('CoMax',    'f8'),
+                ('CoIMean',  'f8'),                                     #interface courant numbers
+                ('CoIMax',   'f8'),
+                ('nPimple',  'i4'),                                     #number of PIMPLE iterations
+              ]
+    # Note: for each solved variable (e.g. p_rgh), columns varName_init
+    #       and varName_final are added on the fly (residuals of the
+    #       first solution of the variable in the time step), together
+    #       with varName_nIter and varName_nSolve (total number of linear
+    #       solver iterations and of solutions in the time step)
+
+    # -- header lines of the log (only the first occurence is used)
+    hdrStr  = {
+                'nProcs' : 'nProcs : ',
+                'Date'   : 'Date   : ',
+                'Time'   : 'Time   : ',
+                'Case'   : 'Case   : ',
+                'Exec'   : 'Exec   : ',
+                'Build'  : 'Build  : ',
+              }
+
+    # -- linear solver output line
+    resRe   = re.compile(
+                r'Solving for (\S+), Initial residual = ([^,]+), '
+                r'Final residual = ([^,]+), No Iterations (\d+)'
+              )
+
+    def __init__(self,fileName,nTail=2,chunkSize=2**24):
+        self.fileName  = fileName                                       #parsed log file
+        self.nTail     = nTail                                          #number of time steps to keep raw lines for
+        self.chunkSize = chunkSize                                      #max. number of bytes read at once
+        self.reset()
+
+    def reset(self):
+        """ forget everything parsed so far"""
+        self.offset  = 0                                                #bytes already processed
+        self.rest    = b''                                              #unterminated last line
+        self.nSteps  = 0                                                #number of finished time steps
+        self.header  = {}
+        self.cols    = {}
+        for name,dt in self.colDefs:
+            self.addCol(name,dt)
+        self.step    = {}                                               #partial (current) time step
+        self.tail    = deque(maxlen=self.nTail)                         #raw lines of the last time steps
+
+    def addCol(self,name,dt='f8'):
+        """ add a new (empty) column, already parsed steps are NaN/0"""
+        size = max(64,len(self.cols.get('time',[])))
+        self.cols[name] = np.full(size,np.nan) if dt == 'f8' else np.zeros(size,dtype=dt)
+
+    def col(self,name):
+        """ numpy view of the parsed quantity (finished time steps only),
+            unknown quantities are returned as NaN"""
+        if name not in self.cols:
+            return np.full(self.nSteps,np.nan)
+        return self.cols[name][:self.nSteps]
+
+    def tailSteps(self,nSteps=None):
+        """ raw lines of the last nSteps time steps grouped by the time
+            step, if not enough of them is kept in memory (e.g. after
+            load), the end of the parsed part of the log is read
+            backwards (readLastSteps)"""
+        nSteps = self.nTail if nSteps is None else nSteps
+        groups = list(self.tail)[-nSteps:] if nSteps > 0 else []
+        if len(groups) < min(nSteps,self.nSteps + 1):                   #not enough steps in memory
+            groups = readLastSteps(self.fileName,nSteps,self.offset - len(self.rest))
+        return groups
+
+    def tailLines(self,nSteps=None):
+        """ raw lines of the last nSteps time steps"""
+        return [line for group in self.tailSteps(nSteps) for line in group]
+
+    def update(self):
+        """ parse the bytes appended since the last call,
+            returns number of the newly finished time steps"""
+        if not os.path.isfile(self.fileName):
+            return 0
+        if os.path.getsize(self.fileName) < self.offset:                #log was rewritten
+            self.reset()
+        nOld = self.nSteps
+        with open(self.fileName,'rb') as file:
+            file.seek(self.offset)
+            while True:
+                chunk = file.read(self.chunkSize)
+                if not chunk:
+                    break
+                self.parseBytes(chunk)
+        return self.nSteps - nOld
+
+    def feed(self,data,offset=None):
+        """ parse data appended to the log at the given byte offset (e.g.
+            delivered by ffetchLog), falls back to update() if the data
+            do not continue the already parsed part of the log"""
+        if offset is not None and offset != self.offset:
+            if offset < self.offset:                                    #log was rewritten
+                self.reset()
+            return self.update()
+        nOld = self.nSteps
+        self.parseBytes(data)
+        return self.nSteps - nOld
+
+    def parseBytes(self,chunk):
+        """ parse the complete lines, keep the unterminated one"""
+        self.offset += len(chunk)
+        chunk = self.rest + chunk
+        eInd  = chunk.rfind(b'\n')
+        if eInd < 0:                                                    #no complete line yet
+            self.rest = chunk
+            return
+        self.rest = chunk[eInd+1:]
+        self.parseLines(
+            chunk[:eInd+1].decode('utf-8','replace').splitlines()
+        )
+
+    #LINE TOKENIZER=====================================================
+    # -- each line is processed exactly once, the handler is selected by
+    #    the first word of the line (prefix dispatch table), the linear
+    #    solver lines (unknown first word) are matched by a regexp
+    def parseLines(self,lines):
+        """ process a list of complete lines"""
+        handlers = self.handlers
+        for line in lines:
+            if line.startswith('Time = '):                              #new time step
+                self.tail.append([])
+            if self.tail:
+                self.tail[-1].append(line)
+            key = line.split(' ',1)[0]
+            try:
+                if key in handlers:
+                    handlers[key](self,line)
+                elif 'Solving for ' in line:
+                    self.parseResidual(line)
+            except (ValueError,IndexError):                             #corrupted line, skip it
+                continue
+
+    def parseCo(self,line):
+        if line.startswith('Courant Number'):
+            vals = line.split()
+            self.step['CoMean'],self.step['CoMax'] = float(vals[3]),float(vals[5])
+
+    def parseCoI(self,line):
+        if line.startswith('Interface Courant Number'):
+            vals = line.split()
+            self.step['CoIMean'],self.step['CoIMax'] = float(vals[4]),float(vals[6])
+
+    def parseDeltaT(self,line):
+        if line.startswith('deltaT = '):
+            self.step['deltaT'] = float(line[9:])
+
+    def parseTime(self,line):
+        if line.startswith('Time = '):
+            self.step['time'] = float(line[7:].rstrip().rstrip('s'))
+        else:
+            self.parseHeader(line)
+
+    def parsePimple(self,line):
+        vals = line.split()
+        if vals[1] == 'iteration':
+            self.step['nPimple'] = int(vals[2])
+        elif vals[1] == 'converged':
+            self.step['nPimple'] = int(vals[3])
+
+    def parseExecTime(self,line):
+        vals = line.split()
+        self.step['execTime'],self.step['clockTime'] = float(vals[2]),float(vals[6])
+        self.appendStep(self.step)
+        self.step = {}
+
+    def parseHeader(self,line):
+        key = line.split(' ',1)[0]
+        if key not in self.header and line.startswith(self.hdrStr[key]):
+            self.header[key] = line[len(self.hdrStr[key]):].strip()
+
+    def parseResidual(self,line):
+        match = self.resRe.search(line)
+        if match is None:                                               #e.g. MULES, no residuals
+            return
+        varName = match.group(1)
+        if varName + '_init' not in self.step:                          #first solution in the time step
+            if varName + '_init' not in self.cols:
+                self.addCol(varName + '_init')
+                self.addCol(varName + '_final')
+                self.addCol(varName + '_nIter','i4')
+                self.addCol(varName + '_nSolve','i4')
+            self.step[varName + '_init']  = float(match.group(2))
+            self.step[varName + '_final'] = float(match.group(3))
+        step = self.step                                                #linear solver effort in the time step
+        step[varName + '_nIter']  = step.get(varName + '_nIter',0) + int(match.group(4))
+        step[varName + '_nSolve'] = step.get(varName + '_nSolve',0) + 1
+
+    handlers = {
+                'Courant'       : parseCo,
+                'Interface'     : parseCoI,
+                'deltaT'        : parseDeltaT,
+                'Time'          : parseTime,
+                'PIMPLE:'       : parsePimple,
+                'ExecutionTime' : parseExecTime,
+                'nProcs'        : parseHeader,
+                'Date'          : parseHeader,
+                'Case'          : parseHeader,
+                'Exec'          : parseHeader,
+                'Build'         : parseHeader,
+               }
+
+    def appendStep(self,step):
+        """ append finished time step to the columns"""
+        if self.nSteps == len(self.cols['time']):                       #grow the columns
+            for name in self.cols:
+                self.cols[name] = np.concatenate(
+                    (self.cols[name],np.full_like(self.cols[name],self.fillVal(name)))
+                )
+        for name in self.cols:
+            self.cols[name][self.nSteps] = step.get(name,self.fillVal(name))
+        self.nSteps += 1
+
+    def fillVal(self,name):
+        """ value of the quantity not reported in the time step"""
+        return np.nan if self.cols[name].dtype.kind == 'f' else 0
+
+    #ON-DISK CACHE======================================================
+    # -- the parsed columns are stored in a .npz file next to the case
+    #    together with the byte offset of the log they cover, the first
+    #    bytes of the log (to recognize a restarted simulation) and the
+    #    partial time step
+    cacheVersion = 2
+    nHeadBytes   = 1024
+
+    def logHead(self):
+        """ first bytes of the log (identification of the run)"""
+        with open(self.fileName,'rb') as file:
+            return np.frombuffer(file.read(self.nHeadBytes),dtype=np.uint8)
+
+    def save(self,cacheFile):
+        """ write the parsed data to cacheFile (.npz)"""
+        if not self.offset:
+            return
+        data = dict(('col_' + name,self.col(name)) for name in self.cols)
+        data.update(('hdr_' + key,np.array(val)) for key,val in self.header.items())
+        data.update(('step_' + key,np.array(val)) for key,val in self.step.items())
+        data['version'] = np.array(self.cacheVersion)
+        data['offset']  = np.array(self.offset - len(self.rest),dtype=np.int64)
+        data['logHead'] = self.logHead()
+        with open(cacheFile + '.tmp','wb') as file:                     #do not leave broken cache behind
+            np.savez(file,**data)
+        os.rename(cacheFile + '.tmp',cacheFile)
+
+    def load(self,cacheFile):
+        """ restore the parsed data from cacheFile, returns False (and
+            leaves the parser untouched) if the cache does not belong
+            to the current log"""
+        if not (os.path.isfile(cacheFile) and os.path.isfile(self.fileName)):
+            return False
+        with np.load(cacheFile) as data:
+            if (
+                int(data['version']) != self.cacheVersion or
+                int(data['offset']) > os.path.getsize(self.fileName) or
+                not np.array_equal(
+                    data['logHead'],self.logHead()[:len(data['logHead'])]
+                )
+               ):
+                return False
+            self.reset()
+            self.offset = int(data['offset'])
+            for key in data.files:
+                if key.startswith('col_'):
+                    vals = data[key]
+                    fill = np.nan if vals.dtype.kind == 'f' else 0
+                    self.cols[key[4:]] = np.concatenate(
+                        (vals,np.full(max(64,len(vals)),fill,dtype=vals.dtype))
+                    )
+                    self.nSteps = len(vals)
+                elif key.startswith('hdr_'):
+                    self.header[key[4:]] = str(data[key])
+                elif key.startswith('step_'):
+                    self.step[key[5:]] = data[key].item()
+        return True
@@ -0,0 +1,242 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Python script to monitor a larger number of running cases at once
+#~ (typically a parameter sweep)
+#~
+#~ The cases are specified as a list of (server,pattern) pairs, the
+#~ pattern is expanded (glob) on the given server. The logs of all the
+#~ cases are fetched and parsed concurrently (thread pool) by the
+#~ incremental parser from fparseLog.py, a summary table is printed and
+#~ one overview figure is saved
+#~
+#~ NOTES:
+#~  - each case has its own LogParser (and .npz cache), so only the new
+#~    part of each log is processed on a refresh
+#~  - remote cases are mirrored into checkDir/<server>_<caseName>/, only
+#~    the appended bytes are transferred (ffetchLog.py), one persistent
+#~    connection is kept per server
+#~  - ETA is based on the throughput (simulated s / wall h) over the
+#~    last nAvg steps, drops of the throughput are flagged (deltaT
+#~    collapse, node slowdown), see fforecastLog.py
+#~  - the summaries of all the cases are exported to fcstNm (JSON), e.g.
+#~    for a sweep scheduler
+
+#USAGE==================================================================
+#  1. Copy the script, fparseLog.py, ffetchLog.py and fforecastLog.py to
+#     a clean folder (or specify checkDir)
+#  2. Specify caseList and run the script
+
+#LICENSE================================================================
+#  procLogMulti.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+# -- communication with the remote server
+import os
+# -- plot updating
+import time
+# -- math and other operations on the data
+import glob
+import numpy as np
+# -- concurrent processing of the cases
+from multiprocessing.pool import ThreadPool
+# -- plotting
+import matplotlib.pyplot as plt
+#IMPORT BLOCK-CUSTOM====================================================
+from fparseLog import LogParser                                         #incremental log parser
+from ffetchLog import LogFetcher                                        #delta transfer of the logs
+from fforecastLog import readEndTime,forecast,saveForecast              #ETA and throughput forecast
+
+#CUSTOM FUNCTIONS=======================================================
+# A. auxiliary server contact functions---------------------------------
+def avServers(rName):
+    return {
+        'Altix' : [#Altix UV 2000 at UCT prague
+                    'altix.vscht.cz',
+                    'isozm',
+                    ['/scratch/','/'],
+                    'Altix UV 2000',
+                  ],
+        'Poctar': [#my personnal computer at UCT prague
+                    '413-C407-Poctar.vscht.cz',
+                    'martin',
+                    ['/media/','/Data_2/05_TextPlate/10_noTextureV2/'],
+                    'Intel Xeon E3',
+                  ],
+    }.get(rName,'Altix')
+
+def listCases(caseSpec):
+    """ expand (server,pattern) pair into the list of (server,caseDir)"""
+    rName,pattern = caseSpec
+    if rName == 'local':
+        return [(rName,caseDir.rstrip('/') + '/')
+                    for caseDir in sorted(glob.glob(pattern)) if os.path.isdir(caseDir)]
+    rServer,rUser,rDir,sTitle = avServers(rName)
+    rDir    = rDir[0] + rUser + rDir[1]
+    out     = fetchers[rName].run('ls -d ' + rDir + pattern)
+    return [(rName,caseDir.strip().rstrip('/') + '/')
+                for caseDir in out.decode('utf-8').splitlines() if caseDir.strip()]
+
+def localDir(case):
+    """ local directory with the (mirrored) case data"""
+    rName,caseDir = case
+    if rName == 'local':
+        return caseDir
+    return checkDir + rName + '_' + caseDir.split('/')[-2] + '/'
+
+def fetchCase(case,parser):
+    """ transfer the new part of the log of the remote case (over the
+        persistent connection to its server) directly to its parser,
+        returns number of the new time steps"""
+    rName,caseDir = case
+    locDir  = localDir(case)
+    fetcher = fetchers[rName]
+    fetcher.fetchFile(caseDir + 'system/controlDict',locDir + 'controlDict')
+    nNew    = 0
+    for offset,newData in fetcher.fetchTail(caseDir + logName,locDir + logName):
+        nNew += parser.feed(newData,offset)
+    return nNew
+
+# B. log processing functions-------------------------------------------
+def processCase(case):
+    """ update the case data and return its summary (runs in a thread)"""
+    rName,caseDir = case
+    locDir  = localDir(case)
+    parser  = parsers[case]
+    if rName != 'local':
+        nNew = fetchCase(case,parser)
+    else:
+        nNew = parser.update()
+    if nNew:
+        parser.save(locDir + fileNm)
+
+    # -- summary of the case (throughput forecast, fforecastLog.py)
+    endTime = readEndTime(locDir + ('system/' if rName == 'local' else '') + 'controlDict')
+    summary = forecast(parser,endTime,nWin=nAvg)
+    summary['name']  = rName + ':' + caseDir.split('/')[-2]
+    summary['maxCo'] = np.nanmax(parser.col('CoMax')[-nAvg:]) if parser.nSteps else np.nan
+    return summary
+
+#INPUT VARIABLES========================================================
+# -- monitored cases, (server,pattern) pairs, 'local' for local cases
+caseList= [
+            ('local','../iF_*'),
+            #~ ('Altix','iF_*_DC05V2'),
+            #~ ('Poctar','iF_Re*'),
+          ]
+
+# -- which file to process
+logName = 'log.interFoam'
+
+# -- number of last time steps used for the averaged characteristics
+nAvg    = 50
+
+# -- number of concurrently processed cases
+nThreads= 16
+
+# -- periodic updating of the figures
+updatePl= False                                                         #update the plot?
+updInt  = 60                                                            #update interval in seconds
+
+#OUTPUT VARIABLE========================================================
+fileNm  = 'simAnalysisData.npz'                                         #columnar cache of the parsed log (fparseLog.py)
+figNm   = 'multiRunAnalysis.png'
+fcstNm  = 'multiRunForecast.json'                                       #machine readable summaries
+
+#DO NOT MODIFY (PREFERABLY)=============================================
+# -- local location
+checkDir= os.getcwd() + '/'                                             #get current directory
+
+# -- persistent connections to the used servers
+fetchers = {}
+for rName in set(caseSpec[0] for caseSpec in caseList if caseSpec[0] != 'local'):
+    rServer,rUser,rDir,sTitle = avServers(rName)
+    fetchers[rName] = LogFetcher(rServer,rUser)
+    fetchers[rName].connect()
+
+# -- list of the cases and their parsers
+cases   = [case for caseSpec in caseList for case in listCases(caseSpec)]
+parsers = {}
+for case in cases:
+    if not os.path.isdir(localDir(case)):
+        os.makedirs(localDir(case))
+    parsers[case] = LogParser(localDir(case) + logName,nTail=0)
+    parsers[case].load(localDir(case) + fileNm)                         #continue from the cached data
+    parsers[case].update()                                              #catch up with the local mirror
+
+pool    = ThreadPool(nThreads)
+
+# -- figure window parameters
+fig = plt.figure(num=None, figsize=(20, max(6,0.3*len(cases)+2)), dpi=80, facecolor='w', edgecolor='k')
+plt.show(block=False)
+
+#PROGRAM ITSELF=========================================================
+while True:
+    #UPDATE ALL THE CASES AT ONCE=======================================
+    summaries = pool.map(processCase,cases)
+
+    #PRINT THE SUMMARY TABLE============================================
+    print('%-40s %10s %10s %8s %12s %12s %8s %10s  %s' % (
+        'case','simTime','endTime','done[%]','wall/step[s]','sim s/wall h','maxCo','ETA[h]','flags'))
+    for summary in summaries:
+        print('%-40s %10.4g %10.4g %8.1f %12.3g %12.3g %8.3g %10.1f  %s' % tuple(
+            [summary['name']] +
+            [summary[key] for key in ['simTime','endTime','progress','wallStep','throughput','maxCo','ETA']] +
+            [','.join(summary['flags'])]
+        ))
+    saveForecast(checkDir + fcstNm,summaries)
+
+    #OVERVIEW FIGURE====================================================
+    names   = [summary['name'] for summary in summaries]
+    yPos    = np.arange(len(names))
+    panels  = [
+                ('progress','Simulation progress [%]','limegreen'),
+                ('wallStep','Wall time / time step [s]','dodgerblue'),
+                ('maxCo',   'Max. Courant number (last %d steps) [--]'%nAvg,'firebrick'),
+                ('ETA',     'Estimated time to finish [h]','darkmagenta'),
+              ]
+
+    plt.clf()
+    for i in range(len(panels)):
+        key,label,color = panels[i]
+        ax = plt.subplot(1,len(panels),i+1)
+        ax.barh(yPos,[summary[key] for summary in summaries],color=color)
+        ax.set_yticks(yPos)
+        ax.set_yticklabels(names if i == 0 else [])
+        ax.set_ylim([-1,len(names)])
+        ax.invert_yaxis()
+        ax.set_xlabel(label)
+        ax.grid(True, axis='x')
+
+    #SAVE THE RESULTING FIGURE AND UPDATE GRAPHS========================
+    plt.tight_layout()
+    plt.savefig(figNm, dpi=100)
+    plt.draw()
+
+    if not updatePl:
+        break
+
+    time.sleep(updInt)
+
+for fetcher in fetchers.values():
+    fetcher.close()
+plt.show()
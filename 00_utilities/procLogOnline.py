@@ -8,11 +8,17 @@
 #~ simulation run (during runtime)
 
 #~ There is a possibility to periodically update the graphs
-#~ I do not use very efficient algorithm - all is recalculated as the
-#~ variables are rewritten (dirty but working, space for an improvment)
+#~ log.interFoam is processed incrementally (see fparseLog.py) - on each
+#~ update, only the newly written part of the log is parsed
+#~ The parsing runs in a background thread, the plots only update their
+#~ existing artists (long histories are downsampled for display)
+#~ Throughput (simulated s / wall h), ETA against endTime from controlDict
+#~ and throughput drop flags are shown in the computation time plot and
+#~ exported to runForecast.json (see fforecastLog.py)
 
 #USAGE==================================================================
-#  1. Copy the script to a clean folder (or specify checkDir)
+#  1. Copy the script, fparseLog.py, ffetchLog.py and fforecastLog.py to
+#     a clean folder (or specify checkDir)
 #  2. Run the script
 
 #LICENSE================================================================
@@ -51,6 +57,10 @@ import re                                                               #regexp
 # -- plotting
 import matplotlib.pyplot as plt
 import textwrap
+#IMPORT BLOCK-CUSTOM====================================================
+from fparseLog import LogParser,LogWorker,downsample                    #incremental log parser
+from ffetchLog import LogFetcher                                        #delta transfer of the logs
+from fforecastLog import readEndTime,forecast,saveForecast              #ETA and throughput forecast
 
 #CUSTOM FUNCTIONS=======================================================
 def avServers(rName):
@@ -70,6 +80,12 @@ def avServers(rName):
                     #~ ['/media/','/Data_2/05_TextPlate/60_longTextureV2/'],
                     'Intel Xeon E3',                        
                   ],
+        'Local' : [#local stand-in directory (testing, no SSH)
+                    None,
+                    '',
+                    ['../',''],
+                    'local stand-in',
+                  ],
     }.get(rName,'Altix')
 
 #INPUT VARIABLES========================================================
@@ -92,6 +108,7 @@ caseName= 'testCaseMulti1'
 # -- remote server
 rName   = 'Altix'
 #~ rName   = 'Poctar'
+#~ rName   = 'Local'                                                     #local stand-in (testing)
 
 rServer,rUser,caseDir,sTitle = avServers(rName)                         #get server description
 caseDir = caseDir[0] + rUser + caseDir[1] + caseName + '/'              #set proper caseDir
@@ -101,6 +118,7 @@ checkDir= os.getcwd() + '/'                                             #get cur
 
 # -- which file to get
 fileList= ['log.blockMesh', 'log.interFoam']
+ctrlDict= 'controlDict'                                                 #endTime for the ETA
 
 # -- periodic updating of the figures
 updatePl= False                                                          #update the plot?
@@ -108,193 +126,98 @@ updInt  = 15                                                            #update
 
 # -- graphical output parameters
 eMS     = 10                                                            #marker size to show the current timestep
+nPlot   = 2000                                                          #max. number of points shown in the history plots
+
+# -- throughput forecast
+nWin    = 200                                                           #number of last time steps for the throughput
 
 #OUTPUT VARIABLE========================================================
-fileNm = 'simAnalysisData'
-outVar = []
+fileNm = 'simAnalysisData.npz'                                          #columnar cache of the parsed log (fparseLog.py)
+fcstNm = 'runForecast.json'                                             #throughput forecast (machine readable)
 
 #DO NOT MODIFY (PREFERABLY)=============================================
 # -- figure window parameters
-plt.figure(num=None, figsize=(20, 12), dpi=80, facecolor='w', edgecolor='k')
+fig = plt.figure(num=None, figsize=(20, 12), dpi=80, facecolor='w', edgecolor='k')
 plt.show(block=False)
 # -- colors for plots with unknown number of lines
-plotCols = [np.random.rand(3,1) for i in range(len(varInt))]
+plotCols = [np.random.rand(3) for i in range(len(varInt))]
+# -- incremental parser of the solver log
+parser   = LogParser(checkDir + fileList[1],nTail=nRezSt)
+parser.load(checkDir + fileNm)                                          #continue from the cached data
+parser.update()                                                         #catch up with the local mirror
+# -- persistent connection to the remote server
+fetcher  = LogFetcher(rServer,rUser)
+fetcher.connect()
 
-
-#PROGRAM ITSELF=========================================================
-while True:
-    #GET THE CURRENT DATA===============================================
-    for rFile in fileList:
-        os.system('rsync -v "%s:%s" "%s"' % (rUser + '@' + rServer,
-                                        caseDir + rFile,
-                                        checkDir) )
-    
-    #PROCESS OTHER LOG FILES (MESH CHARACTERISTICS & OTHER)=============
-    with open(checkDir + 'log.blockMesh', 'r') as file:
-        # read a list of lines into data
-        data = file.readlines()
-        
-    idStr = ['nCells: ']                                                #get number of cells in the mesh
-    
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
+#DATA PROCESSING (RUNS IN THE BACKGROUND THREAD)========================
+def readNCells():
+    """ number of cells in the mesh (in millions) from log.blockMesh"""
+    if not os.path.isfile(checkDir + fileList[0]):
+        return 0.0
+    with open(checkDir + fileList[0], 'r') as file:
+        for line in file:
+            fInd = line.find('nCells: ')
             if fInd>=0:
-                nCells = round(float(data[i][fInd+len(idStr[j])::])/1e6,1)
-                break
-    
-    
-    #LOAD THE FILE INTO MEMORY==========================================
-    with open(checkDir + 'log.interFoam', 'r') as file:
-        # read a list of lines into data
-        data = file.readlines()
+                return round(float(line[fInd+len('nCells: ')::])/1e6,1)
+    return 0.0
+
+def refresh():
+    """ process the new part of the log, returns number of new steps"""
+    nNew = 0
+    for rFile in fileList:                                              #only the appended bytes are transferred
+        for offset,newData in fetcher.fetchTail(caseDir + rFile,checkDir + rFile):
+            if rFile == fileList[1]:
+                nNew += parser.feed(newData,offset)                     #hand the bytes directly to the parser
+    if nNew:                                                            #store the new data
+        fetcher.fetchFile(caseDir + 'system/controlDict',checkDir + ctrlDict)
+        parser.save(checkDir + fileNm)
+        saveForecast(checkDir + fcstNm,forecast(parser,readEndTime(checkDir + ctrlDict),nWin))
+    return nNew
+
+def snapshot():
+    """ prepare the data for all the plots (the plotting thread only
+        updates the artists), long histories are downsampled"""
+    if not parser.nSteps:                                               #no finished time step yet
+        return None
+    data = {}
     
     #GET NUMBER OF CORES USED (AND POSSIBLY OTHER DESCRIPTION)==========
-    idStr = [
-                'nProcs : ',
-                'Date   : ',
-                'Time   : ',
-                'Case   : ',
-                'Exec   : ',
-                'Build  : ',            
-            ]
-    
-    out = []
-    
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd==0:
-                out.append(data[i][fInd+len(idStr[j])::])
-                break
+    hdrVals = [parser.header.get(key,'') for key in 
+                ['nProcs','Date','Time','Case','Exec','Build']
+              ]
                 
-    nProcs = int(out[0])                                                #get number of cores
-    Date,Time,Case,Exec,Build = out[1::]                                #get start time and date and case
-    Date,Time,Case,Exec,Build = Date[0:-1],Time[0:-1],Case[0:-1],Exec[0:-1],Build[0:-1]
+    nProcs = int(hdrVals[0] or 1)                                       #get number of cores
+    Date,Time,Case,Exec,Build = hdrVals[1::]                            #get start time and date and case
     
     Case   = Case.split('/')                                            #extract relevant data from the case
     Case   = Case[-1]
     
-    ttlStr = ("%s, %d cores, %.1fMM cells, case: %s, "%(sTitle, nProcs, nCells, Case) + 
+    ttlStr = ("%s, %d cores, %.1fMM cells, case: %s, "%(sTitle, nProcs, readNCells(), Case) + 
                  "solver: %s, version: %s"%(Exec, Build))
-    plt.suptitle("\n".join(textwrap.wrap(ttlStr, 100)),
-                 fontsize=24)    
-    
-    #PLOT TIMESTEPEVOLUTION=============================================
-    idStr = ['deltaT = ',
-             'Time = ',
-            ] 
+    data['title'] = "\n".join(textwrap.wrap(ttlStr, 100))
+    data['start'] = (Date, Time)
     
-    vec   = [[] for i in range(len(idStr))]
-        
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd==0:
-                vec[j].append(float(data[i][fInd+len(idStr[j])::]))
-                
-    outVar.append(vec)
-                
-    plt.subplot(2,3,1)
-    plt.cla()
-    plt.semilogy(vec[1],vec[0], 'g^')
-    plt.title('Timestep evolution')
-    plt.ylabel('Adaptive timestep [s]')
-    plt.xlabel('Simulation time [s]')
-    plt.xlim([min(vec[1]),max(vec[1])])
-    plt.ylim([1e-6,max([max(vec[0]),1e-4])])
-    plt.grid(True, which='major')
-    plt.grid(True, which='minor')
-    plt.draw()
+    #TIMESTEP EVOLUTION=================================================
+    data['dt'] = downsample(parser.col('time'),parser.col('deltaT'),nPlot)
     
-    #PLOT CALCULATION TIME==============================================
-    idStr = [
-             'ExecutionTime = ',
-            ] 
-    
-    vec   = [[0.0],[0.0],[0]]
-        
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd>-1:
-                curTime = data[i].split(' ')                            #split the relevant line by spaces
-                curTime = float(curTime[2])                             #hardcoded position (solver specific)
-                vec[j].append(curTime)                                  #current execution time
-                vec[j+1].append(curTime-vec[j][-2])                     #current timestep difference
-                vec[j+2].append(vec[j+2][-1]+1)                         #timestep number
-           
-    meanVal = np.mean(vec[1])                                           #get mean value
-    vec.append([absVal/meanVal for absVal in vec[1]])
+    #CALCULATION TIME===================================================
+    execTime = np.append(0.0,parser.col('execTime'))                    #current execution time
+    stepTime = np.append(0.0,np.diff(execTime))                         #current timestep difference
     
-    outVar.append(vec)
+    data['exec'] = downsample(execTime/3600,stepTime,nPlot)
+    data['fcst'] = forecast(parser,readEndTime(checkDir + ctrlDict),nWin)
     
-    hExecTime = [execTime/3600 for execTime in vec[0]] 
+    #COURANT AND INTERFACE COURANT NUMBERS==============================
+    stepNum = np.arange(1,parser.nSteps+1)                              #simulation step
     
-    plt.subplot(2,3,2)
-    plt.cla()
-    plt.plot(hExecTime,vec[1], 'bo')
-    for i in range(1,1+int(math.floor(hExecTime[-1]/24))):
-        plt.plot([24*i, 24*i], [min(vec[1])*0.9,max(vec[1])*1.1], 'k-.')
-        plt.text(24*i-max(hExecTime)/20,max(vec[1])*1.0,'Day %i'%i,bbox={'facecolor':'blue', 'alpha':0.5, 'pad':10}, rotation='vertical')
-    plt.title('Timestep computation time during simulation')
-    plt.ylabel('Computation time / time step [s]')
-    plt.xlabel('Execution time [h], started on %s, %s'%(Date, Time))
-    plt.xlim([min(hExecTime),max(hExecTime)])
-    plt.ylim([min(vec[1])*0.9,max(vec[1])*1.1])
-    plt.grid(True)
-    plt.draw()
-    
-    #PLOT COURANT AND INTERFACE COURANT NUMBERS=========================
-    idStr = [
-                'Courant Number',
-                'Interface Courant Number',
-            ]
-            
-    vec   = [[] for i in range(2*len(idStr))]
-    
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd==0:
-                curVals = data[i][fInd+len(idStr[j])::].split(' ')
-                vec[2*j].append(float(curVals[2]))
-                vec[2*j+1].append(float(curVals[4]))
-                
-    outVar.append(vec)
-    
-    nElems = [len(vec[i]) for i in range(len(vec))]
-    nElems = min(min(nElems),len(outVar[1][2]))
-    
-    plt.subplot2grid((2,3), (1,0), colspan=2)
-    plt.cla()
-    plt.semilogy(outVar[1][2][:nElems],vec[0][:nElems], 'co',label='Co (mean)')
-    plt.semilogy(outVar[1][2][:nElems],vec[1][:nElems], 'cd',label='Co (max)')
-    plt.semilogy(outVar[1][2][:nElems],vec[2][:nElems], 'mo',label='Co_I (mean)')
-    plt.semilogy(outVar[1][2][:nElems],vec[3][:nElems], 'md',label='Co_I (max)')
-    plt.legend(bbox_to_anchor=(0.7, 0.3), loc=2, borderaxespad=0.)
-    plt.title('Courant number evolution during simulation')
-    plt.ylabel('Courant number [--]')
-    plt.xlabel('Simulation step [--]')
-    plt.xlim([min(outVar[1][2]),max(outVar[1][2])])
-    plt.grid(True)
-    plt.draw()
-    #~ 
-    #PLOT RESIDUALS OVER LAST N TIME STEPS==============================
-    # -- get only the last N PIMPLE iteration
-    partData = []
-    nCntr    = 0
-    for i in range(len(data)-1,0,-1):
-        fInd = data[i].find('PIMPLE: iteration 1')
-        if fInd==-1:
-            partData.append(data[i])
-        else:
-            nCntr = nCntr + 1
-            if nCntr == nRezSt:
-                break
-            
-    partData.reverse()                                                  #flip the list
+    data['Co']     = [downsample(stepNum,parser.col(name),nPlot)
+                        for name in ['CoMean','CoMax','CoIMean','CoIMax']]
+    data['nSteps'] = parser.nSteps
     
+    #RESIDUALS OVER LAST N TIME STEPS===================================
+    # -- get only the last N time steps (read backwards from the log end)
+    groups   = parser.tailSteps(nRezSt)
+    partData = [line for group in groups for line in group]
     
     idStr = ['Solving for %s'%varName for varName in varInt]            #in which variables am I interested
     
@@ -307,111 +230,134 @@ while True:
                 auxStr = partData[i][fInd::].split('residual = ')                 #lets split the rest using residual. should result in 3 substrings (2 occurences of the splitting string)
                 vec[j].append(float(auxStr[1].split(',')[0]))        #process both the occurences
                 vec[j].append(float(auxStr[2].split(',')[0]))
-                
-                
-    plt.subplot(2,3,3)
-    plt.cla()                                                           #clear the current axis
-    mLen = max([len(v) for v in vec])                                   #maximal vector length
-    for i in range(len(varInt)):
-        cLen = len(vec[i])
-        plt.semilogy(np.linspace(0,mLen,cLen),vec[i],'s-',c=plotCols[i],label=varInt[i])
-    plt.title('Reziduals evolution')
-    plt.ylabel('Reziduals')
-    plt.xlabel('last %d PIMPLE iterations'%nCntr)
-    plt.xlim([0,len(vec[0])])
-    plt.ylim([1e-10,1])
-    plt.grid(True, which='major')
-    plt.legend(bbox_to_anchor=(0.7, 0.95), loc=2, borderaxespad=0.)
-    plt.draw()
-    
-    #PLOT RESIDUALS OVER LAST M TIME STEPS==============================
-    # -- get only the last M PIMPLE iteration
-    partData = []
-    nCntr    = 0
-    for i in range(len(data)-1,0,-1):
-        fInd = data[i].find('PIMPLE: iteration 1')
-        if fInd==-1:
-            partData.append(data[i])
-        else:
-            nCntr = nCntr + 1
-            if nCntr == nPimpIt:
-                break
-            
-    partData.reverse()                                                  #flip the list
     
-    idStr = ['PIMPLE: converged in']
+    data['res']  = vec
+    data['nRes'] = len(groups)
     
-    vec   = []
+    #NUMBER OF PIMPLE ITERATIONS OVER LAST M TIME STEPS=================
+    data['pimple'] = parser.col('nPimple')[-nPimpIt:].copy()
     
-    for i in range(len(partData)):                                      #go through the partData
-        for j in range(len(idStr)):                                     #go throught the variables of interest
-            fInd = partData[i].find(idStr[j])
-            if fInd>-1:#well, not exactly top notch but does the trick
-                vec.append(int(re.findall('\d+', partData[i][fInd+len(idStr[j])::])[0]))    
-    
-    plt.subplot(2,3,6)
-    plt.cla()
-    if not vec:
-        plt.text(0.17,0.5,'Solver NOT operating in PIMPLE mode')
-    else:
-        # time.sleep(0.5)
-        plt.plot(vec,'d',c='darkgoldenrod')
-        plt.title('Number of PIMPLE iterations')
-        plt.ylabel('PIMPLE iterations')
-        plt.xlabel('last %d timesteps'%nCntr)
-        plt.xlim([0,len(vec)])
-        plt.ylim([0,min(max(vec)+1,50)])
-        plt.grid(True, which='major')
-    
-    plt.draw()
+    return data
 
-    
-    
-    #SAVE THE RESULTING FIGURE AND UPDATE GRAPHS========================
-    # -- draw the figure
-    #~ plt.tight_layout()
-    plt.tight_layout(rect=[0, 0.03, 1, 0.90])
-    plt.savefig('runAnalysis.png', dpi=160)
-    plt.draw()    
-    
-    if not updatePl:
-        break
+#FIGURE LAYOUT (ARTISTS ARE CREATED ONCE, ONLY THEIR DATA ARE UPDATED)==
+ttlArt = plt.suptitle('', fontsize=24)
 
-    time.sleep(updInt)
-    
+# -- timestep evolution
+axDt   = plt.subplot(2,3,1)
+lnDt,  = axDt.semilogy([],[], 'g^')
+axDt.set_title('Timestep evolution')
+axDt.set_ylabel('Adaptive timestep [s]')
+axDt.set_xlabel('Simulation time [s]')
+axDt.grid(True, which='major')
+axDt.grid(True, which='minor')
+
+# -- calculation time
+axEx   = plt.subplot(2,3,2)
+lnEx,  = axEx.plot([],[], 'bo')
+dayArt = []                                                             #day markers
+axEx.set_title('Timestep computation time during simulation')
+axEx.set_ylabel('Computation time / time step [s]')
+axEx.grid(True)
+
+# -- courant and interface courant numbers
+axCo   = plt.subplot2grid((2,3), (1,0), colspan=2)
+lnCo   = [axCo.semilogy([],[], style, label=label)[0] for style,label in [
+            ('co','Co (mean)'),('cd','Co (max)'),('mo','Co_I (mean)'),('md','Co_I (max)')
+         ]]
+axCo.legend(bbox_to_anchor=(0.7, 0.3), loc=2, borderaxespad=0.)
+axCo.set_title('Courant number evolution during simulation')
+axCo.set_ylabel('Courant number [--]')
+axCo.set_xlabel('Simulation step [--]')
+axCo.grid(True)
+
+# -- residuals over last N time steps
+axRes  = plt.subplot(2,3,3)
+lnRes  = [axRes.semilogy([],[],'s-',c=plotCols[i],label=varInt[i])[0] for i in range(len(varInt))]
+axRes.set_title('Reziduals evolution')
+axRes.set_ylabel('Reziduals')
+axRes.set_ylim([1e-10,1])
+axRes.grid(True, which='major')
+axRes.legend(bbox_to_anchor=(0.7, 0.95), loc=2, borderaxespad=0.)
+
+# -- number of PIMPLE iterations over last M time steps
+axPi   = plt.subplot(2,3,6)
+lnPi,  = axPi.plot([],[],'d',c='darkgoldenrod')
+txPi   = axPi.text(0.17,0.5,'Solver NOT operating in PIMPLE mode')
+axPi.set_title('Number of PIMPLE iterations')
+axPi.set_ylabel('PIMPLE iterations')
+axPi.grid(True, which='major')
+
+def updatePlots(data):
+    """ put the new snapshot into the existing artists"""
+    ttlArt.set_text(data['title'])
+    
+    # -- timestep evolution
+    x,y = data['dt']
+    lnDt.set_data(x,y)
+    axDt.set_xlim([np.nanmin(x),np.nanmax(x)])
+    axDt.set_ylim([1e-6,max([np.nanmax(y),1e-4])])
+    
+    # -- calculation time
+    x,y = data['exec']
+    lnEx.set_data(x,y)
+    yLim = [np.nanmin(y)*0.9,np.nanmax(y)*1.1]
+    while dayArt:                                                       #day markers are few, recreate them
+        dayArt.pop().remove()
+    for i in range(1,1+int(math.floor(x[-1]/24))):
+        dayArt.extend(axEx.plot([24*i, 24*i], yLim, 'k-.'))
+        dayArt.append(axEx.text(24*i-x[-1]/20,yLim[1]/1.1,'Day %i'%i,bbox={'facecolor':'blue', 'alpha':0.5, 'pad':10}, rotation='vertical'))
+    axEx.set_xlabel('Execution time [h], started on %s, %s'%data['start'])
+    fcst = data['fcst']
+    axEx.set_title('Timestep computation time during simulation\n' + 
+                   '%.3g sim. s / wall h, ETA %.1f h (%s) %s'%(
+                   fcst['throughput'],fcst['ETA'],fcst['finish'] or '--',' '.join(fcst['flags'])))
+    axEx.set_xlim([np.nanmin(x),np.nanmax(x)])
+    axEx.set_ylim(yLim)
+    
+    # -- courant and interface courant numbers
+    for ln,(x,y) in zip(lnCo,data['Co']):
+        ln.set_data(x,y)
+    axCo.set_xlim([0,data['nSteps']])
+    axCo.relim()
+    axCo.autoscale_view(scalex=False)
+    
+    # -- residuals over last N time steps
+    vec  = data['res']
+    mLen = max([len(v) for v in vec])                                   #maximal vector length
+    for i in range(len(varInt)):
+        lnRes[i].set_data(np.linspace(0,mLen,len(vec[i])),vec[i])
+    axRes.set_xlabel('last %d PIMPLE iterations'%data['nRes'])
+    axRes.set_xlim([0,max(len(vec[0]),1)])
+    
+    # -- number of PIMPLE iterations over last M time steps
+    vec  = data['pimple']
+    lnPi.set_data(np.arange(len(vec)),vec)
+    lnPi.set_visible(vec.any())
+    txPi.set_visible(not vec.any())
+    axPi.set_xlabel('last %d timesteps'%len(vec))
+    axPi.set_xlim([0,max(len(vec),1)])
+    axPi.set_ylim([0,min(vec.max()+1,50)])
+    
+    fig.canvas.draw_idle()
+
+#PROGRAM ITSELF=========================================================
+worker = LogWorker(refresh,snapshot,updInt)
+
+if not updatePl:                                                        #single refresh, no background thread
+    data = worker.runOnce()
+    if data is not None:
+        updatePlots(data)
+        plt.tight_layout(rect=[0, 0.03, 1, 0.90])
+        plt.savefig('runAnalysis.png', dpi=160)
+else:
+    worker.start()                                                      #parsing runs in the background
+    while True:
+        data = worker.latest()
+        if data is not None:
+            updatePlots(data)
+            plt.tight_layout(rect=[0, 0.03, 1, 0.90])
+            plt.savefig('runAnalysis.png', dpi=160)
+        plt.pause(0.5)                                                  #keep the window responsive
+
+fetcher.close()
 plt.show()
-    
-#PREPARE AND WRITE THE OUTPUT FILE (FOR PROPER PLOTING)=================
-#~ wrList = [#variable to be written to the file
-            #~ 'simTime'       + '\t' +    #outVar[0][1]
-            #~ 'timeStep'      + '\t' +    #outVar[0][0]
-            #~ 'execTime'      + '\t' +    #outVar[1][0]
-            #~ 'timeStepTime'  + '\t' +    #outVar[1][1]
-            #~ 'simStep'       + '\t' +    #outVar[1][2] !!INT!!
-            #~ 'avgCo'         + '\t' +    #outVar[2][0]
-            #~ 'maxCo'         + '\t' +    #outVar[2][1]
-            #~ 'avgCoI'        + '\t' +    #outVar[2][2]
-            #~ 'maxCoI'        + '\n'      #outVar[2][3]
-          #~ ]
-#~ 
-#~ nLines = min([len(outVar[i][0]) for i in range(len(outVar))])            #get minimal list length
-#~ 
-#~ for i in range(nLines):
-    #~ wrList.append(
-        #~ "%5.5e\t"%outVar[0][1][i] +     #simulation time (s)
-        #~ "%5.5e\t"%outVar[0][0][i] +     #adaptive time step (s)
-        #~ "%5.5e\t"%outVar[1][0][i] +     #execution time (s)
-        #~ "%5.5e\t"%outVar[1][1][i] +     #timeStep time (s)
-        #~ "%10d\t"%outVar[1][2][i]   +    #simulation step (--)
-        #~ "%5.5e\t"%outVar[2][0][i] +     #courant numbers
-        #~ "%5.5e\t"%outVar[2][1][i] +
-        #~ "%5.5e\t"%outVar[2][2][i] +
-        #~ "%5.5e\n"%outVar[2][3][i]
-    #~ )
-    
-#~ # -- save the results
-#~ with open(
-            #~ fileNm,
-            #~ 'w'
-        #~ ) as file:
-    #~ file.writelines( wrList )
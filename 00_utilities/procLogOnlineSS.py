@@ -9,9 +9,12 @@
 #   - file log.*Foam
 #   - file log.blockMesh or log.snappyHexMesh or direct specification
 #     of the number of the cells in the mesh
+#   - fparseLog.py (incremental log parser) and ffetchLog.py (delta
+#     transfer of the logs) in the same folder
 
 #USAGE==================================================================
-#  1. Copy the script to a clean folder (or specify checkDir)
+#  1. Copy the script, fparseLog.py and ffetchLog.py to a clean folder
+#     (or specify checkDir)
 #  2. Run the script
 
 #LICENSE================================================================
@@ -52,6 +55,9 @@ import matplotlib.pyplot as plt
 import matplotlib
 import textwrap
 from itertools import cycle,chain
+#IMPORT BLOCK-CUSTOM====================================================
+from fparseLog import LogParser,LogWorker,downsample                    #incremental log parser
+from ffetchLog import LogFetcher                                        #delta transfer of the logs
 
 #CUSTOM FUNCTIONS=======================================================
 # A. auxiliary visualization functions----------------------------------
@@ -89,6 +95,12 @@ def avServers(rName):
                     #~ ['/media/','/Data_2/05_TextPlate/60_longTextureV2/'],
                     'Intel Xeon E3',                        
                   ],
+        'Local' : [#local stand-in directory (testing, no SSH)
+                    None,
+                    '',
+                    ['../',''],
+                    'local stand-in',
+                  ],
     }.get(rName,'Altix')
 
 #INPUT VARIABLES========================================================
@@ -111,6 +123,7 @@ caseName= 'testCaseGas6'
 # -- remote server
 rName   = 'Altix'
 #~ rName   = 'Poctar'
+#~ rName   = 'Local'                                                     #local stand-in (testing)
 
 # -- which file to get
 fileList= ['log.blockMesh', 'log.simpleFoam']
@@ -121,9 +134,10 @@ updInt  = 20                                                            #update
 
 # -- graphical output parameters
 eMS     = 10                                                            #marker size to show the current timestep
+nPlot   = 2000                                                          #max. number of points shown in the history plots
 
 #OUTPUT VARIABLE========================================================
-fileNm = 'simAnalysisData'
+fileNm = 'simAnalysisData.npz'                                          #columnar cache of the parsed log (fparseLog.py)
 
 #DO NOT MODIFY (PREFERABLY)=============================================
 
@@ -139,7 +153,7 @@ checkDir= os.getcwd() + '/'                                             #get cur
 fig = plt.figure(num=None, figsize=(20, 12), dpi=80, facecolor='w', edgecolor='k')
 plt.show(block=False)
 # -- colors for plots with unknown number of lines
-plotCols = [np.random.rand(3,1) for i in range(len(varInt))]
+plotCols = [np.random.rand(3) for i in range(len(varInt))]
 
 font = {
         #~ 'family' : 'normal',
@@ -149,167 +163,137 @@ font = {
 
 matplotlib.rc('font', **font)
 
-#PROGRAM ITSELF=========================================================
-while True:  
-    #GET THE CURRENT DATA===============================================
-    for rFile in fileList:
-        os.system('rsync -v "%s:%s" "%s"' % (rUser + '@' + rServer,
-                                        caseDir + rFile,
-                                        checkDir) )
-                                          
-    #PROCESS OTHER LOG FILES (MESH CHARACTERISTICS & OTHER)=============
+# -- incremental parser of the solver log
+parser   = LogParser(checkDir + fileList[1],nTail=0)
+parser.load(checkDir + fileNm)                                          #continue from the cached data
+parser.update()                                                         #catch up with the local mirror
+# -- persistent connection to the remote server
+fetcher  = LogFetcher(rServer,rUser)
+fetcher.connect()
+
+#DATA PROCESSING (RUNS IN THE BACKGROUND THREAD)========================
+def readNCells():
+    """ number of cells in the mesh (in millions) from log.blockMesh"""
+    if not os.path.isfile(checkDir + fileList[0]):
+        return 0.0
     with open(checkDir + fileList[0], 'r') as file:
-        # read a list of lines into data
-        data = file.readlines()
-        
-    idStr = ['nCells: ']                                                #get number of cells in the mesh
-    
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
+        for line in file:
+            fInd = line.find('nCells: ')
             if fInd>=0:
-                nCells = round(float(data[i][fInd+len(idStr[j])::])/1e6,1)
-                break
-    
-    
-    #LOAD THE FILE INTO MEMORY==========================================
-    with open(checkDir + fileList[1], 'r') as file:
-        # read a list of lines into data
-        data = file.readlines()
+                return round(float(line[fInd+len('nCells: ')::])/1e6,1)
+    return 0.0
+
+def refresh():
+    """ process the new part of the log, returns number of new iterations"""
+    nNew = 0
+    for rFile in fileList:                                              #only the appended bytes are transferred
+        for offset,newData in fetcher.fetchTail(caseDir + rFile,checkDir + rFile):
+            if rFile == fileList[1]:
+                nNew += parser.feed(newData,offset)                     #hand the bytes directly to the parser
+    if nNew:                                                            #store the new data
+        parser.save(checkDir + fileNm)
+    return nNew
+
+def snapshot():
+    """ prepare the data for the plot (the plotting thread only updates
+        the artists), long histories are downsampled"""
+    if not parser.nSteps:                                               #no finished iteration yet
+        return None
+    data = {}
     
     #GET NUMBER OF CORES USED (AND POSSIBLY OTHER DESCRIPTION)==========
-    idStr = [
-                'nProcs : ',
-                'Date   : ',
-                'Time   : ',
-                'Case   : ',
-                'Exec   : ',
-                'Build  : ',            
-            ]
-    
-    out = []
-    
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd==0:
-                out.append(data[i][fInd+len(idStr[j])::])
-                break
+    hdrVals = [parser.header.get(key,'') for key in 
+                ['nProcs','Date','Time','Case','Exec','Build']
+              ]
                 
-    nProcs = int(out[0])                                                #get number of cores
-    Date,Time,Case,Exec,Build = out[1::]                                #get start time and date and case
-    Date,Time,Case,Exec,Build = Date[0:-1],Time[0:-1],Case[0:-1],Exec[0:-1],Build[0:-1]
+    nProcs = int(hdrVals[0] or 1)                                       #get number of cores
+    Date,Time,Case,Exec,Build = hdrVals[1::]                            #get start time and date and case
     
     Case   = Case.split('/')                                            #extract relevant data from the case
     Case   = Case[-1]
     
-    ttlStr = ("%s, %d cores, %.1fMM cells, case: %s, "%(sTitle, nProcs, nCells, Case) + 
+    ttlStr = ("%s, %d cores, %.1fMM cells, case: %s, "%(sTitle, nProcs, readNCells(), Case) + 
                  "solver: %s, version: %s"%(Exec, Build))
-    plt.suptitle("\n".join(textwrap.wrap(ttlStr, 100)),
-                 fontsize=24)
-    
-    
-    #PLOT TIMESTEPEVOLUTION=============================================
-    # -- not applicable for the steady state simulations
+    data['title'] = "\n".join(textwrap.wrap(ttlStr, 100))
     
-    #PLOT THE RESIDUALS=================================================
-    # TBD: modification for being able to choose how many timesteps I
-    #      want to see
-    partData = data
-            
-    #~ partData.reverse()                                                  #flip the list
+    #RESIDUALS==========================================================
+    # -- residuals of the first solution of each variable in iteration
+    resType = '_final' if finRes else '_init'                           #final or initial residuals
+    iterNum = np.arange(1,parser.nSteps+1)
     
+    data['res']    = [downsample(iterNum,parser.col(varName + resType),nPlot)
+                        for varName in varInt]
+    data['nSteps'] = parser.nSteps
     
-    idStr = ['Solving for %s'%varName for varName in varInt]            #in which variables am I interested
+    #CALCULATION TIME===================================================
+    execTime = np.append(0.0,parser.col('execTime'))                    #current execution time
+    stepTime = np.append(0.0,np.diff(execTime))                         #current timestep difference
     
-    vec   = [[] for i in range(len(varInt))]                            #reziduals
-    lVarInt = len(vec)
-    
-    # Note: I suspect, that the bellow is not exactly pretty (but it works)
-    updLst = [False]*lVarInt                                            #create list which tells me, if the variables were updated
-                
-    for i in range(len(partData)):                                      #go through the partData
-        if partData[i].find('Time = ') == 0:                            #if I reach a new iteration
-            k = 0
-            cVecLen = len(vec[0])                                       #get current veclength
-            aVecLen = cVecLen                                           #auxiliary variable
-            while any(itm == False for itm in updLst):                  #if any of the variables is still not updated
-                for j in range(len(idStr)):                             #go throught the variables of interest
-                    fInd = partData[i+k].find(idStr[j])
-                    if fInd>-1 and not updLst[j]:
-                        auxStr = partData[i+k][fInd::].split('residual = ')       #lets split the rest using residual. should result in 3 substrings (2 occurences of the splitting string)
-                        if not finRes:
-                            vec[j].append(float(auxStr[1].split(',')[0]))       #process the first occurence
-                        else:
-                            vec[j].append(float(auxStr[2].split(',')[0]))       #process the last occurence
-                        updLst[j] = True
-                k += 1
-            updLst = [False]*lVarInt                                #reset the updates
-                
+    data['exec'] = downsample(np.arange(len(stepTime)),stepTime,nPlot)
     
-    host = plt.subplot2grid((1,1),(0,0), colspan = 1)
-    plt.cla()
-    plt.xlim([0,max([len(vv) for vv in vec])])
-    #~ plt.grid(True, which='major')
-    mLen = max([len(v) for v in vec])                                   #maximal vector length
-    linecycler,markercycler,colorcycler=createCyclers() #restart the cyclers
-    for i in range(len(varInt)):
-        cLen = len(vec[i])
-        host.semilogy(np.linspace(0,mLen,cLen),vec[i],'-',c=next(colorcycler),label=varInt[i],lw=3)
-    host.set_ylabel('Reziduals')
-    host.set_xlabel('Number of iterations')
-    host.set_ylim([10**(math.floor(math.log10(min(min(vec))))),1])
-    host.legend(bbox_to_anchor=(0.7, 0.95), loc=2, borderaxespad=0.)
-    
-    #PLOT CALCULATION TIME==============================================
-    idStr = [
-             'ExecutionTime = ',
-            ] 
+    return data
+
+#FIGURE LAYOUT (ARTISTS ARE CREATED ONCE, ONLY THEIR DATA ARE UPDATED)==
+ttlArt = plt.suptitle('', fontsize=24)
+
+linecycler,markercycler,colorcycler=createCyclers()
+
+# -- residuals
+host   = plt.subplot2grid((1,1),(0,0), colspan = 1)
+lnRes  = [host.semilogy([],[],'-',c=next(colorcycler),label=varInt[i],lw=3)[0] for i in range(len(varInt))]
+host.set_ylabel('Reziduals')
+host.set_xlabel('Number of iterations')
+host.legend(bbox_to_anchor=(0.7, 0.95), loc=2, borderaxespad=0.)
+
+# -- calculation time
+par    = host.twinx()
+exCol  = next(colorcycler)
+exArt  = []                                                             #fill_between has no set_data
+par.set_ylabel('Computation time / time step, [s]')
+
+def updatePlots(data):
+    """ put the new snapshot into the existing artists"""
+    ttlArt.set_text(data['title'])
     
-    vec   = [[0.0],[0.0],[0]]
-        
-    for j in range(len(idStr)):
-        for i in range(len(data)):
-            fInd = data[i].find(idStr[j])
-            if fInd>-1:
-                curTime = data[i].split(' ')                            #split the relevant line by spaces
-                curTime = float(curTime[2])                             #hardcoded position (solver specific)
-                vec[j].append(curTime)                                  #current execution time
-                vec[j+1].append(curTime-vec[j][-2])                     #current timestep difference
-                vec[j+2].append(vec[j+2][-1]+1)                         #timestep number
-           
-    meanVal = np.mean(vec[1])                                           #get mean value
-    vec.append([absVal/meanVal for absVal in vec[1]])
-        
-    hExecTime = [execTime/3600 for execTime in vec[0]] 
+    # -- residuals
+    for ln,(x,y) in zip(lnRes,data['res']):
+        ln.set_data(x,y)
+    host.set_xlim([0,data['nSteps']])
+    resMin = np.nanmin(np.concatenate([y for x,y in data['res']]))
+    host.set_ylim([10**(math.floor(math.log10(resMin))),1])
     
-    par  = host.twinx()
-    par.fill_between(
-        np.linspace(0,len(vec[1]),len(vec[1])),0,vec[1],
-        color = next(colorcycler),
+    # -- calculation time
+    x,y = data['exec']
+    while exArt:
+        exArt.pop().remove()
+    exArt.append(par.fill_between(
+        x,0,y,
+        color = exCol,
         alpha = 0.3,
         zorder = -1,
-    )
-    par.set_ylabel('Computation time / time step, [s]')
-    par.set_ylim([min(vec[1])*0.9,max(vec[1])*1.1])
-    
-    plt.axis('tight')
+    ))
+    par.set_ylim([np.nanmin(y)*0.9,np.nanmax(y)*1.1])
     
-    #PLOT COURANT AND INTERFACE COURANT NUMBERS=========================
-    # -- not applicable for the steady state simulations
-    
-    #PLOT RESIDUALS OVER LAST M TIME STEPS==============================
-    # -- not applicable for the steady state simulations
-    
-    #SAVE THE RESULTING FIGURE AND UPDATE GRAPHS========================
-    # -- draw the figure
-    plt.tight_layout(rect=[0, 0.03, 1, 0.90])
-    plt.savefig('runAnalysis.png', dpi=160)
-    plt.draw()    
-    
-    if not updatePl:
-        break
+    fig.canvas.draw_idle()
 
-    time.sleep(updInt)
-    
+#PROGRAM ITSELF=========================================================
+worker = LogWorker(refresh,snapshot,updInt)
+
+if not updatePl:                                                        #single refresh, no background thread
+    data = worker.runOnce()
+    if data is not None:
+        updatePlots(data)
+        plt.tight_layout(rect=[0, 0.03, 1, 0.90])
+        plt.savefig('runAnalysis.png', dpi=160)
+else:
+    worker.start()                                                      #parsing runs in the background
+    while True:
+        data = worker.latest()
+        if data is not None:
+            updatePlots(data)
+            plt.tight_layout(rect=[0, 0.03, 1, 0.90])
+            plt.savefig('runAnalysis.png', dpi=160)
+        plt.pause(0.5)                                                  #keep the window responsive
+
+fetcher.close()
 plt.show()
@@ -0,0 +1,275 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Python script to profile the solver performance from its log
+
+#~ Total ExecutionTime differences only say how expensive a time step
+#~ is, not why. The script uses the per time step content of the log
+#~ (number of PIMPLE outer iterations, linear solver iterations of each
+#~ "Solving for" line, number of the pressure solutions, Courant number)
+#~ to attribute the wall time to the solver settings in system/fvSolution
+#~ (the ones written by caseConstructorV9.py - nOuterCorrectors,
+#~ nCorrectors, nNonOrthogonalCorrectors) and to the Courant number
+#~ limited time step (maxCo in system/controlDict)
+
+#~ The wall time of each time step is fitted (non-negative least
+#~ squares) by
+#~   wall = c0 + cPimple*nPimple + sum(cVar*nIterVar)
+#~ i.e. fixed cost per time step, overhead per outer iteration (matrix
+#~ assembly, MULES, ...) and cost per linear solver iteration of each
+#~ variable. The fitted terms are then redistributed to the settings:
+#~  - nOuterCorrectors          ... all the outer iterations after the
+#~                                  first one
+#~  - nCorrectors               ... pressure solutions of the PISO
+#~                                  correctors after the first one
+#~  - nNonOrthogonalCorrectors  ... pressure solutions of the
+#~                                  non-orthogonal correctors
+#~ and reported as wall time per simulated second
+
+#USAGE==================================================================
+#  1. Copy the script and fparseLog.py to a clean folder with the log
+#     (or specify checkDir), specify caseDir to read fvSolution and
+#     controlDict (the settings are estimated from the log otherwise)
+#  2. Run the script
+
+#LICENSE================================================================
+#  procLogProfile.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+# -- math and other operations on the data
+import numpy as np
+from scipy.optimize import nnls
+# -- plotting
+import matplotlib.pyplot as plt
+#IMPORT BLOCK-CUSTOM====================================================
+from fparseLog import LogParser,downsample                              #incremental log parser
+
+#CUSTOM FUNCTIONS=======================================================
+def readDictVals(fileName,keys,block=None):
+    """ read the numerical values of keys from OpenFOAM dictionary file,
+        only inside of the given block (e.g. PIMPLE) if specified"""
+    vals = dict((key,np.nan) for key in keys)
+    if not os.path.isfile(fileName):
+        return vals
+    with open(fileName, 'r') as file:
+        data = file.readlines()
+    bFlag = block is None
+    for line in data:
+        words = line.replace(';',' ').split()
+        if not words:
+            continue
+        if not bFlag and words[0] == block:                             #start of the block
+            bFlag = True
+            continue
+        if bFlag and block is not None and words[0] == '}':             #end of the block
+            break
+        if bFlag and words[0] in keys and len(words) > 1:
+            try:
+                vals[words[0]] = float(words[1])
+            except ValueError:
+                pass
+    return vals
+
+#INPUT VARIABLES========================================================
+# -- which file to process
+logName = 'log.interFoam'
+
+# -- case directory (system/fvSolution and system/controlDict)
+caseDir = os.getcwd() + '/'
+
+# -- pressure variables (their solutions are counted as correctors)
+pNames  = ['p_rgh','p']
+
+# -- which part of the simulation to profile (last nProf time steps)
+nProf   = 10000
+
+# -- graphical output parameters
+nPlot   = 2000                                                          #max. number of points shown in the history plots
+
+#OUTPUT VARIABLE========================================================
+fileNm  = 'simAnalysisData.npz'                                         #columnar cache of the parsed log (fparseLog.py)
+figNm   = 'profileAnalysis.png'
+
+#DO NOT MODIFY (PREFERABLY)=============================================
+# -- local location
+checkDir= os.getcwd() + '/'                                             #get current directory
+
+# -- incremental parser of the solver log
+parser  = LogParser(checkDir + logName,nTail=0)
+parser.load(checkDir + fileNm)                                          #continue from the cached data
+if parser.update():
+    parser.save(checkDir + fileNm)
+
+# -- solver settings
+pimpSet = readDictVals(caseDir + 'system/fvSolution',
+            ['nOuterCorrectors','nCorrectors','nNonOrthogonalCorrectors'],'PIMPLE')
+ctrlSet = readDictVals(caseDir + 'system/controlDict',['maxCo','maxAlphaCo'])
+
+#PROGRAM ITSELF=========================================================
+if parser.nSteps < 3:
+    raise SystemExit('Not enough finished time steps in %s'%(checkDir + logName))
+
+#PER TIME STEP DATA=====================================================
+# -- wall time of each step (first step has no predecessor)
+sl      = slice(max(1,parser.nSteps-nProf),parser.nSteps)
+wall    = np.diff(parser.col('clockTime'))[sl.start-1:]
+deltaT  = parser.col('deltaT')[sl]
+nPimple = np.maximum(parser.col('nPimple')[sl],1)                       #PISO -> 1 outer iteration
+CoMax   = parser.col('CoMax')[sl]
+stepNum = np.arange(sl.start,sl.stop) + 1
+
+varList = sorted(name[:-6] for name in parser.cols if name.endswith('_nIter'))
+nIter   = dict((var,parser.col(var + '_nIter')[sl].astype(float)) for var in varList)
+nSolve  = dict((var,parser.col(var + '_nSolve')[sl].astype(float)) for var in varList)
+pVar    = [var for var in pNames if var in varList]
+pVar    = pVar[0] if pVar else None
+
+simSpan = np.nansum(deltaT)                                             #simulated time of the profiled steps
+wallSum = np.sum(wall)
+costSec = wallSum/simSpan                                               #wall seconds per simulated second
+
+#COST MODEL=============================================================
+# -- wall = c0 + cPimple*nPimple + sum(cVar*nIterVar), coefs >= 0
+names   = ['per step','per outer iteration'] + ['%s iterations'%var for var in varList]
+A       = np.column_stack([np.ones(len(wall)),nPimple] + [nIter[var] for var in varList])
+coefs,_ = nnls(A,wall)
+terms   = A*coefs                                                       #contribution of each term to each step
+fitWall = terms.sum(axis=1)
+R2      = 1.0 - np.sum((wall - fitWall)**2)/max(np.sum((wall - wall.mean())**2),1e-300)
+share   = terms.sum(axis=0)/wallSum                                     #share of the total wall time
+
+#ATTRIBUTION TO THE SETTINGS============================================
+# -- settings actually used (estimated from the log, if not read)
+nPSolve = nSolve[pVar] if pVar else np.zeros(len(wall))
+estSet  = [key for key in pimpSet if np.isnan(pimpSet[key])]            #estimated settings
+if np.isnan(pimpSet['nOuterCorrectors']):
+    pimpSet['nOuterCorrectors'] = np.max(nPimple)
+if np.isnan(pimpSet['nCorrectors']):                                    #indistinguishable from nNonOrth in the log
+    pimpSet['nCorrectors'] = 1.0
+if np.isnan(pimpSet['nNonOrthogonalCorrectors']):                       #pressure solutions per corrector - 1
+    pimpSet['nNonOrthogonalCorrectors'] = max(0.0,
+        np.round(np.median(nPSolve/(nPimple*pimpSet['nCorrectors']))) - 1) if pVar else 0.0
+nCorr   = pimpSet['nCorrectors']
+nNonOrth= pimpSet['nNonOrthogonalCorrectors']
+
+# -- cost of one outer iteration (everything but the fixed part)
+iterCost= terms[:,1:].sum(axis=1)/nPimple
+pCost   = terms[:,2 + varList.index(pVar)] if pVar else np.zeros(len(wall))
+pPerSol = pCost/np.maximum(nPSolve,1)                                   #pressure cost per solution
+
+setCost = [
+            ('nOuterCorrectors',         pimpSet['nOuterCorrectors'],
+                np.sum(iterCost*(nPimple - 1))),
+            ('nCorrectors',              pimpSet['nCorrectors'],
+                np.sum(pPerSol*nPimple*(nCorr - 1)*(nNonOrth + 1))),
+            ('nNonOrthogonalCorrectors', pimpSet['nNonOrthogonalCorrectors'],
+                np.sum(pPerSol*nPimple*nCorr*nNonOrth)),
+          ]
+
+# -- time step limited by the Courant number
+maxCo   = ctrlSet['maxCo']
+if np.isnan(maxCo):
+    maxCo = np.nanmax(CoMax)
+coLim   = np.mean(CoMax >= 0.95*maxCo)                                  #fraction of Co limited steps
+
+#PRINT THE REPORT=======================================================
+print('Profiled time steps     : %d - %d (%d steps)'%(stepNum[0],stepNum[-1],len(wall)))
+print('Simulated time          : %.4g s'%simSpan)
+print('Wall time               : %.4g s (%.3g s/step)'%(wallSum,wallSum/len(wall)))
+print('Cost                    : %.4g wall s / simulated s'%costSec)
+print('Mean deltaT             : %.4g s, Co limited steps: %.0f %% (maxCo = %g)'%(
+        np.nanmean(deltaT),100*coLim,maxCo))
+print('PIMPLE iterations/step  : mean %.2f, max %d (nOuterCorrectors = %g)'%(
+        np.mean(nPimple),np.max(nPimple),pimpSet['nOuterCorrectors']))
+print('Steps at nOuterCorrectors: %.0f %%'%(100*np.mean(nPimple >= pimpSet['nOuterCorrectors'])))
+print('')
+print('%-26s %10s %10s %12s'%('variable','solves/step','iter/solve','iter/step'))
+for var in varList:
+    print('%-26s %10.2f %10.2f %12.2f'%(var,np.mean(nSolve[var]),
+            np.sum(nIter[var])/max(np.sum(nSolve[var]),1),np.mean(nIter[var])))
+print('')
+print('Cost model (R2 = %.3f)'%R2)
+print('%-26s %12s %10s %16s'%('term','coef [s]','share [%]','wall s / sim s'))
+for i in range(len(names)):
+    print('%-26s %12.4g %10.1f %16.4g'%(names[i],coefs[i],100*share[i],share[i]*costSec))
+print('')
+print('Attribution to fvSolution (PIMPLE) settings')
+print('%-26s %8s %10s %16s'%('setting','value','share [%]','wall s / sim s'))
+for name,val,cost in setCost:
+    print('%-26s %8s %10.1f %16.4g'%(name,'%g'%val + ('*' if name in estSet else ''),
+            100*cost/wallSum,cost/wallSum*costSec))
+if estSet:
+    print('(* not found in %s, estimated from the log)'%(caseDir + 'system/fvSolution'))
+print('(the settings overlap, e.g. non-orthogonal correctors are repeated in')
+print(' each outer iteration - the shares are not additive)')
+
+#OVERVIEW FIGURE========================================================
+fig = plt.figure(num=None, figsize=(20, 12), dpi=80, facecolor='w', edgecolor='k')
+
+# -- wall time per step and its model
+plt.subplot(2,2,1)
+x,y = downsample(stepNum,wall,nPlot)
+plt.plot(x,y,'bo',label='measured')
+x,y = downsample(stepNum,fitWall,nPlot)
+plt.plot(x,y,'r-',label='cost model')
+plt.title('Wall time per time step')
+plt.xlabel('Simulation step [--]')
+plt.ylabel('Wall time [s]')
+plt.legend(loc='best')
+plt.grid(True)
+
+# -- cost breakdown (model terms and settings)
+plt.subplot(2,2,2)
+labels  = names + [name for name,val,cost in setCost]
+vals    = list(share*costSec) + [cost/wallSum*costSec for name,val,cost in setCost]
+colors  = ['dodgerblue']*len(names) + ['firebrick']*len(setCost)
+yPos    = np.arange(len(labels))
+plt.barh(yPos,vals,color=colors)
+plt.yticks(yPos,labels)
+plt.gca().invert_yaxis()
+plt.title('Cost breakdown (blue: model terms, red: settings)')
+plt.xlabel('Wall time / simulated time [s/s]')
+plt.grid(True, axis='x')
+
+# -- wall time vs PIMPLE iterations
+plt.subplot(2,2,3)
+plt.plot(nPimple,wall,'d',c='darkgoldenrod')
+plt.title('Wall time vs PIMPLE iterations')
+plt.xlabel('PIMPLE iterations [--]')
+plt.ylabel('Wall time [s]')
+plt.grid(True)
+
+# -- linear solver iterations per step
+plt.subplot(2,2,4)
+for var in varList:
+    x,y = downsample(stepNum,nIter[var],nPlot)
+    plt.plot(x,y,'-',label=var)
+plt.title('Linear solver iterations per time step')
+plt.xlabel('Simulation step [--]')
+plt.ylabel('Iterations [--]')
+plt.legend(loc='best')
+plt.grid(True)
+
+plt.tight_layout()
+plt.savefig(figNm, dpi=100)
+plt.show()
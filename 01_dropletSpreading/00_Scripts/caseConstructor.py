@@ -53,6 +53,8 @@ import shutil as sh
 from dfluidData import dfluidData
 from fblockMeshGen import fblockMeshGen                                 #blockMeshDict generation
 #~ from finletBCWriter   import finletBCWriter                             #BC adjustment
+from ffoamDict import FoamDict                                          #parsed OpenFOAM dictionaries
+from fcaseMaterializer import materializeCase                           #caseDir from the baseCase (links)
 
 #########EDITABLE#######################################################
 
@@ -104,10 +106,6 @@ caseDir     = ('../iF_Drop' + repr(nDims) + 'D' +
                 '_' + liqName + '_L3/'
                 )
 
-if os.path.isdir(caseDir):                                              #ensure, that the caseDir is clear
-    sh.rmtree(caseDir)
-    
-sh.copytree(baseCase,caseDir)                                             #copy data to caseDir
 #SPECIFY CURRENT SCRIPT VERSIONS========================================
 blockMeshGen        = 'fblockMeshGen'
 caseConstructor     = 'caseConstructor'
@@ -129,8 +127,26 @@ scNames = [ blockMeshGen,                                               #preProc
             #~ blenderPrep,                                                #rivulet postprocessing (blender)
             simControl                                                  #script for case run control
             ]                                   
-for scName in scNames:
-    sh.copyfile(scFolder + scName + '.py',caseDir + scName + '.py')     #copy current script version
+
+# -- files patched by this script (and by the called functions), these
+#    are really copied, the rest is linked to the baseCase and scFolder
+cpFiles = [ 'README',
+            '0.org/alpha.liquid',
+            'constant/g',
+            'constant/transportProperties',
+            'constant/polyMesh/blockMeshDict',                          #fblockMeshGen
+            'constant/polyMesh/boundary',                               #rewritten by the mesh generation
+            'system/setFieldsDict',
+            'system/decomposeParDict',
+            'system/controlDict',
+            'system/fvSolution',
+            'Allrun-parallel',
+            'of.sh',
+            ]
+
+nFiles = materializeCase(baseCase,caseDir,cpFiles,scFolder,scNames)     #ensures, that the caseDir is clear
+print 'caseDir files (reflinked, hard-linked, copied): %d, %d, %d\n'%(
+        nFiles['reflink'],nFiles['link'],nFiles['copy'])
 
 #CASE CONSTANTS AND CALCULATIONS========================================
 # input data------------------------------------------------------------
@@ -194,24 +210,18 @@ README.write('\n 0.org==============================================\n')
 #
 README.write('\n alpha.liquid\n')
 
-pVals   = [repr(theta0),repr(thetaA),repr(thetaR)]                      #contact angles
+pVals   = [theta0,thetaA,thetaR]                                        #contact angles
 
 idStr   = ['theta0','thetaA','thetaR']
 
-# write everything to the file
-with open(caseDir + './0.org/alpha.liquid', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
+fDict   = FoamDict(caseDir + './0.org/alpha.liquid')
+
 for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t\t\t' + pVals[j] + ';\n'
+    for path in fDict.paths(idStr[j]):                                  #all the patches with contact angle
+        fDict.set(path,pVals[j])
 
-with open(caseDir + './0.org/alpha.liquid', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 print 'DONE=======================================\n\n'
 
 #CONSTANTS DIRECTORY FILES MODIFICATIONS================================
@@ -231,22 +241,12 @@ gx    = math.sin(alpha)*g
 gy    = 0.0
 gz    = -math.cos(alpha)*g
 
-idStr = 'value'
+fDict = FoamDict(caseDir + './constant/g')
 
-# write everything to the file
-with open(caseDir + './constant/g', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for i in range(len(data)):
-    fInd = data[i].find(idStr)
-    if fInd>-1:
-        data[i] = (data[i][:fInd] + idStr + '\t\t\t(' 
-        + repr(gx) + '\t' + repr(gy) + '\t' + repr(gz) + ');\n')
+fDict.set('value',(gx,gy,gz))
 
-with open(caseDir + './constant/g', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # transportProperties
@@ -256,28 +256,17 @@ with open(caseDir + './constant/g', 'w') as file:
 #
 README.write('\n transportProperties\n')
 
-idStr = ['nu [ 0 2 -1 0 0 0 0 ]',
-         'rho [ 1 -3 0 0 0 0 0 ]',
-         'sigma [ 1 0 -2 0 0 0 0 ]']         
+fDict = FoamDict(caseDir + './constant/transportProperties')
 
-pVals = [nu,rho,sigma]
+phases= fDict.get('phases').strip('()').split()                         #order of the values in nu and rho
 
-# write everything to the file
-with open(caseDir + './constant/transportProperties', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    k = 0
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + repr(pVals[j][k]) + ';\n'
-            k = k+1
+for k in range(len(phases)):                                            #only the values, dimensions are kept
+    fDict.setLast(phases[k] + '/nu',nu[k])
+    fDict.setLast(phases[k] + '/rho',rho[k])
+fDict.setLast('sigma',sigma[0])
 
-with open(caseDir + './constant/transportProperties', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 print 'DONE=======================================\n\n'   
 #SYSTEM DIRECTORY FILES MODIFICATIONS===================================
@@ -336,24 +325,12 @@ print 'DONE=======================================\n\n'
 #
 README.write('\n decomposeParDict\n')
 
-idStr = ['numberOfSubdomains ']
-
-pVals = [repr(nCores)]
+fDict = FoamDict(caseDir + './system/decomposeParDict')
 
-# write everything to the file
-with open(caseDir + './system/decomposeParDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('numberOfSubdomains',nCores)
 
-with open(caseDir + './system/decomposeParDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 #-----------------------------------------------------------------------
 # controlDict
 #-----------------------------------------------------------------------
@@ -362,24 +339,14 @@ with open(caseDir + './system/decomposeParDict', 'w') as file:
 #
 README.write('\n controlDict\n')
 
-idStr = ['startTime ','endTime ','writeInterval ']
+fDict = FoamDict(caseDir + './system/controlDict')
 
-pVals = [repr(startTime),repr(endTime),repr(wrInt)]
+fDict.set('startTime',startTime)
+fDict.set('endTime',endTime)
+fDict.set('writeInterval',wrInt)
 
-# write everything to the file
-with open(caseDir + './system/controlDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
-
-with open(caseDir + './system/controlDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # fvSolution
@@ -389,53 +356,19 @@ with open(caseDir + './system/controlDict', 'w') as file:
 #
 README.write('\n fvSolution\n')
 
-# read the file
-with open(caseDir + './system/fvSolution', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
+fDict = FoamDict(caseDir + './system/fvSolution')
 
 # update information on number of cells in coarses level for multigrid
-idStr = ['nCellsInCoarsestLevel ']
+for path in fDict.paths('nCellsInCoarsestLevel'):
+    fDict.set(path,10*nCores)
 
-pVals = [repr(10*nCores)]
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + pVals[j] + ';\n'
-            
-idStr = [
-            'nOuterCorrectors    ',
-            'nCorrectors         ',
-            'nNonOrthogonalCorrectors ',
-        ]
-        
-pFlag = False
-
-pVals = [
-            repr(nOuterCorrectors),
-            repr(nCorrectors),
-            repr(nNonOrthoCorrectors),
-        ]
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        if data[i].find('PIMPLE') >-1:                                  #modify only the PIMPLE algorithm
-            pFlag = True
-        if pFlag:
-            fInd = data[i].find(idStr[j])
-            if fInd>-1:
-                data[i] = data[i][:fInd] + idStr[j] + pVals[j] + ';\n'
-            if data[i].find('}') == 0:
-                pFlag = False                                           #stop when you reach the end of its settings
-    pFlag = False                                                       #stop at the end of file
-            
 # update the PIMPLE algorithm settings
+fDict.set('PIMPLE/nOuterCorrectors',nOuterCorrectors)
+fDict.set('PIMPLE/nCorrectors',nCorrectors)
+fDict.set('PIMPLE/nNonOrthogonalCorrectors',nNonOrthoCorrectors)
 
-with open(caseDir + './system/fvSolution', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 
 print 'DONE=======================================\n\n'   
 #RUN SCRIPTS PREPARATION================================================
@@ -0,0 +1,276 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Parsed model of the OpenFOAM dictionary files
+#~
+#~ The file is split into tokens (words, strings, punctuation, verbatim
+#~ #{ #} blocks) and trivia (whitespace and comments), the tokens are
+#~ assembled into a tree of dictionaries and entries. The trivia are
+#~ kept in the tree, so an unmodified file is written back byte by byte
+#~ and only the modified values change
+#~
+#~ NOTES:
+#~  - entries are addressed by key paths, e.g. 'PIMPLE/nOuterCorrectors'
+#~    or 'boundaryField/inlet/massFlowRate', quotes of the regexp keys
+#~    are not part of the path ('solvers/(U|alpha)/tolerance')
+#~  - the last entry with the given key is used (as in OpenFOAM)
+#~  - set() adds the entry (and the missing sub-dictionaries) if it
+#~    does not exist
+#~  - python values are formatted as OpenFOAM ones (numbers by repr,
+#~    lists and tuples as (a b c), booleans as true/false), strings are
+#~    written as they are
+#~
+#~ USAGE:
+#~     fvSol = FoamDict(caseDir + 'system/fvSolution')
+#~     fvSol.set('PIMPLE/nOuterCorrectors',50)
+#~     for path in fvSol.paths('nCellsInCoarsestLevel'):
+#~         fvSol.set(path,10*nCores)
+#~     fvSol.write()
+
+#LICENSE================================================================
+#  ffoamDict.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import re                                                               #regexp
+
+#TOKENIZER==============================================================
+tokRe   = re.compile(r'''
+    (?P<ws>\s+|//[^\n]*|/\*.*?\*/)                                      #trivia
+   |(?P<verb>\#\{.*?\#\})                                               #verbatim (code) block
+   |(?P<str>"(?:[^"\\]|\\.)*")                                          #string
+   |(?P<punct>[{}()\[\];])
+   |(?P<word>(?:[^\s{}()\[\];"/]|/(?![/*]))+)
+   |(?P<other>.)
+''',re.VERBOSE | re.DOTALL)
+
+def tokenize(text):
+    """ list of (kind,text) tokens, kind is ws for trivia"""
+    return [(match.lastgroup,match.group()) for match in tokRe.finditer(text)]
+
+def fmtVal(val):
+    """ OpenFOAM representation of the python value"""
+    if isinstance(val,bool):
+        return 'true' if val else 'false'
+    if isinstance(val,(list,tuple)):
+        return '(' + ' '.join(fmtVal(v) for v in val) + ')'
+    if isinstance(val,(int,float)):
+        return repr(val)
+    return str(val)
+
+#CLASS DEFINITION=======================================================
+class FoamEntry(object):
+    """ keyword with its value or with its sub-dictionary"""
+
+    def __init__(self,key,pre=None,value=None,post=';',sub=None):
+        self.key   = key                                                #keyword as written in the file
+        self.pre   = pre or []                                          #trivia between the key and the value
+        self.value = value or []                                        #value tokens (and the inner trivia)
+        self.post  = post                                               #terminating ';' ('' if missing)
+        self.sub   = sub                                                #FoamNode for sub-dictionaries
+
+    def name(self):
+        """ keyword without the quotes"""
+        return self.key.strip('"')
+
+    def text(self):
+        if self.sub is not None:
+            return self.key + ''.join(self.pre) + '{' + self.sub.text() + '}'
+        return self.key + ''.join(self.pre) + ''.join(self.value) + self.post
+
+class FoamNode(object):
+    """ dictionary - list of the entries and of the trivia between them"""
+
+    def __init__(self,items=None):
+        self.items = items or []                                        #FoamEntry or trivia string
+
+    def text(self):
+        return ''.join(item if isinstance(item,str) else item.text() for item in self.items)
+
+    def entries(self):
+        return [item for item in self.items if isinstance(item,FoamEntry)]
+
+    def entry(self,key):
+        """ last entry with the given key (None if not present)"""
+        found = [entry for entry in self.entries() if entry.name() == key]
+        return found[-1] if found else None
+
+    def indent(self,default=''):
+        """ indentation of the entries (from the first one)"""
+        for i in range(len(self.items)):
+            if isinstance(self.items[i],FoamEntry) and i > 0:
+                ws = self.items[i-1]
+                return ws[ws.rfind('\n')+1:] if '\n' in ws else default
+        return default
+
+    def addEntry(self,entry,indent):
+        """ append entry after the last entry of the node"""
+        ind = max([i+1 for i in range(len(self.items)) if isinstance(self.items[i],FoamEntry)] or [0])
+        if ind == 0:                                                    #empty node, before the closing brace
+            ind = len(self.items)
+            if self.items and not self.items[-1].strip():
+                ind -= 1
+        self.items[ind:ind] = ['\n' + indent,entry]
+
+class FoamDict(FoamNode):
+    """ parsed OpenFOAM dictionary file"""
+
+    def __init__(self,fileName=None,text=None):
+        FoamNode.__init__(self)
+        self.fileName = fileName
+        if text is None:
+            with open(fileName,'r') as file:
+                text = file.read()
+        self.toks = tokenize(text)
+        self.items,ind = self.parseNode(0,True)
+        self.items.extend(tok for kind,tok in self.toks[ind:])          #unparsed rest (unbalanced braces)
+        del self.toks
+
+    #PARSER=============================================================
+    def parseNode(self,ind,top=False):
+        """ parse entries from the token ind until the closing brace"""
+        toks  = self.toks
+        items = []
+        while ind < len(toks):
+            kind,tok = toks[ind]
+            if kind == 'ws':
+                items.append(tok)
+                ind += 1
+            elif tok == '}':
+                if top:                                                 #unbalanced brace
+                    items.append(tok)
+                    ind += 1
+                    continue
+                return items,ind
+            elif kind in ['word','str']:
+                entry,ind = self.parseEntry(ind)
+                items.append(entry)
+            else:                                                       #e.g. list without a keyword
+                items.append(tok)
+                ind += 1
+        return items,ind
+
+    def parseEntry(self,ind):
+        """ parse keyword and its value (or sub-dictionary)"""
+        toks  = self.toks
+        entry = FoamEntry(toks[ind][1],post='')
+        ind  += 1
+        while ind < len(toks) and toks[ind][0] == 'ws':
+            entry.pre.append(toks[ind][1])
+            ind += 1
+        if ind < len(toks) and toks[ind][1] == '{':                     #sub-dictionary
+            entry.sub      = FoamNode()
+            entry.sub.items,ind = self.parseNode(ind+1)
+            return entry,ind+1                                          #skip the closing brace
+        if entry.key.startswith('#'):                                   #directive, e.g. #include "file"
+            if ind < len(toks) and toks[ind][1] not in ['}',';']:
+                entry.value = [toks[ind][1]]
+                ind += 1
+            return entry,ind
+        depth = 0
+        while ind < len(toks):
+            kind,tok = toks[ind]
+            if depth == 0 and tok == ';':
+                entry.post = ';'
+                return entry,ind+1
+            if depth == 0 and tok == '}':                               #missing ';'
+                break
+            if kind == 'punct':
+                depth += (tok in '([{') - (tok in ')]}')
+            entry.value.append(tok)
+            ind += 1
+        return entry,ind
+
+    #ACCESS BY THE KEY PATH=============================================
+    def find(self,path):
+        """ (node,entry) for the key path, entry is None if missing"""
+        node = self
+        keys = path.split('/')
+        for key in keys[:-1]:
+            entry = node.entry(key)
+            if entry is None or entry.sub is None:
+                return None,None
+            node  = entry.sub
+        return node,node.entry(keys[-1])
+
+    def get(self,path,default=None):
+        """ value of the entry as a string (FoamNode for sub-dictionaries)"""
+        node,entry = self.find(path)
+        if entry is None:
+            return default
+        if entry.sub is not None:
+            return entry.sub
+        return ''.join(entry.value).strip()
+
+    def set(self,path,val):
+        """ set value of the entry, the entry is added if missing"""
+        keys = path.split('/')
+        node = self
+        ind  = ''
+        for key in keys[:-1]:                                           #create the missing sub-dictionaries
+            entry = node.entry(key)
+            ind   = node.indent(ind)
+            if entry is None or entry.sub is None:
+                entry = FoamEntry(key,pre=['\n' + ind],
+                                  sub=FoamNode(['\n' + ind]),post='')
+                node.addEntry(entry,ind)
+            node  = entry.sub
+            ind  += '    '
+        entry = node.entry(keys[-1])
+        if entry is None:
+            entry = FoamEntry(keys[-1],pre=[' '*max(1,16-len(keys[-1]))])
+            node.addEntry(entry,node.indent(ind))
+        entry.value = [fmtVal(val)]
+        entry.post  = ';'
+        entry.sub   = None
+
+    def setLast(self,path,val):
+        """ replace only the last word of the value (e.g. the value of
+            the dimensioned scalar 'nu [ 0 2 -1 0 0 0 0 ] 1e-06')"""
+        node,entry = self.find(path)
+        if entry is None or not entry.value:
+            return self.set(path,val)
+        ind = max(i for i in range(len(entry.value)) if entry.value[i].strip())
+        entry.value[ind] = fmtVal(val)
+
+    def paths(self,key,node=None,prefix=''):
+        """ key paths of all the entries with the given key (any depth)"""
+        node  = self if node is None else node
+        found = []
+        for entry in node.entries():
+            if entry.name() == key:
+                found.append(prefix + entry.name())
+            if entry.sub is not None:
+                found.extend(self.paths(key,entry.sub,prefix + entry.name() + '/'))
+        return found
+
+    #OUTPUT=============================================================
+    def __str__(self):
+        return self.text()
+
+    def write(self,fileName=None):
+        """ write the dictionary (to the parsed file by default), the file
+            is replaced, so the hard links to the baseCase are broken"""
+        fileName = fileName or self.fileName
+        with open(fileName + '.tmp','w') as file:
+            file.write(self.text())
+        os.rename(fileName + '.tmp',fileName)
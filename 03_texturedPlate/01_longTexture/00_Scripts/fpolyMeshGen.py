@@ -0,0 +1,247 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Direct generation of the polyMesh (points, faces, owner, neighbour,
+#~ boundary) for the film flow down an inclined plate - the same mesh
+#~ as given by fblockMeshGenV2 + blockMesh, without running blockMesh
+#~
+#~ NOTES:
+#~  - the mesh is one structured box (x fastest, then y, then z), the
+#~    z-direction consists of the three blocks of fblockMeshGenV2
+#~    (inlet, dense and graded sparse block)
+#~  - the texture is given by the polyLine edges of the plate (triangle
+#~    wave, see texture), the plate points are displaced in z by the
+#~    transfinite interpolation of the edges (the sum of the x and y
+#~    profiles for the pyramids) and the displacement decays linearly
+#~    to the top of the inlet block
+#~  - binary format (label=32, scalar=64, faceCompactList) by default,
+#~    ascii can be written as well
+#~  - Allrun.pre runs blockMesh only if there are no mesh points
+#~
+#~ USAGE:
+#~     fpolyMeshGen(caseDir,hIn,geomSize,cellSize,textPars,spGrad,mScale,
+#~         texType='long')
+
+#LICENSE================================================================
+#  fpolyMeshGen.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import math
+import numpy as np
+
+#MESH GEOMETRY==========================================================
+def gradedLine(n,grad):
+    """ relative positions of the n+1 points of a line with the
+        blockMesh simpleGrading (ratio of the last to the first cell)"""
+    if n == 1 or grad == 1.0:
+        return np.linspace(0.0,1.0,n+1)
+    xi = grad**(1.0/(n-1))
+    return (1.0 - xi**np.arange(n+1))/(1.0 - xi**n)
+
+def texture(s,sL,sT,hT):
+    """ texture profile along the plate edge - the polyLine of
+        fblockMeshGenV2 (0 at k*sT and sL, hT at k*sT + sT/2)"""
+    knots = np.arange(1,2*int(math.ceil(sL/sT)))*sT/2.0
+    knots = knots[knots < sL]
+    zs    = np.where(np.arange(1,len(knots)+1)%2 == 1,hT,0.0)
+    return np.interp(s,np.concatenate(([0.0],knots,[sL])),np.concatenate(([0.0],zs,[0.0])))
+
+def plateDisp(xs,ys,geomSize,textPars,texType):
+    """ z-displacement of the plate points (len(ys) x len(xs))"""
+    aG,lG,_  = geomSize
+    disp     = np.zeros((len(ys),len(xs)))
+    if texType is None:
+        return disp
+    aT,lT,hT = textPars
+    if texType in ['trans','pyr']:                                      #polyLines 0-1, 3-2
+        disp = disp + texture(xs,lG,lT,hT)[None,:]
+    if texType in ['long','pyr']:                                       #polyLines 0-3, 1-2
+        disp = disp + texture(ys,aG,aT,hT)[:,None]
+    return disp
+
+#WRITING================================================================
+def foamHeader(cls,obj,binary,note=None):
+    """ FoamFile header of the polyMesh file"""
+    head = ('FoamFile\n{\n    version     2.0;\n    format      %s;\n'
+            '    class       %s;\n'%('binary' if binary else 'ascii',cls))
+    if binary:
+        head = head + '    arch        "LSB;label=32;scalar=64";\n'
+    if note:
+        head = head + '    note        "%s";\n'%note
+    head = head + ('    location    "constant/polyMesh";\n'
+                   '    object      %s;\n}\n'%obj)
+    return ('/*--------------------------------*- C++ -*----------------------------------*\\\n'
+            '| =========                 |                                                 |\n'
+            '| \\\\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           |\n'
+            '|  \\\\    /   O peration     | Version:  2.3.0                                 |\n'
+            '|   \\\\  /    A nd           | Web:      www.OpenFOAM.org                      |\n'
+            '|    \\\\/     M anipulation  |                                                 |\n'
+            '\\*---------------------------------------------------------------------------*/\n'
+            + head +
+            '// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * //\n\n')
+
+def writeList(file,data,binary,fmt):
+    """ write the list (one row per item) in the OpenFOAM format"""
+    file.write(('%d\n('%len(data)).encode())
+    if binary:
+        file.write(np.ascontiguousarray(data).tobytes())
+    else:
+        file.write(b'\n')
+        np.savetxt(file,data,fmt=fmt)
+    file.write(b')\n\n')
+
+def writeMeshFile(fileName,cls,obj,lists,binary,note=None):
+    """ write the polyMesh file with the lists [(data,ascii format),..]"""
+    with open(fileName,'wb') as file:
+        file.write(foamHeader(cls,obj,binary,note).encode())
+        for data,fmt in lists:
+            writeList(file,data,binary,fmt)
+
+def writeBoundary(fileName,patches,startFace):
+    """ write the boundary file (patches = [[name,type,nFaces],..])"""
+    with open(fileName,'w') as file:
+        file.write(foamHeader('polyBoundaryMesh','boundary',False))
+        file.write('%d\n(\n'%len(patches))
+        for name,tp,nFaces in patches:
+            file.write('    %s\n    {\n        type            %s;\n'%(name,tp))
+            if tp == 'wall':
+                file.write('        inGroups        1(wall);\n')
+            file.write('        nFaces          %d;\n        startFace       %d;\n    }\n'%(nFaces,startFace))
+            startFace = startFace + nFaces
+        file.write(')\n\n// ************************************************************************* //\n')
+
+#FUNCTION INTERFACE BLOCK===============================================
+def fpolyMeshGen(caseDir,                                               #need to specify case directory
+    hI       = 0.4e-3,                                                  #liquid inlet height
+    geomSize = [50e-3,60e-3,7e-3],                                      #width, length and height of the geometry (in m)
+    cellSize = [1e-3,1e-3,0.2e-3],                                      #width, length and height of a cell in dense block (in m)
+    textPars = [2e-3,2e-3,0.4e-3],                                      #width, length and height of a texture element
+    spGrad   = 10,                                                      #grading in zDir of sparse block
+    mScale   = 1,
+    texType  = None,                                                    #texture type (None, 'long', 'trans', 'pyr')
+    binary   = True):
+
+    #===================================================================
+    #                           EDITABLE
+    #===================================================================
+
+    # central point
+    x0, y0, z0  = 0.0, 0.0, 0.0
+
+    #===================================================================
+    #                           DO NOT EDIT
+    #===================================================================
+
+    # get the dimensions of the whole geometry and one cell
+    aG,lG,hG  = geomSize
+    dA,dL,dH  = cellSize
+
+    # auxiliary variables for geometry creation (as in fblockMeshGenV2)
+    hDCoeff   = 3                                                       #how high should the dense block be (relative to inlet height)
+    zCoordVec = [z0,z0+hI,z0+hDCoeff*hI,z0+hG]                          #levels in z direction
+
+    # get the number of cells in each direction
+    nCellsX,nCellsY,nCellsZ = int(math.ceil(lG/dL)),int(math.ceil(aG/dA)),int(math.ceil(hI/dH))
+    nCellsZS   = int(math.ceil(2*(hG-hDCoeff*hI)/(dH*(1+spGrad))))      #get number of cells in sparse block
+    nCellsZVec = [nCellsZ,(hDCoeff-1)*nCellsZ,nCellsZS]                 #vector with number of cells in zDir
+    zGradVec   = [1.0,1.0,spGrad]
+
+    # point coordinates in each direction
+    xs  = x0 + lG*np.linspace(0.0,1.0,nCellsX+1)
+    ys  = y0 + aG*np.linspace(0.0,1.0,nCellsY+1)
+    lbd = [gradedLine(nCellsZVec[i],zGradVec[i]) for i in range(len(nCellsZVec))]
+    zs  = np.concatenate([zCoordVec[i] + (zCoordVec[i+1]-zCoordVec[i])*lbd[i][(i > 0):]
+                          for i in range(len(nCellsZVec))])
+    nx,ny,nz = nCellsX,nCellsY,len(zs)-1
+
+    # points (x fastest, then y, then z) with the texture displacement
+    points  = np.empty((nz+1,ny+1,nx+1,3))
+    points[...,0] = xs[None,None,:]
+    points[...,1] = ys[None,:,None]
+    points[...,2] = zs[:,None,None]
+    decay   = 1.0 - lbd[0]                                              #displacement decay in the inlet block
+    points[:nCellsZ+1,:,:,2] += decay[:,None,None]*plateDisp(xs-x0,ys-y0,geomSize,textPars,texType)[None,:,:]
+    points  = mScale*points.reshape(-1,3)
+
+    # point and cell labels
+    P = np.arange((nz+1)*(ny+1)*(nx+1),dtype=np.int32).reshape(nz+1,ny+1,nx+1)
+    C = np.arange(nz*ny*nx,dtype=np.int32).reshape(nz,ny,nx)
+
+    # internal faces - for each cell the +x, +y, +z faces (upper
+    # triangular order: owner, then neighbour)
+    F = np.full((nz,ny,nx,3,4),-1,dtype=np.int32)
+    F[:,:,:-1,0] = np.stack((P[:-1,:-1,1:-1],P[:-1,1:,1:-1],P[1:,1:,1:-1],P[1:,:-1,1:-1]),axis=-1)
+    F[:,:-1,:,1] = np.stack((P[:-1,1:-1,:-1],P[1:,1:-1,:-1],P[1:,1:-1,1:],P[:-1,1:-1,1:]),axis=-1)
+    F[:-1,:,:,2] = np.stack((P[1:-1,:-1,:-1],P[1:-1,:-1,1:],P[1:-1,1:,1:],P[1:-1,1:,:-1]),axis=-1)
+    valid     = F[...,0] >= 0
+    faces     = [F[valid]]
+    owner     = [np.broadcast_to(C[...,None],valid.shape)[valid]]
+    neighbour = (C[...,None] + np.array([1,nx,nx*ny],dtype=np.int32))[valid]
+    del F
+
+    # boundary faces (normals pointing outwards)
+    kI      = slice(0,nCellsZ)                                          #inlet block
+    kO      = slice(nCellsZ,nz)                                         #over the inlet
+    xMin    = lambda k: (np.stack((P[:-1,:-1,0],P[1:,:-1,0],P[1:,1:,0],P[:-1,1:,0]),axis=-1)[k],C[k,:,0])
+    patches = [
+        ['inlet','patch']      + list(xMin(kI)),
+        ['overInlet','patch']  + list(xMin(kO)),
+        ['outlet','patch',
+            np.stack((P[:-1,:-1,-1],P[:-1,1:,-1],P[1:,1:,-1],P[1:,:-1,-1]),axis=-1),C[:,:,-1]],
+        ['plate','wall',
+            np.stack((P[0,:-1,:-1],P[0,1:,:-1],P[0,1:,1:],P[0,:-1,1:]),axis=-1),C[0]],
+        ['sides','wall',
+            np.concatenate((np.stack((P[:-1,0,:-1],P[:-1,0,1:],P[1:,0,1:],P[1:,0,:-1]),axis=-1).reshape(-1,4),
+                            np.stack((P[:-1,-1,:-1],P[1:,-1,:-1],P[1:,-1,1:],P[:-1,-1,1:]),axis=-1).reshape(-1,4))),
+            np.concatenate((C[:,0,:].ravel(),C[:,-1,:].ravel()))],
+        ['atmosphere','patch',
+            np.stack((P[-1,:-1,:-1],P[-1,:-1,1:],P[-1,1:,1:],P[-1,1:,:-1]),axis=-1),C[-1]],
+        ]
+    for name,tp,pFaces,pOwner in patches:
+        faces.append(pFaces.reshape(-1,4))
+        owner.append(pOwner.ravel())
+    faces = np.concatenate(faces)
+    owner = np.concatenate(owner)
+
+    #CREATE FILES AND WRITE THE DATA IN=================================
+    meshDir = caseDir + './constant/polyMesh/'
+    if not os.path.isdir(meshDir):
+        os.makedirs(meshDir)
+    for name in ['points','faces','owner','neighbour','boundary']:      #get rid of the old mesh (hard links)
+        for suffix in ['','.gz']:
+            if os.path.isfile(meshDir + name + suffix):
+                os.remove(meshDir + name + suffix)
+    note = 'nPoints:%d  nCells:%d  nFaces:%d  nInternalFaces:%d'%(len(points),nx*ny*nz,len(faces),len(neighbour))
+    writeMeshFile(meshDir + 'points','vectorField','points',
+                  [(points,'(%.10g %.10g %.10g)')],binary)
+    if binary:
+        writeMeshFile(meshDir + 'faces','faceCompactList','faces',
+                      [(np.arange(0,4*len(faces)+1,4,dtype=np.int32),'%d'),(faces.ravel(),'%d')],binary)
+    else:
+        writeMeshFile(meshDir + 'faces','faceList','faces',[(faces,'4(%d %d %d %d)')],binary)
+    writeMeshFile(meshDir + 'owner','labelList','owner',[(owner,'%d')],binary,note)
+    writeMeshFile(meshDir + 'neighbour','labelList','neighbour',[(neighbour,'%d')],binary,note)
+    writeBoundary(meshDir + 'boundary',[[name,tp,pOwner.size] for name,tp,pFaces,pOwner in patches],
+                  len(neighbour))
+
+    return;
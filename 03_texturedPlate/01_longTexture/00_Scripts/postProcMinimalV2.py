@@ -6,9 +6,13 @@
 #~
 #~ NOTES:
     #~ - still unfinished BUT improvement
+    #~ - run by pvbatch (no GUI), the script opens the case itself, the
+    #~   hidden filters get no representation and the view is rendered
+    #~   only once, into postProcMinimal.png
     
 #~ USAGE:
    #~ paraFoam --script=./postProcMinimal.py 
+   #~ pvbatch ./postProcMinimal.py
 
 
 #LICENSE================================================================
@@ -40,30 +44,65 @@ ySkip= 0.07
 # POSTPROCESSING INITIATION=============================================
 import glob
 
-mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
-
-paraview.simple._DisableFirstRenderCameraReset()
-
-activeSource_OpenFOAM = GetActiveSource()
-
-# enable all available fields
-activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
-
-# show all for internal mesh
-activeSource_OpenFOAM.MeshParts = ['internalMesh']
+try: paraview.simple                                                    #paraFoam --script
+except NameError: from paraview.simple import *                         #pvbatch
 
-# I dont want to see the main mesh / I do want to see it as transparent wireframe
-allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
-allIntMeshRepresentation.Visibility = 0
-allIntMeshRepresentation.Representation = 'Wireframe'
-allIntMeshRepresentation.Opacity = 0.1
-
-# set up black background (seems prettier)
-RenderView1 = GetRenderView()
-RenderView1.UseTexturedBackground = 0
-RenderView1.Background = [0.0, 0.0, 0.0]
+mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
 
-activeSource_OpenFOAM = FindSource( mainCase[0] )
+batchMode = GetActiveSource() is None                                   #pvbatch, nothing opened by paraFoam
+
+def fShow(source,**props):
+    # show the source and set the properties of its representation
+    # pvbatch: the hidden sources are only updated (no representation)
+    if batchMode:
+        source.UpdatePipeline(cTime)
+        if not props.get('Visibility',1):
+            return None
+    representation = Show(source)
+    for prop in props:
+        setattr(representation,prop,props[prop])
+    return representation
+
+def fRender():
+    if not batchMode:
+        Render()
+
+if batchMode:
+    # open the case with the OpenFOAM reader, go to the last time step
+    activeSource_OpenFOAM = OpenFOAMReader( FileName=mainCase[0], guiName=mainCase[0][2::] )
+    activeSource_OpenFOAM.CellArrays  = ['alpha.liquid', 'p_rgh', 'U']
+    activeSource_OpenFOAM.MeshRegions = ['internalMesh']
+    activeSource_OpenFOAM.UpdatePipelineInformation()
+    tSteps = list(activeSource_OpenFOAM.TimestepValues)                 #written times
+    cTime  = tSteps[-1]                                                 #last time step
+    activeSource_OpenFOAM.UpdatePipeline(cTime)
+    # -- offscreen view, rendered once at the end
+    RenderView1 = GetRenderView()
+    RenderView1.Background = [0.0, 0.0, 0.0]
+    RenderView1.ViewTime   = cTime
+else:
+    paraview.simple._DisableFirstRenderCameraReset()
+
+    activeSource_OpenFOAM = GetActiveSource()
+
+    # enable all available fields
+    activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
+
+    # show all for internal mesh
+    activeSource_OpenFOAM.MeshParts = ['internalMesh']
+
+    # I dont want to see the main mesh / I do want to see it as transparent wireframe
+    allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
+    allIntMeshRepresentation.Visibility = 0
+    allIntMeshRepresentation.Representation = 'Wireframe'
+    allIntMeshRepresentation.Opacity = 0.1
+
+    # set up black background (seems prettier)
+    RenderView1 = GetRenderView()
+    RenderView1.UseTexturedBackground = 0
+    RenderView1.Background = [0.0, 0.0, 0.0]
+
+    activeSource_OpenFOAM = FindSource( mainCase[0] )
 
 # CREATE A SCALAR CLIP - SHOW ONLY THE RIVULET==========================
 liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
@@ -71,10 +110,7 @@ liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
 liqOnly.Scalars = ['POINTS', 'alpha.liquid']
 liqOnly.Value = 0.5
 
-liqOnlyRepresentation = Show()
-
-liqOnlyRepresentation.Representation = 'Surface'
-liqOnlyRepresentation.Visibility = 0
+liqOnlyRepresentation = fShow(liqOnly,Representation='Surface',Visibility=0)
 
 # COLOR THE FILM BY FILM THICKNESS (CALCULATOR+PROPER COLORING)=========
 fThCalc  = Calculator( guiName="fThCalc" )
@@ -82,8 +118,7 @@ fThCalc  = Calculator( guiName="fThCalc" )
 fThCalc.Function = 'coordsZ'
 fThCalc.ResultArrayName = 'hFun'
 
-fThCalcRepresentation = Show()
-fThCalcRepresentation.Visibility = 1
+fThCalcRepresentation = fShow(fThCalc,Visibility=1)
 
 # SCALAR BAR============================================================
 
@@ -92,7 +127,7 @@ fThCalcRepresentation.Visibility = 1
 # ADD ANOTATE TIME SOURCE===============================================
 annotTime = AnnotateTime()
 
-annotTimeRepresentation = Show()
+annotTimeRepresentation = fShow(annotTime)
 
 annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
 
@@ -100,14 +135,15 @@ annotTimeRepresentation.FontFamily = 'Courier'
 annotTimeRepresentation.Position = [xAll, 0.025]
 annotTimeRepresentation.Visibility = 1
 
-Render()
+fRender()
 
 # POST RUNNING MODIFICATIONS============================================
 
-AnimationScene1 = GetAnimationScene()
-AnimationScene1.GoToLast()
+if not batchMode:
+    AnimationScene1 = GetAnimationScene()
+    AnimationScene1.GoToLast()
 
-Render()
+    Render()
 
 # SCALAR BAR============================================================
 source = fThCalc                                                        #where to get the data
@@ -135,7 +171,7 @@ colorObjectRepresentation.LookupTable = a0_hFun_PVLookupTable
 
 a0_hFun_PVLookupTable.ScalarOpacityFunction = a0_hFun_PiecewiseFunction
         
-Render()
+fRender()
 
 ScalarBarWidgetRepresentation = CreateScalarBar( Title='$h(x,y),[\mathrm{m}]$',
  ComponentTitle         =   '',
@@ -149,7 +185,7 @@ ScalarBarWidgetRepresentation = CreateScalarBar( Title='$h(x,y),[\mathrm{m}]$',
  )
 RenderView1.Representations.append(ScalarBarWidgetRepresentation)
 
-Render()
+fRender()
 
 # SET PROPER CAMERA POSITION============================================
 ResetCamera()
@@ -157,21 +193,31 @@ RenderView1 = GetRenderView()
 RenderView1.CameraViewUp = [-0.9, 0.1, 0.4]
 RenderView1.CameraPosition = [0.06,0.14,0.09]
 
-Render()
+fRender()
 
 # LOAD THE CASE AGAIN TO DISPLAY THE CHANNEL============================
-showWalls = PV4FoamReader(FileName=mainCase[0], guiName='showWalls')
-showWalls.MeshParts     = ['wall - group']
-showWalls.VolumeFields  = []
+if batchMode:
+    showWalls = OpenFOAMReader(FileName=mainCase[0], guiName='showWalls')
+    showWalls.MeshRegions   = [region for region in showWalls.MeshRegions.Available
+                                if region.endswith('wall')]             #wall group
+    showWalls.CellArrays    = []
+else:
+    showWalls = PV4FoamReader(FileName=mainCase[0], guiName='showWalls')
+    showWalls.MeshParts     = ['wall - group']
+    showWalls.VolumeFields  = []
 
 showWallsRepresentation                 = Show()
 showWallsRepresentation.Representation  = 'Surface'
 showWallsRepresentation.Visibility      = 1
 showWallsRepresentation.DiffuseColor    = [0.5529411764705883, 0.5529411764705883, 0.5529411764705883]
 
-Render()
+fRender()
 
 
+# SAVE THE PICTURE (PVBATCH)============================================
+if batchMode:
+    WriteImage('postProcMinimal.png')                                   #the only render
+    
 # ANIMATION SAVING (PURE IMAGES, NOT BLENDER)===========================
 #~ eTime   = float("%s"%AnimationScene1.GetProperty('Duration'))
 #~ 
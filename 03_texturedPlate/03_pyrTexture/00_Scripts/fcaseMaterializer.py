@@ -0,0 +1,131 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Construction of the case folder from the baseCase without copying of
+#~ the files which are not modified by the case constructor
+#~
+#~ The unchanged files of the baseCase (and the current script versions)
+#~ are cloned into the caseDir - reflinked (copy-on-write clone, e.g.
+#~ btrfs, xfs) if the file system supports it, hard-linked otherwise.
+#~ Only the files patched by the constructor are really copied
+#~
+#~ NOTES:
+#~  - hard-linked files share the data with the baseCase, the files
+#~    which are written in place (open(...,'w')) MUST be in copyFiles,
+#~    otherwise the baseCase is modified as well (reflinked files are
+#~    safe, they are copied on write)
+#~  - FoamDict.write replaces the file (rename), so the dictionaries
+#~    written by FoamDict are never shared with the baseCase
+#~  - do not edit the hard-linked files of the created case by hand
+#~    (the editors usually write in place), use detach() first
+#~  - mode: 'auto' (reflink > hard link > copy), 'reflink', 'link' or
+#~    'copy' (the original behavior)
+#~
+#~ USAGE:
+#~     nFiles = materializeCase(baseCase,caseDir,
+#~                 copyFiles = ['README','system/controlDict',...],
+#~                 scFolder  = '../00_Scripts/',
+#~                 scNames   = ['fblockMeshGen',...])
+
+#LICENSE================================================================
+#  fcaseMaterializer.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import shutil as sh
+try:
+    import fcntl                                                        #reflinks (linux only)
+except ImportError:
+    fcntl = None
+
+#CONSTANTS==============================================================
+FICLONE = 0x40049409                                                    #linux ioctl, clone the whole file
+
+#FUNCTIONS==============================================================
+def reflinkFile(src,dst):
+    """ copy-on-write clone of src, raises IOError/OSError if the file
+        system does not support it"""
+    if fcntl is None:
+        raise OSError('reflinks are not supported on this platform')
+    with open(src,'rb') as fSrc:
+        with open(dst,'wb') as fDst:
+            try:
+                fcntl.ioctl(fDst.fileno(),FICLONE,fSrc.fileno())
+            except (IOError,OSError):
+                fDst.close()
+                os.remove(dst)
+                raise
+    sh.copymode(src,dst)
+
+def cloneFile(src,dst,mode='auto'):
+    """ clone src to dst, returns the used method (reflink, link, copy)"""
+    if mode in ['auto','reflink']:
+        try:
+            reflinkFile(src,dst)
+            return 'reflink'
+        except (IOError,OSError):
+            if mode == 'reflink':
+                raise
+    if mode in ['auto','link']:
+        try:
+            os.link(src,dst)
+            return 'link'
+        except (AttributeError,OSError):                                #no os.link or cross-device
+            if mode == 'link':
+                raise
+    sh.copy2(src,dst)
+    return 'copy'
+
+def detach(fileName):
+    """ replace the hard link by a private copy of the file"""
+    if os.stat(fileName).st_nlink > 1:
+        sh.copy2(fileName,fileName + '.tmp')
+        os.rename(fileName + '.tmp',fileName)
+
+def materializeCase(baseCase,caseDir,copyFiles=[],scFolder='',scNames=[],mode='auto'):
+    """ create caseDir from the baseCase and the scripts in scFolder,
+        the files in copyFiles (paths relative to caseDir) are copied,
+        the rest is cloned, returns number of files per method"""
+    copyFiles = set(os.path.normpath(name) for name in copyFiles)
+    nFiles    = {'reflink':0,'link':0,'copy':0}
+
+    if os.path.isdir(caseDir):                                          #ensure, that the caseDir is clear
+        sh.rmtree(caseDir)
+
+    # -- list of the files to clone (source, path relative to caseDir)
+    toClone = []
+    for root,dirs,files in os.walk(baseCase):
+        relDir = os.path.relpath(root,baseCase)
+        os.makedirs(os.path.normpath(os.path.join(caseDir,relDir)))
+        for name in files:
+            toClone.append((os.path.join(root,name),os.path.normpath(os.path.join(relDir,name))))
+    for scName in scNames:                                              #current script versions
+        toClone.append((os.path.join(scFolder,scName + '.py'),scName + '.py'))
+
+    for src,relName in toClone:
+        dst = os.path.join(caseDir,relName)
+        if relName in copyFiles:
+            sh.copy2(src,dst)
+            nFiles['copy'] += 1
+        else:
+            nFiles[cloneFile(src,dst,mode)] += 1
+    return nFiles
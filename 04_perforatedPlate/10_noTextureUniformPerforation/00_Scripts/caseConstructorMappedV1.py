@@ -51,8 +51,10 @@ import shutil as sh
 #IMPORT BLOCK-CUSTOM====================================================
 # custom functions------------------------------------------------------
 from dfluidData import dfluidData
-from fblockMeshGenV9 import fblockMeshGen                                 #blockMeshDict generation
+from fblockMeshGenV11 import fblockMeshGen                                #blockMeshDict generation
 #~ from finletBCWriter   import finletBCWriter                             #BC adjustment
+from ffoamDict import FoamDict                                          #parsed OpenFOAM dictionaries
+from fcaseMaterializer import materializeCase                           #caseDir from the baseCase (links)
 
 #########EDITABLE#######################################################
 
@@ -73,6 +75,7 @@ dH      = 1.0*0.05e-3                                                       #hei
 diamH   = 3.00e-3                                                       #diameter of a hole
 distHX  = 10.0e-3                                                       #distance between holes in x-direction
 distHY  = 10.0e-3                                                       #distance between holes in y-direction
+layout  = 'uniform'                                                     #holes layout (uniform, staggered, hexagonal, file)
 # Note: geometry cannot be really thin - it causes numerical instabilities
 #       ("2D cells")
 
@@ -93,12 +96,8 @@ caseDir     = ('../iF_Re' +
                 '_' + liqName + '_PS_MP/'
                 )
 
-if os.path.isdir(caseDir):                                              #ensure, that the caseDir is clear
-    sh.rmtree(caseDir)
-    
-sh.copytree(baseCase,caseDir)                                             #copy data to caseDir
 #SPECIFY CURRENT SCRIPT VERSIONS========================================
-blockMeshGen        = 'fblockMeshGenV9'
+blockMeshGen        = 'fblockMeshGenV11'
 caseConstructor     = 'caseConstructorMappedV1'
 postProc            = 'postProcMinimal'
 postProcData        = 'postProcSaveData'
@@ -120,8 +119,28 @@ scNames = [ blockMeshGen,                                               #preProc
             #~ rivuletPostProc2Blender,                                    #export paraview->blender
             #~ blenderPrep,                                                #rivulet postprocessing (blender)
             ]                                   
-for scName in scNames:
-    sh.copyfile(scFolder + scName + '.py',caseDir + scName + '.py')     #copy current script version
+
+# -- files patched by this script (and by the called functions), these
+#    are really copied, the rest is linked to the baseCase and scFolder
+cpFiles = [ 'README',
+            '0.org/U',
+            '0.org/alpha.liquid',
+            'constant/g',
+            'constant/transportProperties',
+            'constant/polyMesh/blockMeshDict',                          #fblockMeshGen
+            'constant/polyMesh/boundary',                               #rewritten by the mesh generation
+            'constant/triSurface/holes.stl',                            #fblockMeshGen
+            'system/snappyHexMeshDict',                                 #fblockMeshGen
+            'system/decomposeParDict',
+            'system/controlDict',
+            'system/createPatchDict',
+            'Allrun-parallel',
+            'of.sh',
+            ]
+
+nFiles = materializeCase(baseCase,caseDir,cpFiles,scFolder,scNames)     #ensures, that the caseDir is clear
+print 'caseDir files (reflinked, hard-linked, copied): %d, %d, %d\n'%(
+        nFiles['reflink'],nFiles['link'],nFiles['copy'])
 
 #CASE CONSTANTS AND CALCULATIONS========================================
 # input data------------------------------------------------------------
@@ -169,7 +188,7 @@ mScale = 1                                                              #convers
 #-----------------------------------------------------------------------
 print 'WRITING BLOCKMESHDICT======================\n\n'
 fblockMeshGen(caseDir,hIn,geomSize,cellSize,holePars,
-    spGrad,mScale)
+    spGrad,mScale,layout)
 print 'DONE=======================================\n\n'
 
 
@@ -188,24 +207,14 @@ README.write('\n 0.org==============================================\n')
 #
 README.write('\n U\n')
 
-pVals   = ['value           uniform (' + repr(u0) + ' 0 0)']           #inlet liquid velocity speed
+pVal    = 'uniform (' + repr(u0) + ' 0 0)'                              #inlet liquid velocity speed
 
-idStr   = ['value           uniform (0.01 0 0)']
+fDict   = FoamDict(caseDir + './0.org/U')
 
-# write everything to the file
-with open(caseDir + './0.org/U', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + pVals[j] + ';\n'
+fDict.set('boundaryField/inlet/value',pVal)
 
-with open(caseDir + './0.org/U', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 
 print 'u0 = (%5.5e 0 0) m/s'%u0
     
@@ -217,24 +226,18 @@ print 'u0 = (%5.5e 0 0) m/s'%u0
 #
 README.write('\n alpha.liquid\n')
 
-pVals   = [repr(theta0),repr(thetaA),repr(thetaR)]                      #contact angles
+pVals   = [theta0,thetaA,thetaR]                                        #contact angles
 
 idStr   = ['theta0','thetaA','thetaR']
 
-# write everything to the file
-with open(caseDir + './0.org/alpha.liquid', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
+fDict   = FoamDict(caseDir + './0.org/alpha.liquid')
+
 for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t\t\t' + pVals[j] + ';\n'
+    for path in fDict.paths(idStr[j]):                                  #all the patches with contact angle
+        fDict.set(path,pVals[j])
 
-with open(caseDir + './0.org/alpha.liquid', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 print 'DONE=======================================\n\n'
 
 #CONSTANTS DIRECTORY FILES MODIFICATIONS================================
@@ -254,22 +257,12 @@ gx    = math.sin(alpha)*g
 gy    = 0.0
 gz    = -math.cos(alpha)*g
 
-idStr = 'value'
+fDict = FoamDict(caseDir + './constant/g')
 
-# write everything to the file
-with open(caseDir + './constant/g', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for i in range(len(data)):
-    fInd = data[i].find(idStr)
-    if fInd>-1:
-        data[i] = (data[i][:fInd] + idStr + '\t\t\t(' 
-        + repr(gx) + '\t' + repr(gy) + '\t' + repr(gz) + ');\n')
+fDict.set('value',(gx,gy,gz))
 
-with open(caseDir + './constant/g', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # transportProperties
@@ -279,28 +272,17 @@ with open(caseDir + './constant/g', 'w') as file:
 #
 README.write('\n transportProperties\n')
 
-idStr = ['nu [ 0 2 -1 0 0 0 0 ]',
-         'rho [ 1 -3 0 0 0 0 0 ]',
-         'sigma [ 1 0 -2 0 0 0 0 ]']         
+fDict = FoamDict(caseDir + './constant/transportProperties')
 
-pVals = [nu,rho,sigma]
+phases= fDict.get('phases').strip('()').split()                         #order of the values in nu and rho
 
-# write everything to the file
-with open(caseDir + './constant/transportProperties', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    k = 0
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + repr(pVals[j][k]) + ';\n'
-            k = k+1
+for k in range(len(phases)):                                            #only the values, dimensions are kept
+    fDict.setLast(phases[k] + '/nu',nu[k])
+    fDict.setLast(phases[k] + '/rho',rho[k])
+fDict.setLast('sigma',sigma[0])
 
-with open(caseDir + './constant/transportProperties', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 print 'DONE=======================================\n\n'   
 #SYSTEM DIRECTORY FILES MODIFICATIONS===================================
@@ -323,24 +305,12 @@ README.write('\n setFieldsDict\n')
 #
 README.write('\n decomposeParDict\n')
 
-idStr = ['numberOfSubdomains ']
-
-pVals = [repr(nCores)]
+fDict = FoamDict(caseDir + './system/decomposeParDict')
 
-# write everything to the file
-with open(caseDir + './system/decomposeParDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('numberOfSubdomains',nCores)
 
-with open(caseDir + './system/decomposeParDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 #-----------------------------------------------------------------------
 # controlDict
 #-----------------------------------------------------------------------
@@ -349,24 +319,14 @@ with open(caseDir + './system/decomposeParDict', 'w') as file:
 #
 README.write('\n controlDict\n')
 
-idStr = ['startTime ','endTime ','writeInterval ']
-
-pVals = [repr(startTime),repr(endTime),repr(wrInt)]
+fDict = FoamDict(caseDir + './system/controlDict')
 
-# write everything to the file
-with open(caseDir + './system/controlDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('startTime',startTime)
+fDict.set('endTime',endTime)
+fDict.set('writeInterval',wrInt)
 
-with open(caseDir + './system/controlDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # createPatchDict
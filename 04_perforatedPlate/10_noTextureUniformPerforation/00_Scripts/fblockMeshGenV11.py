@@ -0,0 +1,411 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Simple python script to enable some parametrization of the mesh
+#~ creation for the case of film flow down an inclined plate
+#~ (interFoam used as a solver)
+#~
+#~ - Adds a grading in z-direction to reduce the number of cells
+#~ - number of cells is based on the dense block cell size (input)
+#~ - the perforation is given by the hole centres (layout), the mesh is
+#~   a tensor product of the x and y lines through the holes edges,
+#~   the grid cells containing a hole are the holes (arcs, holes
+#~   patches), all the other cells are the plate
+#~ - layouts: uniform (V9), staggered (zig-zag, V10), hexagonal,
+#~   file with the hole centres (x y columns, plate coordinates) or
+#~   an array of the hole centres
+#~ - holes refinement in the snappyHexMeshDict is optional (holeFmt,
+#~   see writeSnappyHexMeshDict)
+#~
+#~ NOTES:
+#~  - the holes projections to the x and y axes have either to be the
+#~    same or not to overlap (holes on the common grid lines)
+#~  - the holes patches (holesBottomPrep, holesTopPrep) contain the
+#~    holes in the same order (cyclic/mapped pairs in createPatchDict)
+
+
+#LICENSE================================================================
+#  fblockMeshGen.py
+#
+#  Copyright 2015 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK=======================================================
+import os
+import math
+import numpy as np
+
+#LAYOUTS================================================================
+def gridLayout(aG,lG,pX,pY,stagger=False):
+	# function to get the hole centres on a rectangular grid
+	# aG,lG		... plate width and length
+	# pX,pY		... approximate grid pitch (corrected to fit the plate)
+	# stagger	... keep only every other hole (checkerboard, zig-zag)
+	nX,nY = max(int(math.floor(lG/pX)),1),max(int(math.floor(aG/pY)),1)	#number of grid positions
+	pX,pY = lG/nX,aG/nY													#corrected pitch
+	cX,cY = np.meshgrid(pX/2 + pX*np.arange(nX),pY/2 + pY*np.arange(nY))
+	keep  = ((np.arange(nX)[None,:] + np.arange(nY)[:,None])%2 == 0) if stagger else np.ones(cX.shape,dtype=bool)
+	return np.column_stack((cX[keep],cY[keep]))
+def holeLayout(layout,aG,lG,diamHEff,distHX,distHY):
+	# function to get the hole centres (n x 2 array, plate coordinates)
+	# layout	... 'uniform'   - holes on a grid (distHX, distHY between)
+	#				'staggered' - zig-zag, every other hole of the grid
+	#							  with halved distHY
+	#				'hexagonal' - staggered with equilateral triangles
+	#							  (distHY is not used)
+	#				file name   - file with the hole centres (x y)
+	#				array		- the hole centres
+	if not isinstance(layout,str):
+		return np.asarray(layout,dtype=float).reshape(-1,2)
+	if layout == 'uniform':
+		return gridLayout(aG,lG,diamHEff+distHX,diamHEff+distHY)
+	elif layout == 'staggered':
+		return gridLayout(aG,lG,diamHEff+distHX,diamHEff+distHY/2,True)
+	elif layout == 'hexagonal':
+		return gridLayout(aG,lG,diamHEff+distHX,math.sqrt(3)*(diamHEff+distHX),True)
+	elif os.path.isfile(layout):
+		return np.loadtxt(layout,ndmin=2)[:,:2]
+	raise ValueError('unknown perforation layout: ' + layout)
+def gridLines(c0,cL,holeC,diamHEff):
+	# function to get the grid lines through the holes edges
+	# returns the lines and the hole-index of the holes in the grid
+	uC,hInd = np.unique(np.round(holeC,12),return_inverse=True)			#rounding - the same lines for the same holes
+	lines   = np.concatenate(([c0],np.column_stack((c0+uC-diamHEff/2,c0+uC+diamHEff/2)).ravel(),[c0+cL]))
+	if np.any(np.diff(lines) <= 0):
+		raise ValueError('holes overlap or reach over the plate edges')
+	return lines,hInd
+def nCellsVec(lines,dHole,dGap):
+	# function to get the number of cells in each grid interval
+	# (odd intervals are the holes, the first and the last intervals
+	# are the margins - 1/2 of a plate block)
+	width  = np.diff(lines)
+	dCell  = np.where(np.arange(len(width))%2 == 1,dHole,dGap)
+	nCells = np.ceil(width/dCell - 1e-9)
+	nCells[[0,-1]] = np.floor(np.ceil(2*width[[0,-1]]/dGap - 1e-9)/2)
+	return np.maximum(nCells,1).astype(int).tolist()
+
+#AUXILIARY FUNCTIONS====================================================
+def bulkFormat(template,rows):
+	# function to format each of the rows by the template at once
+	rows = [tuple(row) for row in rows]
+	return (template*len(rows))%tuple(e for row in rows for e in row)
+def writeArcs(corners,diamH,diamHEff,vert):
+	#function to write arcs based on vertex position and hole pars
+	#corners - n x 4 labels of the hole corners (i,i+1,j+1,j), where
+	#			the i-th vertex is the hole lower left corner
+	#returns the string with all the arcs (to write to blockMeshDict)
+	cX,cY,cZ = vert[corners[:,0]].T										#get position of the base vertex
+	dd 		 = (diamH-diamHEff)/2
+	arcPts   = np.stack((
+				np.column_stack((cX + diamHEff/2,cY - dd,cZ)),			#left arc
+				np.column_stack((cX + diamH - dd,cY + diamHEff/2,cZ)),	#bottom arc
+				np.column_stack((cX + diamHEff/2,cY + diamH - dd,cZ)),	#right arc
+				np.column_stack((cX - dd,cY + diamHEff/2,cZ)),			#top arc
+				),axis=1)
+	edges    = np.stack((corners,np.roll(corners,-1,axis=1)),axis=2)
+	rows     = np.concatenate((edges,arcPts),axis=2).reshape(-1,5)
+	return bulkFormat("\tarc\t%i\t%i\t(%5.5f %5.5f %5.5f)\n",rows.tolist())
+def writeHolesSTL(holes,fileName,nSeg=16):
+	# function to write the refinement cylinders as one closed surface
+	# -- each cylinder is a prism with nSeg sides circumscribed to the
+	#    hole (the prism contains the whole cylinder)
+	rad  = 1.0/math.cos(math.pi/nSeg)									#circumscribed polygon (unit radius)
+	circ = [[rad*math.cos(2.0*math.pi*k/nSeg),rad*math.sin(2.0*math.pi*k/nSeg)] for k in range(nSeg+1)]
+	norm = [[math.cos(2.0*math.pi*(k+0.5)/nSeg),math.sin(2.0*math.pi*(k+0.5)/nSeg)] for k in range(nSeg)]
+	facets = []
+	for name,point1,point2,holeRad in holes:
+		cX,cY = point1[0],point1[1]
+		z1,z2 = min(point1[2],point2[2]),max(point1[2],point2[2])
+		p = [[cX+holeRad*x,cY+holeRad*y] for x,y in circ]
+		for k in range(nSeg):
+			facets.append([[0.0,0.0,-1.0],[cX,cY,z1],p[k+1]+[z1],p[k]+[z1]])			#bottom cap
+			facets.append([[0.0,0.0,1.0],[cX,cY,z2],p[k]+[z2],p[k+1]+[z2]])			#top cap
+			facets.append([norm[k]+[0.0],p[k]+[z1],p[k+1]+[z1],p[k+1]+[z2]])		#sides
+			facets.append([norm[k]+[0.0],p[k]+[z1],p[k+1]+[z2],p[k]+[z2]])
+	facet = (' facet normal %5.5e %5.5e %5.5e\n  outer loop\n'
+			 + '   vertex %5.5e %5.5e %5.5e\n'*3
+			 + '  endloop\n endfacet\n')
+	with open(fileName,'w') as file:
+		file.write('solid holes\n')
+		file.write(''.join(facet%tuple(sum(f,[])) for f in facets))
+		file.write('endsolid holes\n')
+def writeSnappyHexMeshDict(holes,dH,caseDir,holeFmt='cylinders'):
+	# function to write the holes refinement to the snappyHexMeshDict
+	# -- the dictionary is read and written only once (all the holes)
+	# holes		... list of the refinement cylinders [name,point1,point2,radius]
+	# dH		... height of 1 cell in Z direction
+	# caseDir	... case directory (system/snappyHexMeshDict)
+	# holeFmt	... how to write the holes
+	#				'cylinders'  - one searchableCylinder per hole
+	#				'collection' - one searchableSurfaceCollection of
+	#							   2 cylinders (top, bottom) translated
+	#							   to the holes centres
+	#				'stl'		 - constant/triSurface/holes.stl
+	if not holes:
+		return
+	geomDict,regDict = [],[]
+	holeRad = holes[0][3]
+	if holeFmt == 'cylinders':
+		for name,point1,point2,holeRad in holes:
+			geomDict.append('\n\t%s\n\t{\n'%name)
+			geomDict.append('\t\ttype searchableCylinder;\n')
+			geomDict.append('\t\tpoint1 (%5.5e %5.5e %5.5e);\n'%tuple(point1))
+			geomDict.append('\t\tpoint2 (%5.5e %5.5e %5.5e);\n'%tuple(point2))
+			geomDict.append('\t\tradius %5.5e;\n'%holeRad)
+			geomDict.append('\t}\n')
+			regDict.append('\n\t%s\n\t{\n'%name)
+			regDict.append('\t\tmode inside;\t\tlevels ((1E15 1));\n\t}\n')
+			regDict.append('\n\t%s\n\t{\n'%name)
+			regDict.append('\t\tmode distance;\t\tlevels ((%5.5e 1));\n\t}\n'%(holeRad*1.2))
+	elif holeFmt == 'collection':
+		# -- base cylinders (bottom holes go up, top holes go down)
+		for name,tbSw in [['holeBottom',1.0],['holeTop',-1.0]]:
+			geomDict.append('\n\t%s\n\t{\n'%name)
+			geomDict.append('\t\ttype searchableCylinder;\n')
+			geomDict.append('\t\tpoint1 (0 0 0);\n')
+			geomDict.append('\t\tpoint2 (0 0 %5.5e);\n'%(tbSw*2.0*dH))
+			geomDict.append('\t\tradius %5.5e;\n'%holeRad)
+			geomDict.append('\t}\n')
+		geomDict.append('\n\tholes\n\t{\n')
+		geomDict.append('\t\ttype searchableSurfaceCollection;\n')
+		geomDict.append('\t\tmergeSubRegions true;\n')
+		for name,point1,point2,holeRad in holes:
+			geomDict.append('\t\t%s\n\t\t{\n'%name)
+			geomDict.append('\t\t\tsurface %s;\n'%('holeBottom' if point2[2] > point1[2] else 'holeTop'))
+			geomDict.append('\t\t\tscale (1 1 1);\n')
+			geomDict.append('\t\t\ttransform\n\t\t\t{\n\t\t\t\tcoordinateSystem\n\t\t\t\t{\n')
+			geomDict.append('\t\t\t\t\ttype cartesian;\n')
+			geomDict.append('\t\t\t\t\torigin (%5.5e %5.5e %5.5e);\n'%tuple(point1))
+			geomDict.append('\t\t\t\t\tcoordinateRotation\n\t\t\t\t\t{\n')
+			geomDict.append('\t\t\t\t\t\ttype axesRotation;\n\t\t\t\t\t\te1 (1 0 0);\n\t\t\t\t\t\te3 (0 0 1);\n')
+			geomDict.append('\t\t\t\t\t}\n\t\t\t\t}\n\t\t\t}\n\t\t}\n')
+		geomDict.append('\t}\n')
+	elif holeFmt == 'stl':
+		if not os.path.exists(caseDir + './constant/triSurface'):
+			os.makedirs(caseDir + './constant/triSurface')
+		writeHolesSTL(holes,caseDir + './constant/triSurface/holes.stl')
+		geomDict.append('\n\tholes.stl\n\t{\n')
+		geomDict.append('\t\ttype triSurfaceMesh;\n')
+		geomDict.append('\t\tname holes;\n')
+		geomDict.append('\t}\n')
+	else:
+		raise ValueError('unknown holes format: ' + holeFmt)
+	if holeFmt != 'cylinders':
+		# -- the distance refinement contains the holes insides as well
+		regDict.append('\n\tholes\n\t{\n')
+		regDict.append('\t\tmode distance;\t\tlevels ((%5.5e 1));\n\t}\n'%(holeRad*1.2))
+	# -- load the corresponding snappyHexMeshDict
+	with open(caseDir + './system/snappyHexMeshDict', 'r') as file:
+	    # read a list of lines into data
+	    data = file.readlines()
+	# -- update the geometry and the castellatedMeshControls -
+	#    refinementRegions dictionaries
+	updData = []
+	i 		= 0
+	while i < len(data):
+		updData.append(data[i])
+		if data[i].find('geometry') == 0:
+			updData.append(data[i+1])
+			updData.extend(geomDict)
+			i = i+1
+		elif data[i].find('refinementRegions') >= 0:
+			updData.append(data[i+1])
+			updData.extend(regDict)
+			i = i+1
+		i = i+1
+	with open(caseDir + './system/snappyHexMeshDict', 'w') as file:
+	    file.writelines( updData )
+
+
+#FUNCTION INTERFACE BLOCK===============================================
+def fblockMeshGen(caseDir,												#need to specify case directory
+	hI 		 = 0.4e-3,													#liquid inlet height
+	geomSize = [50e-3,60e-3,7e-3],										#width, length and height of the geometry (in m)
+	cellSize = [1e-3,1e-3,0.2e-3],										#width, length and height of on cell in dense block (in m),
+	holePars = [3e-3,10e-3,10e-3],										#diameter of a hole and distance between holes in X and Y directions
+	spGrad 	 = 10,														#grading in zDir of sparse block
+	mScale 	 = 1,
+	layout	 = 'uniform',												#holes layout (uniform, staggered, hexagonal, file, array)
+	holeFmt	 = None):													#holes refinement in snappyHexMeshDict (None, cylinders, collection, stl)
+
+	#===================================================================
+	#							EDITABLE
+	#===================================================================
+
+	#-------------------------------------------------------------------
+	# GEOMETRY DATA
+	#-------------------------------------------------------------------
+
+	# central point
+	x0, y0, z0 				= 0.0, 0.0, 0.0
+
+	#===================================================================
+	#							DO NOT EDIT
+	#===================================================================
+
+	# get the dimensions of the whole geometry and one cell
+	aG,lG,hG  = geomSize
+	hG		  = hG/2													#backward code compatibility
+	dA,dL,dH  = cellSize
+	# get parameters of the plate perforation
+	diamH,distHX,distHY = holePars
+	diamHEff  = math.sqrt(2)/2*diamH									#"effective hole size"
+
+	# auxiliary variables for geometry creation
+	hDCoeff   = 3														#how high should the dense block be (relative to inlet height)
+	zCoordVec = [z0,z0+hI,z0+hDCoeff*hI,z0+hG,
+				 z0+2*hG-hDCoeff*hI,z0+2*hG-hI,z0+2*hG]			    	#levels in z direction
+	nLrs   	  = len(zCoordVec)										    #number of levels in z direction
+
+	# get the hole centres and the grid lines through the holes edges
+	holeC     = holeLayout(layout,aG,lG,diamHEff,distHX,distHY)
+	xLines,hX = gridLines(x0,lG,holeC[:,0],diamHEff)
+	yLines,hY = gridLines(y0,aG,holeC[:,1],diamHEff)
+	nVertX,nVertY   = len(xLines),len(yLines)							#number of vertices in x,y-direction
+	hX,hY     = 2*hX+1,2*hY+1											#grid cells of the holes
+
+	# get the number of cells in X-Y planes (between holes, marginal and holes)
+	nCellsXVec = nCellsVec(xLines,dL,dL)
+	nCellsYVec = nCellsVec(yLines,dA,dL)
+
+	# get the number of cells in Z direction (different blocks)
+	nCellsZ    = int(math.ceil(hI/dH))
+	nCellsZS   = int(math.ceil(2*(hG-hDCoeff*hI)/(dH*(1+spGrad))))		#get number of cells in sparse block
+	# Note: grading factor in blockMesh is defined as the ratio of the
+	#		last to first cell size (hjasak) -> I can get the number of
+	#		cells from the sum of arithmetic series
+	nCellsZVec = [nCellsZ,(hDCoeff-1)*nCellsZ,nCellsZS,
+				  nCellsZS,(hDCoeff-1)*nCellsZ,nCellsZ]					#vector with number of cells in zDir
+
+	zGradVec   = [1.0,1.0,float(spGrad),1/float(spGrad),1.0,1.0]
+
+	# define matrix of vertices (layers in z, rows in y, x fastest)
+	Z,Y,X  = np.meshgrid(zCoordVec,yLines,xLines,indexing='ij')
+	vert   = np.column_stack((X.ravel(),Y.ravel(),Z.ravel()))
+	lablsV = np.arange(len(vert)).reshape(nLrs,nVertY,nVertX)			#list of vertices labels
+
+	# auxiliary function - faces in the z = const plane (cells i,j of layer k)
+	def facesZ(k,i,j):
+		return np.column_stack((lablsV[k,i,j],lablsV[k,i+1,j],lablsV[k,i+1,j+1],lablsV[k,i,j+1]))
+
+	# holes mask of the grid cells (plate and holes)
+	isHole = np.zeros((nVertY-1,nVertX-1),dtype=bool)
+	isHole[hY,hX] = True
+	if isHole.sum() != len(holeC):
+		raise ValueError('some of the holes are defined more than once')
+	pI,pJ  = np.nonzero(~isHole)										#plate cells
+
+	# refinement cylinders of the top and bottom holes (snappyHexMeshDict)
+	if holeFmt is not None:
+		holeRad = diamHEff/math.sqrt(2.0)								#hole radius
+		holes   = []
+		for z,tbSw,side in [[zCoordVec[0],1.0,'Bottom'],[zCoordVec[-1],-1.0,'Top']]:
+			for k in range(len(holeC)):
+				cX,cY = x0+holeC[k,0],y0+holeC[k,1]
+				holes.append(['refinementCylinder%s%d'%(side,k),[cX,cY,z],[cX,cY,z+tbSw*2.0*dH],holeRad])
+		writeSnappyHexMeshDict(holes,dH,caseDir,holeFmt)
+
+	#===================================================================
+
+	#===================================================================
+	#CREATE FILE AND WRITE THE DATA IN==================================
+	bMD = open(caseDir + './constant/polyMesh/blockMeshDict','w')		#open file for writing
+
+	#-----------------------------------------------------------------------
+	# write the headline
+	bMD.write('/*--------------------------------*- C++ -*----------------------------------*\ \n')
+	bMD.write('| ========                 |                                                 | \n')
+	bMD.write('| \\      /  F ield         | OpenFOAM: The Open Source CFD Toolbox           | \n')
+	bMD.write('|  \\    /   O peration     | Version:  2.3.0                                 | \n')
+	bMD.write('|   \\  /    A nd           | Web:      www.OpenFOAM.org                      | \n')
+	bMD.write('|    \\/     M anipulation  |                                                 | \n')
+	bMD.write('\*---------------------------------------------------------------------------*/ \n')
+
+	# write file description
+	bMD.write('FoamFile \n')
+	bMD.write('{ \n \t version \t 2.0; \n \t format \t ascii; \n')
+	bMD.write(' \t class \t\t dictionary; \n \t location \t "constant/polyMesh";\n \t object \t blockMeshDict; \n} \n')
+	bMD.write('// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * // \n\n')
+
+	#-------------------------------------------------------------------
+	# convert to metres
+	bMD.write('convertToMeters \t' + repr(mScale) + '; \n\n')
+
+	#-------------------------------------------------------------------
+	# write vertices
+	bMD.write('vertices \n( \n')
+	bMD.write(bulkFormat('\t ( %s %s %s )\t//%d\n',
+						 [row + [k] for k,row in enumerate(vert.tolist())]))
+	bMD.write('); \n\n')
+	#-------------------------------------------------------------------
+	# write edges
+	bMD.write('edges \n( \n')
+	for k in [0,-1]:													#bottom and top arcs
+		bMD.write(writeArcs(facesZ(k,hY,hX)[:,[0,3,2,1]],diamH,diamHEff,vert))
+	bMD.write('); \n\n')
+	#-------------------------------------------------------------------
+	# write blocks
+	bMD.write('blocks \n( \n')
+	L,J,K  = [ind.ravel() for ind in np.meshgrid(range(nLrs-1),range(nVertY-1),range(nVertX-1),indexing='ij')]
+	hexs   = np.column_stack((facesZ(L,J,K)[:,[0,3,2,1]],facesZ(L+1,J,K)[:,[0,3,2,1]]))
+	nCells = np.column_stack((np.array(nCellsXVec)[K],np.array(nCellsYVec)[J],np.array(nCellsZVec)[L]))
+	bMD.write(bulkFormat('\t hex \n\t \t ( %d %d %d %d %d %d %d %d ) \n'
+						 '\t \t ( %d %d %d ) \t simpleGrading \t ( 1.0 1.0 %r ) \n',
+						 [h + c + [zGradVec[l]] for h,c,l in zip(hexs.tolist(),nCells.tolist(),L.tolist())]))
+	bMD.write('); \n\n')
+	#-------------------------------------------------------------------
+	# write boundaries
+	# -- auxiliary function - faces in the x = const (y = const) plane
+	def facesX(k,i,j):
+		return np.column_stack((lablsV[k,i,j],lablsV[k+1,i,j],lablsV[k+1,i+1,j],lablsV[k,i+1,j]))
+	def facesY(k,i,j):
+		return np.column_stack((lablsV[k,i,j],lablsV[k,i,j+1],lablsV[k+1,i,j+1],lablsV[k+1,i,j]))
+	L,J    = [ind.ravel() for ind in np.meshgrid(range(nLrs-1),range(nVertY-1),indexing='ij')]
+	LS,KS  = [ind.ravel() for ind in np.meshgrid(range(nLrs-1),range(nVertX-1),indexing='ij')]
+	sides  = np.empty((2*len(LS),4),dtype=int)
+	sides[0::2],sides[1::2] = facesY(LS,0,KS),facesY(LS,-1,KS)
+	patches = [
+		['inlet','patch',facesX(L[L == 0],J[L == 0],0)],
+		['gasOutlet','patch',facesX(L[L > 0],J[L > 0],0)],
+		['outlet','patch',facesX(L,J,-1)],
+		['sides','wall',sides],
+		['plate','wall',np.vstack((facesZ(0,pI,pJ),facesZ(-1,pI,pJ)))],	#both top and bottom are plates
+		['holesBottomPrep','patch',facesZ(0,hY,hX)],
+		['holesTopPrep','patch',facesZ(-1,hY,hX)],
+		]
+	bMD.write('boundary \n( \n')
+	for name,tp,faces in patches:
+		bMD.write('\t' + name + ' \n\t{ \n')
+		bMD.write('\ttype ' + tp + '; \n')
+		bMD.write('\tfaces \n \t(\n')
+		bMD.write(bulkFormat('\t\t( %d %d %d %d ) \n',faces.tolist()))
+		bMD.write('\t);\n\t} \n\n')
+	bMD.write('); \n\n')
+	#-------------------------------------------------------------------
+	# -- merge patch pairs
+	bMD.write('mergePatchPairs \n( \n')
+	bMD.write('); \n\n')
+	#-------------------------------------------------------------------
+	# footline
+	bMD.write('// * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * // \n\n')
+	#-------------------------------------------------------------------
+	# close file
+	bMD.close()
+
+	return;
@@ -5,9 +5,20 @@
 #~ inclined (?textured?) plate. Calculates and saves aW/aT
 #~
 #~ NOTES:
+    #~ - run by pvbatch (no GUI), the script opens the case itself and
+    #~   only computes and stores aW/aT, no views and representations are
+    #~   created and nothing is rendered (no animation images)
+    #~ - pvbatch, the aW/aT time series is split among nProcs pvbatch
+    #~   workers (each with its own reader and pipeline, every nProcs-th
+    #~   written time), the results are merged in time order
+    #~ - every worker loads the whole case, keep nProcs small (memory),
+    #~   the times of a failed worker (non-zero return code or missing
+    #~   part file) are evaluated serially by the main process
     
 #~ USAGE:
    #~ paraFoam --script=./postProcSaveData.py 
+   #~ pvbatch ./postProcSaveData.py
+   #~ pvbatch ./postProcSaveData.py iWorker nWorkers                  #worker (started by the script)
 
 
 #LICENSE================================================================
@@ -39,36 +50,73 @@ ySkip= 0.07
 outDataFolder = "/media/martin/Data_2/05_TextPlate/10_noTexture/AA_evPrep/10_postProcOutputs/"
 # -- file for saving the scalar outputs
 scalDataFile  = "iF_scalDataFile"
+# -- number of the pvbatch workers for the aW/aT time series
+nProcs        = 4                                                       #1 ... serial, 0 ... all the cores
 
 # POSTPROCESSING INITIATION=============================================
 import glob
+import os
+import sys
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
 
-mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
-
-paraview.simple._DisableFirstRenderCameraReset()
-
-activeSource_OpenFOAM = GetActiveSource()
+try: paraview.simple                                                    #paraFoam --script
+except NameError: from paraview.simple import *                         #pvbatch
 
-# enable all available fields
-activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
-
-# show all for internal mesh
-activeSource_OpenFOAM.MeshParts = ['internalMesh']
-
-# I dont want to see the main mesh / I do want to see it as transparent wireframe
-allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
-allIntMeshRepresentation.Visibility = 1
-allIntMeshRepresentation.Representation = 'Wireframe'
-allIntMeshRepresentation.Opacity = 0.1
+mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
 
-# set up black background (seems prettier)
-RenderView1 = GetRenderView()
-RenderView1.UseTexturedBackground = 0
-RenderView1.Background = [0.0, 0.0, 0.0]
+batchMode = GetActiveSource() is None                                   #pvbatch, nothing opened by paraFoam
+
+isWorker  = batchMode and len(sys.argv) > 2                             #pvbatch worker of the aW/aT time series
+if isWorker:
+    iWorker,nWorkers = int(sys.argv[1]),int(sys.argv[2])
+
+def fShow(source,**props):
+    # GUI: show the source and set the properties of its representation
+    # pvbatch: only update the source in the current time (no view)
+    if batchMode:
+        source.UpdatePipeline(cTime)
+        return None
+    representation = Show(source)
+    for prop in props:
+        setattr(representation,prop,props[prop])
+    return representation
+
+if batchMode:
+    # open the case with the OpenFOAM reader, go to the last time step
+    activeSource_OpenFOAM = OpenFOAMReader( FileName=mainCase[0], guiName=mainCase[0][2::] )
+    activeSource_OpenFOAM.CellArrays  = ['alpha.liquid', 'p_rgh', 'U']
+    activeSource_OpenFOAM.MeshRegions = ['internalMesh']
+    activeSource_OpenFOAM.UpdatePipelineInformation()
+    tSteps = list(activeSource_OpenFOAM.TimestepValues)                 #written times
+    cTime  = tSteps[-1]                                                 #last time step
+    activeSource_OpenFOAM.UpdatePipeline(cTime)
+else:
+    paraview.simple._DisableFirstRenderCameraReset()
+
+    activeSource_OpenFOAM = GetActiveSource()
+
+    # enable all available fields
+    activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
+
+    # show all for internal mesh
+    activeSource_OpenFOAM.MeshParts = ['internalMesh']
+
+    # I dont want to see the main mesh / I do want to see it as transparent wireframe
+    allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
+    allIntMeshRepresentation.Visibility = 1
+    allIntMeshRepresentation.Representation = 'Wireframe'
+    allIntMeshRepresentation.Opacity = 0.1
+
+    # set up black background (seems prettier)
+    RenderView1 = GetRenderView()
+    RenderView1.UseTexturedBackground = 0
+    RenderView1.Background = [0.0, 0.0, 0.0]
 
-Render()
+    Render()
 
-activeSource_OpenFOAM = FindSource( mainCase[0][2::] )
+    activeSource_OpenFOAM = FindSource( mainCase[0][2::] )
 
 # CREATE A SCALAR CLIP - SHOW ONLY THE RIVULET==========================
 liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
@@ -76,10 +124,7 @@ liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
 liqOnly.Scalars = ['POINTS', 'alpha.liquid']
 liqOnly.Value = 0.5
 
-liqOnlyRepresentation = Show()
-
-liqOnlyRepresentation.Representation = 'Surface'
-Render()
+liqOnlyRepresentation = fShow(liqOnly,Representation='Surface')
 
 # CREATE A SLICE AT Z=EPS (GET WETTED AREA)=============================
 wettedPlate = Slice( SliceType="Plane", guiName="wettedPlate" )
@@ -88,27 +133,29 @@ wettedPlate.SliceOffsetValues = [0.0]
 wettedPlate.SliceType.Origin = [0.0, 0.0, 1.0e-6]                      #slightly above the plate level
 wettedPlate.SliceType.Normal = [0.0, 0.0, 1.0]                          #z normal
 
-wettedPlateRepresentation = Show()
-wettedPlateRepresentation.Visibility = 1
-
-Render()
+wettedPlateRepresentation = fShow(wettedPlate,Visibility=1)
 
 # MOVE TO THE LAST TIME STEP============================================
-AnimationScene1 = GetAnimationScene()
-AnimationScene1.GoToLast()
+if not batchMode:
+    Render()
+    
+    AnimationScene1 = GetAnimationScene()
+    AnimationScene1.GoToLast()
 
-Render()
+    Render()
+    
+    cTime   = AnimationScene1.AnimationTime
 
 # CALCULATE THE WETTED AREA=============================================
 SetActiveSource(wettedPlate)
 integrateVars = IntegrateVariables( guiName = "integrateVars")          #create the filter
+integrateVars.UpdatePipeline(cTime)
 
 aW = integrateVars.CellData.GetArray('Area').GetRange()#dig out data
 aW = aW[0]                                                              #wetted area, m2
 
 # CALCULATE THE TOTAL WETTABLE AREA=====================================
-allData = servermanager.Fetch(activeSource_OpenFOAM)
-coordMax= allData.GetBlock(0).GetBlock(0).GetBounds()                   #(xMin,xMax,yMin,yMax,zMin,zMax)
+coordMax= activeSource_OpenFOAM.GetDataInformation().GetBounds()        #(xMin,xMax,yMin,yMax,zMin,zMax)
 aT      = (coordMax[1]-coordMax[0])*(coordMax[3]-coordMax[2])           #rectangular and non-textured
 
 # -- testing outputs - print out aW/aT
@@ -128,114 +175,161 @@ pVals = [
             "%5.4e"%(aW/aT),                                            #wetted to total area ratio
         ]
 
-# write everything to the file
-with open(outDataFolder+solver+'_scalDataFile', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + '\n'
+# write everything to the file (not in the workers, done by the main run)
+if not isWorker:
+    with open(outDataFolder+solver+'_scalDataFile', 'r') as file:
+        # read a list of lines into data
+        data = file.readlines()
+        
+    for j in range(len(idStr)):
+        for i in range(len(data)):
+            fInd = data[i].find(idStr[j])
+            if fInd>-1:
+                data[i] = data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + '\n'
 
-with open(outDataFolder+solver+'_scalDataFile', 'w') as file:
-    file.writelines( data )
+    with open(outDataFolder+solver+'_scalDataFile', 'w') as file:
+        file.writelines( data )
 
-# ADD CASE TITLE========================================================
+# Note: GUI only, pvbatch does not create any view
+if not batchMode:
+    # ADD CASE TITLE====================================================
 
-# ADD ANOTATE TIME SOURCE===============================================
-annotTime = AnnotateTime()
+    # ADD ANOTATE TIME SOURCE===========================================
+    annotTime = AnnotateTime()
 
-annotTimeRepresentation = Show()
+    annotTimeRepresentation = Show()
 
-annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
+    annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
 
-annotTimeRepresentation.FontFamily = 'Courier'
-annotTimeRepresentation.Position = [xAll, 0.025]
-annotTimeRepresentation.Visibility = 1
+    annotTimeRepresentation.FontFamily = 'Courier'
+    annotTimeRepresentation.Position = [xAll, 0.025]
+    annotTimeRepresentation.Visibility = 1
 
-Render()
+    Render()
 
-# POST RUNNING MODIFICATIONS============================================
+    # POST RUNNING MODIFICATIONS========================================
 
 
-# ADD SCALAR BAR WITH VELOCITY MAGNITUDE================================
-source = liqOnly
+    # ADD SCALAR BAR WITH VELOCITY MAGNITUDE============================
+    source = liqOnly
 
-#~ data = source.GetCellDataInformation()
-data = source.GetPointDataInformation()
+    #~ data = source.GetCellDataInformation()
+    data = source.GetPointDataInformation()
 
-#get the array and the respective min-max
-array = data.GetArray('U')
-dataRange = array.GetRange(-1)                                          #-1 for magnitude
+    #get the array and the respective min-max
+    array = data.GetArray('U')
+    dataRange = array.GetRange(-1)                                          #-1 for magnitude
 
-# SCALAR BAR============================================================
+    # SCALAR BAR========================================================
 
-a3_U_PVLookupTable = GetLookupTableForArray( "U", 3,
-    RGBPoints=[0.0, 0.0, 0.0, 1.0, dataRange[1], 1.0, 0.0, 0.0],
-    VectorMode='Magnitude',
-    ScalarRangeInitialized=1.0 )
+    a3_U_PVLookupTable = GetLookupTableForArray( "U", 3,
+        RGBPoints=[0.0, 0.0, 0.0, 1.0, dataRange[1], 1.0, 0.0, 0.0],
+        VectorMode='Magnitude',
+        ScalarRangeInitialized=1.0 )
 
-a3_U_PiecewiseFunction = CreatePiecewiseFunction( Points=[0.0, 0.0, 0.5, 0.0, 1.0, 1.0, 0.5, 0.0] )
+    a3_U_PiecewiseFunction = CreatePiecewiseFunction( Points=[0.0, 0.0, 0.5, 0.0, 1.0, 1.0, 0.5, 0.0] )
 
-liqOnlyRepresentation.Representation = 'Surface'
-liqOnlyRepresentation.ColorArrayName = ('POINT_DATA', 'U')
-liqOnlyRepresentation.LookupTable = a3_U_PVLookupTable
+    liqOnlyRepresentation.Representation = 'Surface'
+    liqOnlyRepresentation.ColorArrayName = ('POINT_DATA', 'U')
+    liqOnlyRepresentation.LookupTable = a3_U_PVLookupTable
 
-a3_U_PVLookupTable.ScalarOpacityFunction = a3_U_PiecewiseFunction
+    a3_U_PVLookupTable.ScalarOpacityFunction = a3_U_PiecewiseFunction
         
-Render()
+    Render()
 
-ScalarBarWidgetRepresentation = CreateScalarBar( Title='$\|u\|,[\mathrm{ms^{-1}}]$',
- ComponentTitle='',
- LabelFontSize=12,
- Enabled=1,
- LookupTable=a3_U_PVLookupTable,
- TitleFontSize=14,
- LabelFormat='$%-#5.2e$')
-RenderView1.Representations.append(ScalarBarWidgetRepresentation)
+    ScalarBarWidgetRepresentation = CreateScalarBar( Title='$\|u\|,[\mathrm{ms^{-1}}]$',
+     ComponentTitle='',
+     LabelFontSize=12,
+     Enabled=1,
+     LookupTable=a3_U_PVLookupTable,
+     TitleFontSize=14,
+     LabelFormat='$%-#5.2e$')
+    RenderView1.Representations.append(ScalarBarWidgetRepresentation)
 
-Render()
+    Render()
 
-# SET PROPER CAMERA POSITION============================================
-ResetCamera()
-RenderView1 = GetRenderView()
-RenderView1.CameraViewUp = [-0.9, 0.1, 0.4]
-RenderView1.CameraPosition = [0.4,0.9,0.6]
+    # SET PROPER CAMERA POSITION========================================
+    ResetCamera()
+    RenderView1 = GetRenderView()
+    RenderView1.CameraViewUp = [-0.9, 0.1, 0.4]
+    RenderView1.CameraPosition = [0.4,0.9,0.6]
 
-Render()
+    Render()
 
 # SAVE aW/aT DURING THE WHOLE SIMULATION AND SAVE IMAGES FOR ANIMATION)=
 aWaTList= ['time\taWaT\n']                                             #prepare variable
-eTime   = AnimationScene1.EndTime
-
-AnimationScene1.GoToFirst()
-k       = 0;
-cTime   = AnimationScene1.AnimationTime
-
-while (cTime < eTime):
-    Render()
-    #x3dExporter=exporters.X3DExporter(FileName='./x3dFiles/rivulet_%03d.x3d'% (k))
-    #x3dExporter.SetView(GetActiveView()) # <===== NEW LINE
-    #x3dExporter.Write()
-    # -- save image for animation
-    WriteImage('pvAnimation/plate_%03d.png'%k)
-    # -- calculate current wetted area
-    aW = integrateVars.CellData.GetArray('Area').GetRange()#dig out data
-    aW = aW[0]
-    aWaTList.append("%5.4f"%cTime + "\t" + "%5.5f\n"%(aW/aT))        #append to the data
-    # -- move to the next timestep
-    AnimationScene1.GoToNext()
-    k = k+1
+partFile= './aWaT_part%d'                                               #results of the workers
+def fRunWorker(i):
+    return subprocess.call(['pvbatch',sys.argv[0],str(i),str(nWorkers)])
+
+def faWaTRows(times):
+    # aW/aT in the given written times (current process, no images)
+    rows = []
+    for cTime in times:
+        integrateVars.UpdatePipeline(cTime)
+        aW = integrateVars.CellData.GetArray('Area').GetRange()#dig out data
+        aW = aW[0]
+        rows.append("%5.4f"%cTime + "\t" + "%5.5f\n"%(aW/aT))        #append to the data
+    return rows
+
+if isWorker:
+    # -- worker, every nWorkers-th written time, results to the part file
+    aWaTList.extend(faWaTRows(tSteps[iWorker::nWorkers]))
+    with open(partFile%iWorker,'w') as file:
+        file.writelines( aWaTList[1:] )
+elif batchMode and nProcs != 1 and len(tSteps) > 1:
+    # -- written times split among the workers, merged in time order
+    nWorkers = min(nProcs or multiprocessing.cpu_count(),len(tSteps))
+    for i in range(nWorkers):                                           #part files of a previous run
+        if os.path.isfile(partFile%i):
+            os.remove(partFile%i)
+    pool     = ThreadPool(nWorkers)                                     #the workers are pvbatch processes
+    retCodes = pool.map(fRunWorker,range(nWorkers))
+    pool.close()
+    aWaTRows = []
+    for i in range(nWorkers):
+        if retCodes[i] == 0 and os.path.isfile(partFile%i):
+            with open(partFile%i,'r') as file:
+                aWaTRows.extend(file.readlines())
+        else:                                                           #failed worker, its times evaluated here
+            print('worker %d failed (return code %d), serial evaluation'%(i,retCodes[i]))
+            aWaTRows.extend(faWaTRows(tSteps[i::nWorkers]))
+        if os.path.isfile(partFile%i):
+            os.remove(partFile%i)
+    aWaTList.extend(sorted(aWaTRows,key=lambda row: float(row.split('\t')[0])))
+elif batchMode:
+    # -- no images, only the wetted area in all the written times
+    aWaTList.extend(faWaTRows(tSteps))
+else:
+    eTime   = AnimationScene1.EndTime
+
+    AnimationScene1.GoToFirst()
+    k       = 0;
     cTime   = AnimationScene1.AnimationTime
+
+    while (cTime < eTime):
+        Render()
+        #x3dExporter=exporters.X3DExporter(FileName='./x3dFiles/rivulet_%03d.x3d'% (k))
+        #x3dExporter.SetView(GetActiveView()) # <===== NEW LINE
+        #x3dExporter.Write()
+        # -- save image for animation
+        WriteImage('pvAnimation/plate_%03d.png'%k)
+        # -- calculate current wetted area
+        aW = integrateVars.CellData.GetArray('Area').GetRange()#dig out data
+        aW = aW[0]
+        aWaTList.append("%5.4f"%cTime + "\t" + "%5.5f\n"%(aW/aT))        #append to the data
+        # -- move to the next timestep
+        AnimationScene1.GoToNext()
+        k = k+1
+        cTime   = AnimationScene1.AnimationTime
     
 # -- save the results
-with open(
-            outDataFolder + caseName + '_aWaT',
-            'w'
-        ) as file:
-    file.writelines( aWaTList )
+if not isWorker:
+    with open(
+                outDataFolder + caseName + '_aWaT',
+                'w'
+            ) as file:
+        file.writelines( aWaTList )
 
 # ANIMATION SAVING (PURE IMAGES, NOT BLENDER)===========================
 #~ eTime   = float("%s"%AnimationScene1.GetProperty('Duration'))
@@ -6,9 +6,13 @@
 #~
 #~ NOTES:
     #~ - still unfinished BUT improvement
+    #~ - run by pvbatch (no GUI), the script opens the case itself, the
+    #~   hidden filters get no representation and the view is rendered
+    #~   only once, into postProcMinimal_gCC.png
     
 #~ USAGE:
    #~ paraFoam --script=./postProcMinimal.py 
+   #~ pvbatch ./postProcMinimal.py
 
 
 #LICENSE================================================================
@@ -41,30 +45,65 @@ ySkip= 0.07
 import glob
 import math
 
-mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
-
-paraview.simple._DisableFirstRenderCameraReset()
-
-activeSource_OpenFOAM = GetActiveSource()
-
-# enable all available fields
-activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
+try: paraview.simple                                                    #paraFoam --script
+except NameError: from paraview.simple import *                         #pvbatch
 
-# show all for internal mesh
-activeSource_OpenFOAM.MeshParts = ['internalMesh']
-
-# I dont want to see the main mesh / I do want to see it as transparent wireframe
-allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
-allIntMeshRepresentation.Visibility = 1
-allIntMeshRepresentation.Representation = 'Wireframe'
-allIntMeshRepresentation.Opacity = 0.1
-
-# set up black background (seems prettier)
-RenderView1 = GetRenderView()
-RenderView1.UseTexturedBackground = 0
-RenderView1.Background = [0.0, 0.0, 0.0]
+mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
 
-activeSource_OpenFOAM = FindSource( mainCase[0][2::] )
+batchMode = GetActiveSource() is None                                   #pvbatch, nothing opened by paraFoam
+
+def fShow(source,**props):
+    # show the source and set the properties of its representation
+    # pvbatch: the hidden sources are only updated (no representation)
+    if batchMode:
+        source.UpdatePipeline(cTime)
+        if not props.get('Visibility',1):
+            return None
+    representation = Show(source)
+    for prop in props:
+        setattr(representation,prop,props[prop])
+    return representation
+
+def fRender():
+    if not batchMode:
+        Render()
+
+if batchMode:
+    # open the case with the OpenFOAM reader, go to the last time step
+    activeSource_OpenFOAM = OpenFOAMReader( FileName=mainCase[0], guiName=mainCase[0][2::] )
+    activeSource_OpenFOAM.CellArrays  = ['alpha.liquid', 'p_rgh', 'U']
+    activeSource_OpenFOAM.MeshRegions = ['internalMesh']
+    activeSource_OpenFOAM.UpdatePipelineInformation()
+    tSteps = list(activeSource_OpenFOAM.TimestepValues)                 #written times
+    cTime  = tSteps[-1]                                                 #last time step
+    activeSource_OpenFOAM.UpdatePipeline(cTime)
+    # -- offscreen view, rendered once at the end
+    RenderView1 = GetRenderView()
+    RenderView1.Background = [0.0, 0.0, 0.0]
+    RenderView1.ViewTime   = cTime
+else:
+    paraview.simple._DisableFirstRenderCameraReset()
+
+    activeSource_OpenFOAM = GetActiveSource()
+
+    # enable all available fields
+    activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
+
+    # show all for internal mesh
+    activeSource_OpenFOAM.MeshParts = ['internalMesh']
+
+    # I dont want to see the main mesh / I do want to see it as transparent wireframe
+    allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
+    allIntMeshRepresentation.Visibility = 1
+    allIntMeshRepresentation.Representation = 'Wireframe'
+    allIntMeshRepresentation.Opacity = 0.1
+
+    # set up black background (seems prettier)
+    RenderView1 = GetRenderView()
+    RenderView1.UseTexturedBackground = 0
+    RenderView1.Background = [0.0, 0.0, 0.0]
+
+    activeSource_OpenFOAM = FindSource( mainCase[0][2::] )
 
 # CREATE A SCALAR CLIP - SHOW ONLY THE RIVULET==========================
 liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
@@ -72,11 +111,7 @@ liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
 liqOnly.Scalars = ['POINTS', 'alpha.liquid']
 liqOnly.Value = 0.5
 
-liqOnlyRepresentation = Show()
-
-liqOnlyRepresentation.Representation = 'Surface'
-liqOnlyRepresentation.Visibility = 1
-liqOnlyRepresentation.Opacity    = 0.5
+liqOnlyRepresentation = fShow(liqOnly,Representation='Surface',Visibility=1,Opacity=0.5)
 
 # CREATE A SCALAR CLIP - SHOW ONLY THE GAS PHASE========================
 SetActiveSource(activeSource_OpenFOAM)
@@ -87,10 +122,7 @@ gasOnly.Scalars = ['POINTS', 'alpha.liquid']
 gasOnly.Value = 0.05
 gasOnly.InsideOut = 1
 
-gasOnlyRepresentation = Show()
-
-gasOnlyRepresentation.Representation = 'Surface'
-gasOnlyRepresentation.Visibility = 0
+gasOnlyRepresentation = fShow(gasOnly,Representation='Surface',Visibility=0)
 
 # COLOR THE FILM BY FILM THICKNESS (CALCULATOR+PROPER COLORING)=========
 SetActiveSource(liqOnly)                                                #reset the active source
@@ -99,12 +131,10 @@ fThCalc  = Calculator( guiName="fThCalc" )
 fThCalc.Function = 'coordsZ'
 fThCalc.ResultArrayName = 'hFun'
 
-fThCalcRepresentation = Show()
-fThCalcRepresentation.Visibility = 0
+fThCalcRepresentation = fShow(fThCalc,Visibility=0)
 
 # GET THE COMP DOMAIN DIMENSIONS========================================
-allData = servermanager.Fetch(activeSource_OpenFOAM)
-coordMax= allData.GetBlock(0).GetBlock(0).GetBounds()                   #(xMin,xMax,yMin,yMax,zMin,zMax)
+coordMax= activeSource_OpenFOAM.GetDataInformation().GetBounds()        #(xMin,xMax,yMin,yMax,zMin,zMax)
 domSize = [                                                             #computational domain size
              coordMax[1]-coordMax[0],
              coordMax[3]-coordMax[2],
@@ -140,8 +170,7 @@ gasUStrLines.SeedType.NumberOfPoints = 1000
 
 gasUStrLines.MaximumStreamlineLength = math.sqrt(domSize[0]**2+domSize[1]**2+domSize[2]**2)
 
-gasUStrLinesRepresentation = Show()
-gasUStrLinesRepresentation.Visibility = 1
+gasUStrLinesRepresentation = fShow(gasUStrLines,Visibility=1)
 
 
 # CREATE SLICE AT THE DOMAIN MIDDLE=====================================
@@ -153,10 +182,9 @@ yNormSlice.SliceOffsetValues = [0.0]
 yNormSlice.SliceType.Origin = domMid                                    #set the origin to domain middle
 yNormSlice.SliceType.Normal = [0.0, 1.0, 0.0]                           #y normal
 
-yNormSliceRepresentation = Show()
-yNormSliceRepresentation.Visibility = 0
+yNormSliceRepresentation = fShow(yNormSlice,Visibility=0)
 
-Render()
+fRender()
 
 # CREATE LIQUID ONLY AND GAS ONLY CLIPS=================================
 liqOnlySl = Clip( ClipType="Scalar", guiName="liqOnlySl" )
@@ -164,11 +192,7 @@ liqOnlySl = Clip( ClipType="Scalar", guiName="liqOnlySl" )
 liqOnlySl.Scalars = ['POINTS', 'alpha.liquid']
 liqOnlySl.Value = 0.5
 
-liqOnlySlRepresentation = Show()
-
-liqOnlySlRepresentation.Representation = 'Surface'
-liqOnlySlRepresentation.DiffuseColor   = [0.0,0.0,1.0]
-liqOnlySlRepresentation.Visibility = 1
+liqOnlySlRepresentation = fShow(liqOnlySl,Representation='Surface',DiffuseColor=[0.0,0.0,1.0],Visibility=1)
 
 SetActiveSource(yNormSlice)                                             #reset the active source
 
@@ -178,10 +202,7 @@ gasOnlySl.Scalars   = ['POINTS', 'alpha.liquid']
 gasOnlySl.Value     = 0.05
 gasOnlySl.InsideOut = 1
 
-gasOnlySlRepresentation = Show()
-
-gasOnlySlRepresentation.Representation = 'Surface'
-gasOnlySlRepresentation.Visibility = 0
+gasOnlySlRepresentation = fShow(gasOnlySl,Representation='Surface',Visibility=0)
 
 # CREATE INTERFACE REGIONS==============================================
 SetActiveSource(liqOnlySl)
@@ -192,10 +213,7 @@ liqIntR.Scalars = ['POINTS', 'alpha.liquid']
 liqIntR.Value   = 0.55
 liqIntR.InsideOut=1
 
-liqIntRRepresentation = Show()
-liqIntRRepresentation.Representation = 'Surface'
-liqIntRRepresentation.DiffuseColor   = [1.0,0.0,0.0]
-liqIntRRepresentation.Visibility = 1
+liqIntRRepresentation = fShow(liqIntR,Representation='Surface',DiffuseColor=[1.0,0.0,0.0],Visibility=1)
 
 # CREATE GLYPHS (VELOCITY VECTOR FIELDS)================================
 SetActiveSource(liqIntR)                                                #reset the active source
@@ -214,8 +232,7 @@ liqIntVelF.MaximumNumberofPoints = 200
 liqIntVelF.GlyphType.TipRadius      = 0.04
 liqIntVelF.GlyphType.ShaftRadius    = 0.02
 
-liqIntVelFRepresentation = Show()
-liqIntVelFRepresentation.DiffuseColor = [1.0,0.0,0.0]
+liqIntVelFRepresentation = fShow(liqIntVelF,DiffuseColor=[1.0,0.0,0.0])
 
 # SCALAR BAR============================================================
 
@@ -224,7 +241,7 @@ liqIntVelFRepresentation.DiffuseColor = [1.0,0.0,0.0]
 # ADD ANOTATE TIME SOURCE===============================================
 annotTime = AnnotateTime()
 
-annotTimeRepresentation = Show()
+annotTimeRepresentation = fShow(annotTime)
 
 annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
 
@@ -232,14 +249,15 @@ annotTimeRepresentation.FontFamily = 'Courier'
 annotTimeRepresentation.Position = [xAll, 0.025]
 annotTimeRepresentation.Visibility = 1
 
-Render()
+fRender()
 
 # POST RUNNING MODIFICATIONS============================================
 
-AnimationScene1 = GetAnimationScene()
-AnimationScene1.GoToLast()
+if not batchMode:
+    AnimationScene1 = GetAnimationScene()
+    AnimationScene1.GoToLast()
 
-Render()
+    Render()
 
 
 # ADD SCALAR BAR WITH VELOCITY MAGNITUDE================================
@@ -269,7 +287,7 @@ colorObjectRepresentation.LookupTable = a3_U_PVLookupTable
 
 a3_U_PVLookupTable.ScalarOpacityFunction = a3_U_PiecewiseFunction
         
-Render()
+fRender()
 
 ScalarBarWidgetRepresentation = CreateScalarBar( Title='$\|u\|,[\mathrm{ms^{-1}}]$',
     ComponentTitle='',
@@ -280,7 +298,7 @@ ScalarBarWidgetRepresentation = CreateScalarBar( Title='$\|u\|,[\mathrm{ms^{-1}}
     LabelFormat='$%-#5.2e$')
 RenderView1.Representations.append(ScalarBarWidgetRepresentation)
 
-Render()
+fRender()
 
 # SCALAR BAR============================================================
 #~ source = fThCalc                                                        #where to get the data
@@ -327,8 +345,12 @@ RenderView1 = GetRenderView()
 RenderView1.CameraViewUp = [-0.9, 0.1, 0.4]
 RenderView1.CameraPosition = [0.4,0.9,0.6]
 
-Render()
+fRender()
 
+# SAVE THE PICTURE (PVBATCH)============================================
+if batchMode:
+    WriteImage('postProcMinimal_gCC.png')                               #the only render
+    
 # ANIMATION SAVING (PURE IMAGES, NOT BLENDER)===========================
 #~ eTime   = float("%s"%AnimationScene1.GetProperty('Duration'))
 #~ 
@@ -54,6 +54,9 @@ from dfluidData import dfluidData
 from fblockMeshGen import fblockMeshGen                                 #blockMeshDict generation
 #~ from finletBCWriter   import finletBCWriter                          #BC adjustment
 from fprepIC_noGravityV4 import fprepIC_noGravity                         #initial condition (setFields)
+from ffoamDict import FoamDict                                          #parsed OpenFOAM dictionaries
+from fcaseMaterializer import materializeCase                           #caseDir from the baseCase (links)
+from fmeshCache import meshHash,cachedMesh                              #cache of the generated meshes
 
 #LOCAL FUNCTIONS DEFINITIONS============================================
 def meshSizePars(Q0,liqName):
@@ -143,15 +146,12 @@ if CHILD:
 
 #COPY CASE BASICS FROM THE BASECASE=====================================
 baseCase    = '../01_baseCase/'                                         #folder with baseCase
+meshCache   = '../meshCache/'                                           #shared meshes ('' ... no cache)
+wdTables    = '../rivuletTables/'                                       #tabulated rivulet width (frivuletWidth.py)
 caseDir     = ('../iF_' + 
                 repr(round(Q0*1e6,4)) + '_' + repr(round(alpha*180/math.pi)) + 
                 '_' + liqName + 'V2/'
                 )
-
-if os.path.isdir(caseDir):                                              #ensure, that the caseDir is clear
-    sh.rmtree(caseDir)
-    
-sh.copytree(baseCase,caseDir)                                             #copy data to caseDir
 #SPECIFY CURRENT SCRIPT VERSIONS========================================
 blockMeshGen        = 'fblockMeshGen'
 caseConstructor     = 'caseConstructorV9'
@@ -175,8 +175,32 @@ scNames = [ blockMeshGen,                                               #preProc
             blenderPrep,                                                #rivulet postprocessing (blender)
             simControl                                                  #script to see the simulation progress
             ]                                   
-for scName in scNames:
-    sh.copyfile(scFolder + scName + '.py',caseDir + scName + '.py')     #copy current script version
+
+# -- files patched by this script (and by the called functions), these
+#    are really copied, the rest is linked to the baseCase and scFolder
+cpFiles = [ 'README',
+            '0.org/U',
+            '0.org/alpha.liquid',
+            '0.org/p_rgh',                                              #fprepIC_noGravity (direct)
+            'constant/g',
+            'constant/transportProperties',
+            'constant/polyMesh/blockMeshDict',                          #fblockMeshGen
+            'system/decomposeParDict',
+            'system/controlDict',
+            'system/fvSolution',
+            'system/setFieldsDict',                                     #fprepIC_noGravity
+            'Allrun-parallel',
+            'Allrun.pre',
+            'of.sh',
+            rivuletPostProc + '.py',
+            rivuletPostProcSaveData + '.py',
+            rivuletPostProc2Blender + '.py',
+            blenderPrep + '.py',
+            ]
+
+nFiles = materializeCase(baseCase,caseDir,cpFiles,scFolder,scNames)     #ensures, that the caseDir is clear
+print 'caseDir files (reflinked, hard-linked, copied): %d, %d, %d\n'%(
+        nFiles['reflink'],nFiles['link'],nFiles['copy'])
 
 #CASE CONSTANTS AND CALCULATIONS========================================
 # input data------------------------------------------------------------
@@ -260,6 +284,11 @@ fblockMeshGen(caseDir,x0,y0,z0,cL,cW,cH,iH,tL,dbW,nDiv,d0,
     nCellsXDL,nCellsXDS,nCellsYD,nCellsZD,
     nCellsXSL,nCellsXSS,nCellsYS,nCellsZS,nCellsZI,
     mScale)
+
+meshKey = meshHash(caseDir)                                             #key of the mesh in the mesh cache
+meshDir = None
+if meshCache and cachedMesh(meshCache,meshKey):                         #the mesh was already generated
+    meshDir = os.path.join(meshCache,meshKey)
 print 'DONE=======================================\n\n'
 
 
@@ -278,24 +307,13 @@ README.write('\n 0.org==============================================\n')
 #
 README.write('\n U\n')
 
-pVals   = [repr(mDot)]                                                   #mass flow rate in rivulet
-
-idStr   = ['massFlowRate    constant ']
+fDict   = FoamDict(caseDir + './0.org/U')
 
-# write everything to the file
-with open(caseDir + './0.org/U', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+for path in fDict.paths('massFlowRate'):
+    fDict.set(path,'constant ' + repr(mDot))                            #mass flow rate in rivulet
 
-with open(caseDir + './0.org/U', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # alpha.liquid
@@ -305,24 +323,18 @@ with open(caseDir + './0.org/U', 'w') as file:
 #
 README.write('\n alpha.liquid\n')
 
-pVals   = [repr(theta0),repr(thetaA),repr(thetaR)]                      #contact angles
+pVals   = [theta0,thetaA,thetaR]                                        #contact angles
 
 idStr   = ['theta0','thetaA','thetaR']
 
-# write everything to the file
-with open(caseDir + './0.org/alpha.liquid', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
+fDict   = FoamDict(caseDir + './0.org/alpha.liquid')
+
 for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t\t\t' + pVals[j] + ';\n'
+    for path in fDict.paths(idStr[j]):                                  #all the patches with contact angle
+        fDict.set(path,pVals[j])
 
-with open(caseDir + './0.org/alpha.liquid', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 print 'DONE=======================================\n\n'
 
 #CONSTANTS DIRECTORY FILES MODIFICATIONS================================
@@ -341,22 +353,12 @@ gx    = math.sin(alpha)*g
 gy    = 0.0
 gz    = -math.cos(alpha)*g
 
-idStr = 'value'
+fDict = FoamDict(caseDir + './constant/g')
 
-# write everything to the file
-with open(caseDir + './constant/g', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for i in range(len(data)):
-    fInd = data[i].find(idStr)
-    if fInd>-1:
-        data[i] = (data[i][:fInd] + idStr + '\t\t\t(' 
-        + repr(gx) + '\t' + repr(gy) + '\t' + repr(gz) + ');\n')
+fDict.set('value',(gx,gy,gz))
 
-with open(caseDir + './constant/g', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # transportProperties
@@ -366,28 +368,17 @@ with open(caseDir + './constant/g', 'w') as file:
 #
 README.write('\n transportProperties\n')
 
-idStr = ['nu [ 0 2 -1 0 0 0 0 ]',
-         'rho [ 1 -3 0 0 0 0 0 ]',
-         'sigma [ 1 0 -2 0 0 0 0 ]']         
+fDict = FoamDict(caseDir + './constant/transportProperties')
 
-pVals = [nu,rho,sigma]
+phases= ['liquid','air']                                                #order of the values in nu and rho
 
-# write everything to the file
-with open(caseDir + './constant/transportProperties', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    k = 0
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + repr(pVals[j][k]) + ';\n'
-            k = k+1
+for k in range(len(phases)):                                            #only the values, dimensions are kept
+    fDict.setLast(phases[k] + '/nu',nu[k])
+    fDict.setLast(phases[k] + '/rho',rho[k])
+fDict.setLast('sigma',sigma[0])
 
-with open(caseDir + './constant/transportProperties', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 print 'DONE=======================================\n\n'   
 #SYSTEM DIRECTORY FILES MODIFICATIONS===================================
@@ -406,7 +397,10 @@ a0      = a0Theor                                                       #initial
 l       = 3.0e-5                                                        #interim region length scale
 
 
-fprepIC_noGravity(caseDir,a0,Q0,liqName,l,alpha,cL,nCellsXDL,cH,nCellsZD,pltFlag)
+if meshDir is not None:
+    README.write('fields initialized directly on the cached mesh ' + meshKey + '\n')
+
+fprepIC_noGravity(caseDir,a0,Q0,liqName,l,alpha,cL,nCellsXDL,cH,nCellsZD,pltFlag,meshDir,wdTables)
 
     
 #-----------------------------------------------------------------------
@@ -417,24 +411,12 @@ fprepIC_noGravity(caseDir,a0,Q0,liqName,l,alpha,cL,nCellsXDL,cH,nCellsZD,pltFlag
 #
 README.write('\n decomposeParDict\n')
 
-idStr = ['numberOfSubdomains ']
-
-pVals = [repr(nCores)]
+fDict = FoamDict(caseDir + './system/decomposeParDict')
 
-# write everything to the file
-with open(caseDir + './system/decomposeParDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('numberOfSubdomains',nCores)
 
-with open(caseDir + './system/decomposeParDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 #-----------------------------------------------------------------------
 # controlDict
 #-----------------------------------------------------------------------
@@ -443,24 +425,14 @@ with open(caseDir + './system/decomposeParDict', 'w') as file:
 #
 README.write('\n controlDict\n')
 
-idStr = ['startTime ','endTime ','writeInterval ']
-
-pVals = [repr(startTime),repr(endTime),repr(wrInt)]
+fDict = FoamDict(caseDir + './system/controlDict')
 
-# write everything to the file
-with open(caseDir + './system/controlDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('startTime',startTime)
+fDict.set('endTime',endTime)
+fDict.set('writeInterval',wrInt)
 
-with open(caseDir + './system/controlDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
     
 #-----------------------------------------------------------------------
 # fvSolution
@@ -470,53 +442,19 @@ with open(caseDir + './system/controlDict', 'w') as file:
 #
 README.write('\n fvSolution\n')
 
-# read the file
-with open(caseDir + './system/fvSolution', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
+fDict = FoamDict(caseDir + './system/fvSolution')
 
 # update information on number of cells in coarses level for multigrid
-idStr = ['nCellsInCoarsestLevel ']
-
-pVals = [repr(10*nCores)]
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + pVals[j] + ';\n'
-            
-idStr = [
-            'nOuterCorrectors    ',
-            'nCorrectors         ',
-            'nNonOrthogonalCorrectors ',
-        ]
-        
-pFlag = False
+for path in fDict.paths('nCellsInCoarsestLevel'):
+    fDict.set(path,10*nCores)
 
-pVals = [
-            repr(nOuterCorrectors),
-            repr(nCorrectors),
-            repr(nNonOrthoCorrectors),
-        ]
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        if data[i].find('PIMPLE') >-1:                                  #modify only the PIMPLE algorithm
-            pFlag = True
-        if pFlag:
-            fInd = data[i].find(idStr[j])
-            if fInd>-1:
-                data[i] = data[i][:fInd] + idStr[j] + pVals[j] + ';\n'
-            if data[i].find('}') == 0:
-                pFlag = False                                           #stop when you reach the end of its settings
-    pFlag = False                                                       #stop at the end of file
-            
 # update the PIMPLE algorithm settings
+fDict.set('PIMPLE/nOuterCorrectors',nOuterCorrectors)
+fDict.set('PIMPLE/nCorrectors',nCorrectors)
+fDict.set('PIMPLE/nNonOrthogonalCorrectors',nNonOrthoCorrectors)
 
-with open(caseDir + './system/fvSolution', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 
 print 'DONE=======================================\n\n'   
 #RUN SCRIPTS PREPARATION================================================
@@ -547,6 +485,33 @@ with open(caseDir + './Allrun-parallel', 'w') as file:
     file.writelines( data )
     README.writelines( data )                                           #write to readme
     
+#-----------------------------------------------------------------------
+# ./Allrun.pre (MESH CACHE)
+#-----------------------------------------------------------------------
+#
+if meshCache:
+    README.write('\n Allrun.pre - MESH CACHE\n')
+    
+    print 'mesh ' + meshKey + (' taken from' if meshDir else ' will be stored in') + ' the cache\n'
+    
+    idStr = ['MESHCACHE=','MESHHASH=']
+    
+    pVals = [os.path.abspath(meshCache),meshKey]                        #absolute path (of.sh moves the case)
+    
+    # write everything to the file
+    with open(caseDir + './Allrun.pre', 'r') as file:
+        # read a list of lines into data
+        data = file.readlines()
+        
+    for j in range(len(idStr)):
+        for i in range(len(data)):
+            if data[i].startswith(idStr[j]):
+                data[i] = idStr[j] + pVals[j] + '\n'
+    
+    with open(caseDir + './Allrun.pre', 'w') as file:
+        file.writelines( data )
+        README.writelines( data )                                       #write to readme
+    
 #-----------------------------------------------------------------------
 # ./Allrun.pre (ONLY IF THE CASE IS A CHILD)
 #-----------------------------------------------------------------------
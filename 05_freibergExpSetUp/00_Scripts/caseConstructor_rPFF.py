@@ -52,6 +52,8 @@ from scipy.optimize import fsolve                                       #NAE sol
 from dfluidData import dfluidData
 from fblockMeshGen_rPFF import fblockMeshGen                            #blockMeshDict generation
 from finletBCWriter_rPFF   import finletBCWriter                        #BC adjustment
+from ffoamDict import FoamDict                                          #parsed OpenFOAM dictionaries
+from fcaseMaterializer import materializeCase                           #caseDir from the baseCase (links)
 
 #########EDITABLE#######################################################
 
@@ -78,11 +80,6 @@ caseDir     = ('/media/martin/Data_3/05_PlateDCases/rPFF_' +
                 '_' + liqName + '/'
                 )
 
-if os.path.isdir(caseDir):                                              #ensure, that the caseDir is clear
-    sh.rmtree(caseDir)
-    
-sh.copytree(baseCase,caseDir)                                             #copy data to caseDir
-    
 #SPECIFY CURRENT SCRIPT VERSIONS========================================
 blockMeshGen        = 'fblockMeshGen_rPFF'
 inletBCWriter       = 'finletBCWriter_rPFF'
@@ -101,8 +98,29 @@ scNames = [ blockMeshGen,                                               #preProc
             rivuletPostProc2Blender,                                    #export paraview->blender
             blenderPrep,                                                #rivulet postprocessing (blender)
             ]                                   
-for scName in scNames:
-    sh.copyfile(scFolder + scName + '.py',caseDir + scName + '.py')     #copy current script version
+
+# -- files patched by this script (and by the called functions), these
+#    are really copied, the rest is linked to the baseCase and scFolder
+cpFiles = [ 'README',
+            '0.org/wallFilmRegion/Uf',                                  #finletBCWriter
+            '0.org/wallFilmRegion/deltaf',                              #finletBCWriter
+            'constant/additionalControls',
+            'constant/surfaceFilmProperties',
+            'constant/g',
+            'constant/polyMesh/blockMeshDict',                          #fblockMeshGen
+            'system/decomposeParDict',
+            'system/wallFilmRegion/decomposeParDict',
+            'system/controlDict',
+            'Allrun-parallel',
+            'of.sh',
+            rivuletPostProc + '.py',
+            rivuletPostProc2Blender + '.py',
+            blenderPrep + '.py',
+            ]
+
+nFiles = materializeCase(baseCase,caseDir,cpFiles,scFolder,scNames)     #ensures, that the caseDir is clear
+print 'caseDir files (reflinked, hard-linked, copied): %d, %d, %d\n'%(
+        nFiles['reflink'],nFiles['link'],nFiles['copy'])
     
 #CASE CONSTANTS AND CALCULATIONS========================================
 # input data------------------------------------------------------------
@@ -218,19 +236,13 @@ print 'ADJUSTING FILES IN ./CONSTANTS=============\n\n'
 #
 # changeable: solvePrimaryRegion false; // true;
 #
-with open(caseDir + './constant/additionalControls', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-idStr   = 'solvePrimaryRegion'
-isSolve = 'false'
+fDict   = FoamDict(caseDir + './constant/additionalControls')
 
-for i in range(len(data)):
-    if data[i].find(idStr)>-1:
-        data[i] = (idStr + '\t' + isSolve + ';\n\n')
+isSolve = False
 
-with open(caseDir + './constant/additionalControls', 'w') as file:
-    file.writelines( data )
+fDict.set('solvePrimaryRegion',isSolve)
+
+fDict.write()
 
 #-----------------------------------------------------------------------
 # surfaceFilmProperties
@@ -240,39 +252,31 @@ with open(caseDir + './constant/additionalControls', 'w') as file:
 #
 
 # general properties
-specieName = [liqName]                                                    #all as strings -> easier coding
-rho0       = [repr(rho)]                                                  #density, kg/m3
-mu0        = [repr(mu)]                                                   #viscosity, Pas
-sigma0     = [repr(sigma)]                                                #s. tension coef., N/m
+specieName = [liqName]                                                    #values for the entries in order of appearance
+rho0       = [rho]                                                        #density, kg/m3
+mu0        = [mu]                                                         #viscosity, Pas
+sigma0     = [sigma]                                                      #s. tension coef., N/m
 
 # three phase line
-deltaWet   = [repr(deltaWet)]
-beta       = [repr(theta0)]
-minValue   = [repr(thetaR),repr(lC/10)]
-maxValue   = [repr(thetaA),repr(5*lC)]
-expectation= [repr(theta0)]
-variance   = [repr(theta0/2)]
+deltaWet   = [deltaWet]
+beta       = [theta0]
+minValue   = [thetaR,lC/10]
+maxValue   = [thetaA,5*lC]
+expectation= [theta0]
+variance   = [theta0/2]
 
 idStr = ['specieName','rho0','mu0','sigma0','deltaWet','minValue',                 #v2.3.1
          'maxValue','expectation','variance']
          
 pVals = [specieName,rho0,mu0,sigma0,deltaWet,minValue,maxValue,expectation,variance]
 
-# write everything to the file
-with open(caseDir + './constant/surfaceFilmProperties', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-            
+fDict = FoamDict(caseDir + './constant/surfaceFilmProperties')
+
 for j in range(len(idStr)):
-    k = 0
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j][k] + ';\n'
-            k = k+1   
+    for path,pVal in zip(fDict.paths(idStr[j]),pVals[j]):               #k-th entry with the key gets k-th value
+        fDict.set(path,pVal)
 
-with open(caseDir + './constant/surfaceFilmProperties', 'w') as file:
-    file.writelines( data )
+fDict.write()
 
 #-----------------------------------------------------------------------
 # g
@@ -286,21 +290,11 @@ gx    = math.sin(alpha)*g
 gy    = 0.0
 gz    = -math.cos(alpha)*g
 
-idStr = 'value'
+fDict = FoamDict(caseDir + './constant/g')
 
-# write everything to the file
-with open(caseDir + './constant/g', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for i in range(len(data)):
-    fInd = data[i].find(idStr)
-    if fInd>-1:
-        data[i] = (data[i][:fInd] + idStr + '\t\t\t(' 
-        + repr(gx) + '\t' + repr(gy) + '\t' + repr(gz) + ');\n')
+fDict.set('value',(gx,gy,gz))
 
-with open(caseDir + './constant/g', 'w') as file:
-    file.writelines( data )
+fDict.write()
     
 print 'DONE=======================================\n\n'   
 #SYSTEM DIRECTORY FILES MODIFICATIONS===================================
@@ -354,37 +348,11 @@ print 'ADJUSTING FILES IN ./SYSTEM================\n\n'
 
 README.write('\n decomposeParDict\n')
 
-idStr = ['numberOfSubdomains ']
-
-pVals = [repr(nCores)]
-
-# write everything to the file
-with open(caseDir + './system/wallFilmRegion/decomposeParDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
-
-with open(caseDir + './system/decomposeParDict', 'w') as file:
-    file.writelines( data )
-    
-with open(caseDir + './system/decomposeParDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
-
-with open(caseDir + './system/wallFilmRegion/decomposeParDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+for dictName in ['./system/decomposeParDict','./system/wallFilmRegion/decomposeParDict']:
+    fDict = FoamDict(caseDir + dictName)
+    fDict.set('numberOfSubdomains',nCores)
+    fDict.write()
+    README.write(str(fDict))                                            #write to readme
     
 #-----------------------------------------------------------------------
 # controlDict
@@ -394,24 +362,14 @@ with open(caseDir + './system/wallFilmRegion/decomposeParDict', 'w') as file:
 #
 README.write('\n controlDict\n')
 
-idStr = ['startTime ','endTime ','writeInterval ']
-
-pVals = [repr(startTime),repr(endTime),repr(wrInt)]
+fDict = FoamDict(caseDir + './system/controlDict')
 
-# write everything to the file
-with open(caseDir + './system/controlDict', 'r') as file:
-    # read a list of lines into data
-    data = file.readlines()
-    
-for j in range(len(idStr)):
-    for i in range(len(data)):
-        fInd = data[i].find(idStr[j])
-        if fInd>-1:
-            data[i] = data[i][:fInd] + idStr[j] + '\t' + pVals[j] + ';\n'
+fDict.set('startTime',startTime)
+fDict.set('endTime',endTime)
+fDict.set('writeInterval',wrInt)
 
-with open(caseDir + './system/controlDict', 'w') as file:
-    file.writelines( data )
-    README.writelines( data )                                           #write to readme
+fDict.write()
+README.write(str(fDict))                                                #write to readme
 
 print 'DONE=======================================\n\n'   
 #RUN SCRIPTS PREPARATION================================================
@@ -5,7 +5,8 @@
 #~ creation for the case of rivulet spreading down an inclined plate
 #~ (interFoam used as a solver)
 #~ 
-#~ - 
+#~ - vertices, blocks and patch faces are assembled as numpy arrays
+#~   (labels of the vertex groups in one table) and written in bulk
 
 
 #LICENSE================================================================
@@ -41,8 +42,8 @@ def fblockMeshGen(caseDir,												#need to specify case directory
 
 	#IMPORT BLOCK=======================================================
 	import os
-	import copy
 	import math
+	import numpy as np
 	
 	#===================================================================
 	#							EDITABLE
@@ -101,192 +102,167 @@ def fblockMeshGen(caseDir,												#need to specify case directory
 	#							DO NOT EDIT
 	#===================================================================
 	
-	# define the central line on ground floor
-	tLGrF 				= (
-							[
-								[x0-tL,y0,z0],
-								[x0, y0, z0],
-								[x0+cL,y0,z0],
-							]
-						  )
-	# define the central line on basement and top floors
-	tLBsF 				= copy.deepcopy(tLGrF)							#initiate lists
-	tLTpF 				= copy.deepcopy(tLGrF) 							#DNK why deepcopy is needed but...
-	
-	for i in range(len(tLGrF)):
-		tLBsF[i][2]   	= tLBsF[i][2] - iH								#lower by inlet height
-		tLTpF[i][2]   	= tLTpF[i][2] + cH								#higher by cell height
-	
-	# put all the central line together
-	cLVerts 			= [[]]*3										#initiate the list
-	cLVerts[0]		 	= copy.deepcopy(tLBsF)							#each field is a list of its own
-	cLVerts[1] 			= copy.deepcopy(tLGrF)
-	cLVerts[2] 			= copy.deepcopy(tLTpF)
-	    
-	# create right sides of the geometry/dense block - move all by +-cW, +-dbW
-	rSVerts 			= copy.deepcopy(cLVerts)						#copy central line
-	lSVerts 			= copy.deepcopy(cLVerts)
-	rDBVerts 			= copy.deepcopy(cLVerts)
-	lDBVerts 			= copy.deepcopy(cLVerts)
-	for i in range(len(cLVerts)):
-		for j in range(len(cLVerts[i])):
-			rSVerts[i][j][1] 	= rSVerts[i][j][1] + cW
-			lSVerts[i][j][1] 	= lSVerts[i][j][1] - cW
-			rDBVerts[i][j][1] 	= rDBVerts[i][j][1] + dbW
-			lDBVerts[i][j][1] 	= lDBVerts[i][j][1] - dbW
-	
-	#~ # test the output
-	#~ print('Central line================')
-	#~ for value in cLVerts:
-	    #~ # Print each row's length and its elements.
-	    #~ print(value)
-	#~ print('Geom sides==================')   
-	#~ for value in rSVerts:
-	    #~ # Print each row's length and its elements.
-	    #~ print(value)
-	#~ print('----------------------------')
-	#~ for value in lSVerts:
-	    #~ # Print each row's length and its elements.
-	    #~ print(value)
-	#~ print('Dense block sides===========')   
-	#~ for value in rDBVerts:
-	    #~ # Print each row's length and its elements.
-	    #~ print(value)
-	#~ print('----------------------------')
-	#~ for value in lDBVerts:
-	    #~ # Print each row's length and its elements.
-	    #~ print(value)
-	    
-	# define matrix of vertices
-	vert 		= []													#initiate the list of vertices
-	
-	# convert the already done lists
-	# -- left side
-	for i in range(len(cLVerts)):
-		for j in range(len(cLVerts[i])):
-			vert.extend(lSVerts[i][j:j+1])
-			
-	# -- left side sparse-dense block interface
-	for k in [0,1]:
-		for i in range(len(cLVerts)):
-			for j in range(len(cLVerts[i])):
-				vert.extend(lDBVerts[i][j:j+1])	
-				
-	# -- centerline
-	for i in range(len(cLVerts)):
-		for j in range(len(cLVerts[i])):
-			vert.extend(cLVerts[i][j:j+1])
-			
-	# -- right side sparse-dense block interface
-	for k in [0,1]:														#each of these nodes is needed 2x
-		for i in range(len(cLVerts)):
-			for j in range(len(cLVerts[i])):
-				vert.extend(rDBVerts[i][j:j+1])
-	
-	# -- right side
-	for i in range(len(cLVerts)):
-		for j in range(len(cLVerts[i])):
-			vert.extend(rSVerts[i][j:j+1])
-			
-			
-	# -- left side inlet
-	vert.append([x0-tL,y0-iW,z0-iH])
-	vert.append([x0-tL,y0-iW,z0])
-	vert.append([x0-tL,y0-iW,z0+cH])
-				
-	# -- right side inlet
-	vert.append([x0-tL,y0+iW,z0-iH])
-	vert.append([x0-tL,y0+iW,z0])
-	vert.append([x0-tL,y0+iW,z0+cH])		
-			
-	# -- auxiliary vertices in the inlet area (left side)
-	# /needed to mitigate the extremely small cells
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0-iH
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0+cH
-				])	
-	# /I need two sets for patches merging/
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0-iH
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0+cH
-				])									
-	
-	
-	# -- auxiliary vertices in the inlet area (right side)
+	# define the y positions of the vertical groups of vertices, the
+	# dense-sparse block interfaces are needed 2x (patches merging)
+	yG              = np.array([-cW,-dbW,-dbW,0.0,dbW,dbW,cW]) + y0
+	# define the central line (x positions) and the floors (z positions)
+	xL              = np.array([x0-tL,x0,x0+cL])
+	zF              = np.array([z0-iH,z0,z0+cH])                        #basement, ground and top floors
+	
+	# define matrix of vertices - each group: for each floor, for each x
+	G,F,X           = np.meshgrid(range(len(yG)),range(len(zF)),range(len(xL)),indexing='ij')
+	vert            = np.column_stack((xL[X.ravel()],yG[G.ravel()],zF[F.ravel()]))
+	
+	# -- inlet sides (left, right)
+	yI              = np.array([y0-iW,y0+iW])
+	inVert          = np.column_stack((np.full(6,x0-tL),np.repeat(yI,3),np.tile(zF,2)))
+	
+	# -- auxiliary vertices in the inlet area (left, right)
 	# /needed to mitigate the extremely small cells
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0-iH
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0+cH
-				])
 	# /I need two sets for patches merging/
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0-iH
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0
-				])
-	vert.append([x0-nDiv*tL/nCellsXDS,
-				 y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS,
-				 z0+cH
-				])		
-	
+	xA              = x0-nDiv*tL/nCellsXDS
+	yA              = np.array([y0-math.sqrt(3)/3*nDiv*tL/nCellsXDS,
+								y0+math.sqrt(3)/3*nDiv*tL/nCellsXDS])
+	auxVert         = np.column_stack((np.full(12,xA),np.repeat(yA,6),np.tile(zF,4)))
 	
+	vert            = np.vstack((vert,inVert,auxVert))
 	
 	print('Vertices====================')
-	for value in vert:
-	    # Print each row's length and its elements.
-	    print(value)
-	
-	# create labels for the vertices
-	nGroups 	= 5+2													#number of vertical subgroups
-	labls		= []													#initiate the list of labels
-	k 			= 0
-	for i in range(nGroups):											#first nGroups are the same
-		labls.append(range(k,k+len(cLVerts)*len(cLVerts[0])))
-		k  		= k+len(cLVerts)*len(cLVerts[0])
-		
-	for i in range(2):
-		labls.append(range(k,k+3))
-		k 		= k+3
-		
-	for i in range(2):
-		labls.append(range(k,k+6))
-		k 		= k+6	
-		
+	for value in vert.tolist():
+		# Print each row's length and its elements.
+		print(value)
+	
+	# create labels for the vertices - table of the groups (rows), short
+	# groups are padded by -1
+	# -- groups 0-6: dense, sparse and central groups (9 vertices each)
+	# -- groups 7-8: inlet sides (3 vertices each)
+	# -- groups 9-10: auxiliary inlet vertices (6 vertices each)
+	nGroups         = len(yG)                                           #number of vertical subgroups
+	grLen           = [len(zF)*len(xL)]*nGroups + [3]*2 + [6]*2
+	labls           = -np.ones((len(grLen),max(grLen)),dtype=int)
+	k               = 0
+	for i in range(len(grLen)):
+		labls[i,:grLen[i]] = np.arange(k,k+grLen[i])
+		k           = k+grLen[i]
 	
 	print('Labels====================')
-	for value in labls:
-	    # Print each row's length and its elements.
-	    print(value)	
+	for i in range(len(grLen)):
+		print(labls[i,:grLen[i]].tolist())
+	
+	def quads(G,K):
+		# labels of the faces (hexahedra) from the groups G and the
+		# positions K of their vertices in the groups, G and K are
+		# broadcasted, the last axis goes over the vertices of one face
+		return labls[np.asarray(G),np.asarray(K)]
+	
+	def bulkFormat(template,rows):
+		# template formatted by each of the rows at once
+		rows = [tuple(row) for row in rows]
+		return (template*len(rows))%tuple(e for row in rows for e in row)
+	
+	# block vertices pattern - groups (i,i+1) and positions (j,j+1,j+3,j+4)
+	hexG            = np.array([0,0,1,1,0,0,1,1])
+	hexK            = np.array([0,1,1,0,3,4,4,3])
+	
+	#-------------------------------------------------------------------
+	# BLOCKS
+	#-------------------------------------------------------------------
+	# each block: comment, vertices, number of cells, grading
+	hexs,nCells,desc= [],[],[]
+	descList        = ['left','right','top','cell']
+	# -- sparse blocks
+	# --: those block are created in order: top left, cell left, top right, cell right
+	I,J             = np.array([0,0,5,5]),np.array([3,4,3,4])
+	hexs.append(quads(I[:,None] + hexG,J[:,None] + hexK))
+	nCells.extend([[nCellsXS[j-3],nCellsYS,nCellsZS] for j in J])
+	desc.extend(['// sparse ' + descList[i//5] + ' ' + descList[j-1] for i,j in zip(I,J)])
+	# -- dense blocks - cell
+	# --: those blocks are created from left to right
+	I,J             = np.array([2,3]),np.array([4,4])
+	hexs.append(quads(I[:,None] + hexG,J[:,None] + hexK))
+	nCells.extend([[nCellsXDL,nCellsYD,nCellsZD]]*2)
+	desc.extend(['// dense ' + descList[i-2] + ' ' + descList[j-1] for i,j in zip(I,J)])
+	# -- dense blocks - top
+	# --: those blocks are created from left to right
+	#	  these are little bit more tricky - there is a triangular inlet
+	hexs.append(quads([[2,2,3,7,2,2,3,7],[8,3,4,4,8,3,4,4]],
+					  [[3,4,4,1,6,7,7,2],[1,4,4,3,2,7,7,6]]))
+	nCells.extend([[nCellsXDS,nCellsYD,nCellsZD]]*2)
+	desc.extend(['// dense ' + descList[0] + ' ' + descList[2],'// dense ' + descList[1] + ' ' + descList[2]])
+	# -- inlet and over the inlet blocks
+	# -- first block (the top)
+	I               = np.array([0,1])
+	hexs.append(quads([7,9,10,8,7,9,10,8],I[:,None] + [0,0,0,0,1,1,1,1]))
+	nCells.extend([[nCellsXDS-nDiv,int(math.floor(nCellsXDS/2)),nCellsZT[i]] for i in I])
+	desc.extend(['']*2)
+	# -- last block (the tip)
+	hexs.append(quads([9,3,3,10,9,3,3,10],np.column_stack((3+I,1+3*I,1+3*I,3+I,4+I,4+3*I,4+3*I,4+I))))
+	nCells.extend([[nDiv,nDiv,nCellsZT[i]] for i in I])
+	desc.extend(['']*2)
+	
+	hexs            = np.vstack(hexs)
+	grading         = [[grSX,grSY,grSZ]]*len(hexs)
+	
+	#-------------------------------------------------------------------
+	# PATCHES
+	#-------------------------------------------------------------------
+	# -- note: boundaries are defined by right hand rule with thumb pointing outwards
+	# -- each patch: name, type, faces (n x 4 labels)
+	I4              = np.array([0,2,3,5])[:,None]                       #main plate
+	I2              = np.array([0,5])[:,None]                           #around the inlet sparse
+	gI              = np.array([[2],[4]])                               #around the inlet dense
+	gA              = np.array([[7],[8]])                               #corresponding inlet side
+	J               = np.array([[0],[1]])
+	patches         = []
+	# -- inlet
+	patches.append(['inlet','patch',quads([[7,9,10,8],[9,3,3,10]],[[0,0,0,0],[3,1,1,3]])])
+	# -- outlet
+	patches.append(['outlet','patch',quads(I4 + [0,1,1,0],[5,5,8,8])])
+	# -- plate
+	patches.append(['plate','wall',np.vstack((
+						quads(I4 + [0,1,1,0],[4,4,5,5]),
+						quads(I2 + [0,1,1,0],[3,3,4,4]),
+						quads(np.hstack((gI,gA,np.full((2,1),3),gI)),[3,1,4,4]),
+						))])
+	# -- walls
+	walls           = np.empty((3*2,4),dtype=int)                       #over the inlet, inlet parts sides (interleaved)
+	walls[0::3]     = quads([7,7,8,8],J + [0,1,1,0])                    #top walls (over the inlet)
+	walls[1::3]     = quads(np.hstack((7+J,9+J,9+J,7+J)),[0,0,1,1])     #inlet - top part sides
+	walls[2::3]     = quads(np.hstack((9+J,np.full((2,2),3),9+J)),[3,1,4,4])    #inlet - tip sides
+	patches.append(['walls','wall',np.vstack((
+						quads(I2 + [0,0,1,1],[3,6,6,3]),                #top inlet wall
+						walls,
+						quads(np.hstack((gI,gA,gA,gI)),[3,1,2,6]),      #over the inlet cell walls
+						quads(np.array([[0],[0],[6],[6]]),np.array([[0],[1],[0],[1]]) + [3,4,7,6]),    #side cell walls
+						))])
+	# -- atmosphere
+	patches.append(['atmosphere','patch',np.vstack((
+						quads(I4 + [0,0,1,1],[7,8,8,7]),                #main plate
+						quads(I2 + [0,1,1,0],[6,6,7,7]),                #around the inlet sparse
+						quads(np.hstack((gI,gA,np.full((2,1),3),gI)),[6,2,7,7]),    #around the inlet dense
+						quads([[7,9,10,8],[9,3,3,10]],[[2,2,2,2],[5,7,7,5]]),       #over the inlet
+						))])
+	# -- internal - to be merged - dense-sparse blocks
+	indLst          = [1,2,4,5]
+	k               = 0
+	for i in ['left','right']:
+		for j in ['Slave','Master']:
+			patches.append([i + j,'patch',quads(indLst[k],[[3,4,7,6],[4,5,8,7]])])
+			k       = k+1
+	# -- internal - to be merged - inlet parts
+	k               = 0
+	for i in ['Slave','Master']:
+		patches.append(['inlet' + i,'patch',quads([9,10,10,9],np.array([[0,0,1,1],[1,1,2,2]]) + k)])
+		k           = k+3
+	# -- internal - to be merged - over the inlet (hale mary)
+	overInlet       = np.empty((2*2,4),dtype=int)
+	overInlet[0::2] = quads(np.hstack((7+J,9+J,9+J,7+J)),[1,1,2,2])     #inlet - top part sides
+	overInlet[1::2] = quads(np.hstack((9+J,np.full((2,2),3),9+J)),[4,4,7,5])    #inlet - tip sides
+	patches.append(['overInletMaster','patch',overInlet])
+	patches.append(['overInletSlave','patch',quads(np.hstack((7+J,np.full((2,2),3),7+J)),[1,4,7,2])])
 	
 	#CREATE FILE AND WRITE THE DATA IN==================================
-	bMD = open(caseDir + './constant/polyMesh/blockMeshDict','w')		#open file for writing
+	bMD = open(caseDir + './constant/polyMesh/blockMeshDict','w')       #open file for writing
 	
 	#-------------------------------------------------------------------
 	# write the headline
@@ -311,180 +287,17 @@ def fblockMeshGen(caseDir,												#need to specify case directory
 	#-------------------------------------------------------------------
 	# write vertices
 	bMD.write('vertices \n( \n')
-	k = 0
-	for row in vert:
-		bMD.write('\t ( ' + ' '.join(str(e) for e in row) + ' )\t//' + repr(k) + '\n')
-		k = k+1
+	bMD.write(bulkFormat('\t ( %s %s %s )\t//%d\n',
+						 [row + [k] for k,row in enumerate(vert.tolist())]))
 	bMD.write('); \n\n')
 	
-	#-----------------------------------------------------------------------
+	#-------------------------------------------------------------------
 	# write blocks
 	bMD.write('blocks \n( \n')
-	# -- sparse blocks
-	# --: those block are created in order: top left, cell left, top right, cell right
-	descList = ['left','right','top','cell']
-	for i in [0,5]:
-		for j in [3,4]:
-			bMD.write('\t hex // sparse ' + descList[i/5] + ' ' + descList[j-1] + '\n')
-			bMD.write('\t \t ( ' 
-						+ 
-						' '.join(str(e) for e in labls[i][j:j+2]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i+1][j+1:j-1:-1]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i][j+3:j+5]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i+1][j+4:j+2:-1]) 
-						+ 
-						' ) \n'
-						)
-			bMD.write('\t \t ( ' + repr(nCellsXS[j-3]) + ' ' + repr(nCellsYS) + ' ' + repr(nCellsZS) + ' ) ')
-			bMD.write('\t simpleGrading ')
-			bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
-	# -- dense blocks - cell
-	# --: those blocks are created from left to right
-	for i in [2,3]:
-		for j in [4]:
-			bMD.write('\t hex // dense ' + descList[i-2] + ' ' + descList[j-1] + '\n')
-			bMD.write('\t \t ( ' 
-						+ 
-						' '.join(str(e) for e in labls[i][j:j+2]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i+1][j+1:j-1:-1]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i][j+3:j+5]) 
-						+ 
-						' '
-						+ 
-						' '.join(str(e) for e in labls[i+1][j+4:j+2:-1]) 
-						+ 
-						' ) \n'
-						)
-			bMD.write('\t \t ( ' + repr(nCellsXDL) + ' ' + repr(nCellsYD) + ' ' + repr(nCellsZD) + ' ) ')
-			bMD.write('\t simpleGrading ')
-			bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
-	# -- dense blocks - top
-	# --: those blocks are created from left to right
-	#	  these are little bit more tricky - there is a triangular inlet
-	bMD.write('\t hex // dense ' + descList[0] + ' ' + descList[2] + '\n')#left side
-	bMD.write('\t \t ( ' 
-				+ 
-				' '.join(str(e) for e in labls[2][3:5]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][4]) 
-				+ 
-				' '
-				+ 
-				repr(labls[7][1])
-				+ 
-				' '
-				+ 
-				' '.join(str(e) for e in labls[2][6:8]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][7]) 
-				+ 
-				' '
-				+ 
-				repr(labls[7][2])
-				+ 
-				' ) \n'
-				)
-	bMD.write('\t \t ( ' + repr(nCellsXDS) + ' ' + repr(nCellsYD) + ' ' + repr(nCellsZD) + ' ) ')
-	bMD.write('\t simpleGrading ')
-	bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
-	bMD.write('\t hex // dense ' + descList[1] + ' ' + descList[2] + '\n')#right side
-	bMD.write('\t \t ( ' 
-				+ 
-				repr(labls[8][1]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][4]) 
-				+ 
-				' '
-				+ 
-				' '.join(str(e) for e in labls[4][4:2:-1])
-				+ 
-				' '
-				+ 
-				repr(labls[8][2]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][7]) 
-				+ 
-				' '
-				+ 
-				' '.join(str(e) for e in labls[4][7:5:-1])
-				+ 
-				' ) \n'
-				)
-	bMD.write('\t \t ( ' + repr(nCellsXDS) + ' ' + repr(nCellsYD) + ' ' + repr(nCellsZD) + ' ) ')
-	bMD.write('\t simpleGrading ')
-	bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
-	# -- inlet and over the inlet blocks
-	# -- first block (the top)
-	for i in [0,1]:
-		bMD.write('\t hex \n')
-		bMD.write('\t \t ( ' 
-					+ 
-					repr(labls[7][0+i]) + ' ' + repr(labls[9][0+i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[10][0+i]) + ' ' + repr(labls[8][0+i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[7][1+i]) + ' ' + repr(labls[9][1+i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[10][1+i]) + ' ' + repr(labls[8][1+i]) 
-					+ 
-					' ) \n'
-					)
-		bMD.write('\t \t ( ' + repr(nCellsXDS-nDiv) + ' ' + repr(int(math.floor(nCellsXDS/2))) + ' ' + repr(nCellsZT[i]) + ' ) ')
-		bMD.write('\t simpleGrading ')
-		bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
-	# -- last block (the tip)
-	for i in [0,1]:
-		bMD.write('\t hex \n')
-		bMD.write('\t \t ( ' 
-					+ 
-					repr(labls[-2][-3+i]) + ' ' + repr(labls[3][1+3*i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][1+3*i]) + ' ' + repr(labls[-1][-3+i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-2][-2+i]) + ' ' + repr(labls[3][4+3*i]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][4+3*i]) + ' ' + repr(labls[-1][-2+i]) 
-					+ 
-					' ) \n'
-					)
-		bMD.write('\t \t ( ' + repr(nDiv) + ' ' + repr(nDiv) + ' ' + repr(nCellsZT[i]) + ' ) ')
-		bMD.write('\t simpleGrading ')
-		bMD.write('\t ( ' + repr(grSX) + ' ' + repr(grSY) + ' ' + repr(grSZ) + ' ) \n')
+	bMD.write(bulkFormat('\t hex %s\n\t \t ( %d %d %d %d %d %d %d %d ) \n'
+						 '\t \t ( %d %d %d ) \t simpleGrading \t ( %r %r %r ) \n',
+						 [[desc[k]] + hexs[k].tolist() + list(nCells[k]) + list(grading[k])
+							for k in range(len(hexs))]))
 	bMD.write('); \n\n')
 	
 	#-------------------------------------------------------------------
@@ -494,357 +307,13 @@ def fblockMeshGen(caseDir,												#need to specify case directory
 	
 	#-------------------------------------------------------------------
 	# write boundary
-	# -- note: boundaries are defined by right hand rule with thumb pointing outwards
 	bMD.write('boundary \n( \n')
-	# -- inlet
-	bMD.write('\tinlet \n\t{ \n')
-	bMD.write('\ttype patch; \n')
-	bMD.write('\tfaces \n \t(\n')
-	bMD.write('\t( ' 
-				+ 
-				repr(labls[7][0]) + ' ' + repr(labls[9][0]) 
-				+ 
-				' '
-				+ 
-				repr(labls[10][0]) + ' ' + repr(labls[8][0]) 
-				+ 
-				' ) \n'
-				)
-	bMD.write('\t( ' 
-				+ 
-				repr(labls[-2][-3]) + ' ' + repr(labls[3][1]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][1]) + ' ' + repr(labls[-1][-3]) 
-				+ 
-				' ) \n'
-				)
-	bMD.write('\t);\n\t} \n\n')	
-	# -- outlet
-	bMD.write('\toutlet \n\t{ \n')
-	bMD.write('\ttype patch; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for i in [0,2,3,5]:
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][5]) + ' ' + repr(labls[i+1][5]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][8]) + ' ' + repr(labls[i][8]) 
-					+ 
-					' ) \n'
-					)
-	bMD.write('\t);\n\t} \n\n')
-	# -- plate
-	bMD.write('\tplate \n\t{ \n')
-	bMD.write('\ttype wall; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for i in [0,2,3,5]:
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][4]) + ' ' + repr(labls[i+1][4]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][5]) + ' ' + repr(labls[i][5]) 
-					+ 
-					' ) \n'
-					)
-	for i in [0,5]:														#around the inlet sparse
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][3]) + ' ' + repr(labls[i+1][3]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][4]) + ' ' + repr(labls[i][4]) 
-					+ 
-					' ) \n'
-					)
-	for i in [2,4]:
-		bMD.write('\t( ' 												#around the inlet dense
-					+ 
-					repr(labls[i][3]) + ' ' + repr(labls[-(2+4/i)][1]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][4]) + ' ' + repr(labls[i][4]) 
-					+ 
-					' ) \n'
-					)
-	bMD.write('\t);\n\t} \n\n')
-	# -- walls
-	bMD.write('\twalls \n\t{ \n')
-	bMD.write('\ttype wall; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for i in [0,5]:														#top inlet wall
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][3]) + ' ' + repr(labls[i][6]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][6]) + ' ' + repr(labls[i+1][3]) 
-					+ 
-					' ) \n'
-					)
-	k 	= None															#this is not the most neat trick	
-	for i in [0,1]:  													#top walls (over the inlet)
-		bMD.write('\t( '
-					+ 
-					' '.join(str(e) for e in labls[7][i:2+i]) 
-					+ 
-					' '
-					+ 
-					' '.join(str(e) for e in labls[8][1+i:k:-1]) 
-					+ 
-					' ) \n'
-					)
-		k = 0
-		bMD.write('\t( ' 												#inlet - top part sides
-					+ 
-					repr(labls[-(4-i)][0]) + ' ' + repr(labls[-(2-i)][0]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-(2-i)][1]) + ' ' + repr(labls[-(4-i)][1]) 
-					+ 
-					' ) \n'
-					)
-		bMD.write('\t( ' 												#inlet - tip sides
-					+ 
-					repr(labls[-(2-i)][-3]) + ' ' + repr(labls[3][1]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][4]) + ' ' + repr(labls[-(2-i)][-2]) 
-					+ 
-					' ) \n'
-					)
-	for i in [0,2]:
-		bMD.write('\t( ' 												#over the inlet cell walls
-					+ 
-					repr(labls[2+i][3]) + ' ' + repr(labls[-4+i/2][1]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-4+i/2][2]) + ' ' + repr(labls[2+i][6]) 
-					+ 
-					' ) \n'
-					)
-	for i in [0,6]:														#side cell walls
-		for j in [0,1]:
-			bMD.write('\t( ' 
-						+ 
-						repr(labls[i][3+j]) + ' ' + repr(labls[i][4+j]) 
-						+ 
-						' '
-						+ 
-						repr(labls[i][7+j]) + ' ' + repr(labls[i][6+j]) 
-						+ 
-						' ) \n'
-						)
-	bMD.write('\t);\n\t} \n\n')
-	# -- atmosphere
-	bMD.write('\tatmosphere \n\t{ \n')
-	bMD.write('\ttype patch; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for i in [0,2,3,5]:													#main plate
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][7]) + ' ' + repr(labls[i][8]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][8]) + ' ' + repr(labls[i+1][7]) 
-					+ 
-					' ) \n'
-					)
-	for i in [0,5]:														#around the inlet sparse
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[i][6]) + ' ' + repr(labls[i+1][6]) 
-					+ 
-					' '
-					+ 
-					repr(labls[i+1][7]) + ' ' + repr(labls[i][7]) 
-					+ 
-					' ) \n'
-					)
-	for i in [2,4]:
-		bMD.write('\t( ' 												#around the inlet dense
-					+ 
-					repr(labls[i][6]) + ' ' + repr(labls[-(2+4/i)][2]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][7]) + ' ' + repr(labls[i][7]) 
-					+ 
-					' ) \n'
-					)	
-	bMD.write('\t( '  													#over the inlet
-				+ 
-				repr(labls[7][2]) + ' ' + repr(labls[9][2]) 
-				+ 
-				' '
-				+ 
-				repr(labls[10][2]) + ' ' + repr(labls[8][2]) 
-				+ 
-				' ) \n'
-				)
-	bMD.write('\t( ' 
-				+ 
-				repr(labls[-2][-1]) + ' ' + repr(labls[3][7]) 
-				+ 
-				' '
-				+ 
-				repr(labls[3][7]) + ' ' + repr(labls[-1][-1]) 
-				+ 
-				' ) \n'
-				)							
-	bMD.write('\t);\n\t} \n\n')
-	# -- internal - to be merged - dense-sparse blocks
-	k = 0
-	indLst = [1,2,4,5]
-	for i in ['left','right']:
-		for j in ['Slave','Master']:
-			bMD.write('\t' + i + j + ' \n\t{ \n')
-			bMD.write('\ttype patch; \n')
-			bMD.write('\tfaces \n \t(\n')
-			bMD.write('\t( ' 
-						+ 
-						repr(labls[indLst[k]][3]) + ' ' + repr(labls[indLst[k]][4]) 
-						+ 
-						' '
-						+ 
-						repr(labls[indLst[k]][7]) + ' ' + repr(labls[indLst[k]][6]) 
-						+ 
-						' ) \n'
-						)
-			bMD.write('\t( ' 
-						+ 
-						repr(labls[indLst[k]][4]) + ' ' + repr(labls[indLst[k]][5]) 
-						+ 
-						' '
-						+ 
-						repr(labls[indLst[k]][8]) + ' ' + repr(labls[indLst[k]][7]) 
-						+ 
-						' ) \n'
-						)
-			bMD.write('\t);\n\t} \n\n')	
-			k = k+1
-	# -- internal - to be merged - inlet parts
-	k = 0
-	for i in ['Slave','Master']:
-		bMD.write('\tinlet' + i + ' \n\t{ \n')
-		bMD.write('\ttype patch; \n')
+	for name,tp,faces in patches:
+		bMD.write('\t' + name + ' \n\t{ \n')
+		bMD.write('\ttype ' + tp + '; \n')
 		bMD.write('\tfaces \n \t(\n')
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[-2][0+k]) + ' ' + repr(labls[-1][0+k]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-1][1+k]) + ' ' + repr(labls[-2][1+k]) 
-					+ 
-					' ) \n'
-					)
-		bMD.write('\t( ' 
-					+ 
-					repr(labls[-2][1+k]) + ' ' + repr(labls[-1][1+k]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-1][2+k]) + ' ' + repr(labls[-2][2+k]) 
-					+ 
-					' ) \n'
-					)
+		bMD.write(bulkFormat('\t( %d %d %d %d ) \n',faces.tolist()))
 		bMD.write('\t);\n\t} \n\n')
-		k = k+3
-	# -- internal - to be merged - over the inlet (hale mary)
-	#~ descList = ['LeftMaster','RightMaster','LeftSlave','RightSlave']
-	#~ for i in [0,1]:
-		#~ bMD.write('\toverInlet' + descList[i] + ' \n\t{ \n')
-		#~ bMD.write('\ttype patch; \n')
-		#~ bMD.write('\tfaces \n \t(\n')
-		#~ bMD.write('\t( ' 												#inlet - top part sides
-					#~ + 
-					#~ repr(labls[-(4-i)][1]) + ' ' + repr(labls[-(2-i)][1]) 
-					#~ + 
-					#~ ' '
-					#~ + 
-					#~ repr(labls[-(2-i)][2]) + ' ' + repr(labls[-(4-i)][2]) 
-					#~ + 
-					#~ ' ) \n'
-					#~ )
-		#~ bMD.write('\t( ' 												#inlet - tip sides
-					#~ + 
-					#~ repr(labls[-(2-i)][-2]) + ' ' + repr(labls[3][4]) 
-					#~ + 
-					#~ ' '
-					#~ + 
-					#~ repr(labls[3][7]) + ' ' + repr(labls[-(2-i)][-1]) 
-					#~ + 
-					#~ ' ) \n'
-					#~ )
-		#~ bMD.write('\t);\n\t} \n\n')
-		#~ bMD.write('\toverInlet' + descList[i+2] + ' \n\t{ \n')
-		#~ bMD.write('\ttype patch; \n')
-		#~ bMD.write('\tfaces \n \t(\n')
-		#~ bMD.write('\t( ' 												#inlet - top part sides
-					#~ + 
-					#~ repr(labls[-(4-i)][1]) + ' ' + repr(labls[3][4]) 
-					#~ + 
-					#~ ' '
-					#~ + 
-					#~ repr(labls[3][7]) + ' ' + repr(labls[-(4-i)][2]) 
-					#~ + 
-					#~ ' ) \n'
-					#~ )
-		#~ bMD.write('\t);\n\t} \n\n')
-	descList = ['Master','Slave']
-	bMD.write('\toverInlet' + descList[0] + ' \n\t{ \n')
-	bMD.write('\ttype patch; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for j in [0,1]:
-		bMD.write('\t( ' 												#inlet - top part sides
-					+ 
-					repr(labls[-(4-j)][1]) + ' ' + repr(labls[-(2-j)][1]) 
-					+ 
-					' '
-					+ 
-					repr(labls[-(2-j)][2]) + ' ' + repr(labls[-(4-j)][2]) 
-					+ 
-					' ) \n'
-					)
-		bMD.write('\t( ' 												#inlet - tip sides
-					+ 
-					repr(labls[-(2-j)][-2]) + ' ' + repr(labls[3][4]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][7]) + ' ' + repr(labls[-(2-j)][-1]) 
-					+ 
-					' ) \n'
-					)
-	bMD.write('\t);\n\t} \n\n')
-	bMD.write('\toverInlet' + descList[1] + ' \n\t{ \n')
-	bMD.write('\ttype patch; \n')
-	bMD.write('\tfaces \n \t(\n')
-	for j in [0,1]:
-		bMD.write('\t( ' 												#inlet - top part sides
-					+ 
-					repr(labls[-(4-j)][1]) + ' ' + repr(labls[3][4]) 
-					+ 
-					' '
-					+ 
-					repr(labls[3][7]) + ' ' + repr(labls[-(4-j)][2]) 
-					+ 
-					' ) \n'
-					)
-	bMD.write('\t);\n\t} \n\n')	
 	bMD.write('); \n\n')
 	
 	#-------------------------------------------------------------------
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Vectorized isosurfaces and slices of the OpenFOAM polyMesh (numpy
+#~ only, no ParaView/VTK)
+#~
+#~ NOTES:
+#~  - the cells are decomposed to tetrahedra (fan triangulation of the
+#~    cell faces from the 1st face point + the cell centre), only the
+#~    faces with the scalar range containing the iso value are
+#~    decomposed (the tetrahedra of the interface cells)
+#~  - the cell values are interpolated to the mesh points as the
+#~    average of the cells sharing the point (as the cell to point
+#~    interpolation of ParaView)
+#~  - marchSimplices is the marching tetrahedra/triangles/segments
+#~    algorithm, i.e. the isosurface of the tetrahedra (triangles), the
+#~    isoline of the triangles (segments) and the intersection of the
+#~    segments (points), the vertex with scal >= iso is above the
+#~    isosurface
+#~  - the planar slices are isosurfaces of the coordinate
+#~  - the orientation of the output triangles is not consistent (the
+#~    normals are given up to the sign)
+#~
+#~ USAGE:
+#~     tris  = isoSurface(mesh,centres,pointValues(mesh,alpha),alpha,0.5)[0]
+#~     segs  = marchSimplices(tris,tris[...,2],3e-5)[0]                 #slice at z = 3e-5 m
+
+#LICENSE================================================================
+#  fisoSurface.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import numpy as np
+
+#CONSTANTS==============================================================
+# -- cut simplices (vertices sorted, above iso first), number of the
+#    vertices above iso and the output simplices as lists of the cut
+#    edges
+cutTable = {
+    2 : [(1,[[(0,1)]])],                                                #segment -> point
+    3 : [(1,[[(0,1),(0,2)]]),                                           #triangle -> segment
+         (2,[[(2,0),(2,1)]])],
+    4 : [(1,[[(0,1),(0,2),(0,3)]]),                                     #tetrahedron -> triangle(s)
+         (3,[[(3,0),(3,1),(3,2)]]),
+         (2,[[(0,2),(0,3),(1,3)],[(0,2),(1,3),(1,2)]])],
+}
+
+#MESH===================================================================
+def pointValues(mesh,cellVals):
+    """ cell values interpolated to the mesh points (average of the
+        cells sharing the point)"""
+    offsets,labels  = mesh['offsets'],mesh['labels']
+    owner,neighbour = mesh['owner'],mesh['neighbour']
+    nPoints,nInt    = mesh['nPoints'],len(neighbour)
+    sizes   = np.diff(offsets)
+    labsInt = labels[:offsets[nInt]]                                    #points of the internal faces
+    cOwn    = cellVals[np.repeat(owner,sizes)]                          #owner value for each face point
+    cNei    = cellVals[np.repeat(neighbour,sizes[:nInt])]
+    sums    = np.bincount(labels,cOwn,nPoints) + np.bincount(labsInt,cNei,nPoints)
+    counts  = np.bincount(labels,minlength=nPoints) + np.bincount(labsInt,minlength=nPoints)
+    return sums/np.maximum(counts,1)
+
+def cutFaces(mesh,pScal,cScal,iso):
+    """ faces with the (point and cell) scalar range containing iso"""
+    offsets,labels  = mesh['offsets'],mesh['labels']
+    owner,neighbour = mesh['owner'],mesh['neighbour']
+    nInt    = len(neighbour)
+    fMin    = np.minimum(np.minimum.reduceat(pScal[labels],offsets[:-1]),cScal[owner])
+    fMax    = np.maximum(np.maximum.reduceat(pScal[labels],offsets[:-1]),cScal[owner])
+    fMin[:nInt] = np.minimum(fMin[:nInt],cScal[neighbour])
+    fMax[:nInt] = np.maximum(fMax[:nInt],cScal[neighbour])
+    return np.nonzero((fMin < iso)&(fMax >= iso))[0]
+
+def faceTets(mesh,faces):
+    """ tetrahedra of the faces, (nTets x 3) face triangles (point
+        labels) and (nTets) cells (the apex is the cell centre)"""
+    offsets,labels  = mesh['offsets'],mesh['labels']
+    nTri    = np.diff(offsets)[faces] - 2                               #fan triangulation
+    fTri    = np.repeat(faces,nTri)
+    k       = np.arange(nTri.sum()) - np.repeat(np.cumsum(nTri) - nTri,nTri) + 1
+    start   = offsets[fTri]
+    tri     = np.column_stack((labels[start],labels[start+k],labels[start+k+1]))
+    isInt   = fTri < len(mesh['neighbour'])                             #internal faces have 2 tetrahedra
+    cells   = np.concatenate((mesh['owner'][fTri],mesh['neighbour'][fTri[isInt]]))
+    return np.concatenate((tri,tri[isInt])),cells
+
+def isoSurface(mesh,centres,pScal,cScal,iso,pVals=None,cVals=None):
+    """ triangles (nTris x 3 x 3) of the isosurface scal = iso and the
+        values interpolated to their vertices (nTris x 3 [x k])"""
+    tri,cells = faceTets(mesh,cutFaces(mesh,pScal,cScal,iso))
+    pts     = np.concatenate((mesh['points'][tri],centres[cells][:,None]),axis=1)
+    scal    = np.column_stack((pScal[tri],cScal[cells]))
+    vals    = None
+    if pVals is not None:
+        vals = np.concatenate((pVals[tri],cVals[cells][:,None]),axis=1)
+    return marchSimplices(pts,scal,iso,vals)[0:2]
+
+#MARCHING SIMPLICES=====================================================
+def marchSimplices(pts,scal,iso,vals=None):
+    """ intersection of the simplices (nS x n x 3, n = 2,3,4) with the
+        isosurface scal = iso (iso scalar or one value per simplex),
+        returns the simplices (nOut x n-1 x 3), the interpolated vals
+        and the index of the source simplex"""
+    n       = pts.shape[1]
+    iso     = np.zeros(len(pts)) + iso
+    above   = scal >= iso[:,None]
+    nAbove  = above.sum(axis=1)
+    cut     = np.nonzero((nAbove > 0)&(nAbove < n))[0]
+    order   = np.argsort(~above[cut],axis=1,kind='mergesort')          #above vertices first
+    P,S,nA  = pts[cut[:,None],order],scal[cut[:,None],order],nAbove[cut]
+    V       = vals[cut[:,None],order] if vals is not None else None
+    iso     = iso[cut]
+
+    outP,outV,outI = [],[],[]
+    for nAb,simplices in cutTable[n]:
+        sel = np.nonzero(nA == nAb)[0]
+        for edges in simplices:
+            eP,eV = [],[]
+            for i,j in edges:
+                t   = (iso[sel] - S[sel,i])/(S[sel,j] - S[sel,i])
+                eP.append(P[sel,i] + t[:,None]*(P[sel,j] - P[sel,i]))
+                if V is not None:
+                    tV = t.reshape((-1,) + (1,)*(V.ndim - 2))
+                    eV.append(V[sel,i] + tV*(V[sel,j] - V[sel,i]))
+            outP.append(np.stack(eP,axis=1))
+            outV.append(np.stack(eV,axis=1) if V is not None else None)
+            outI.append(cut[sel])
+    outP = np.concatenate(outP) if outP else np.zeros((0,n-1,3))
+    outV = np.concatenate(outV) if V is not None and outV else None
+    outI = np.concatenate(outI) if outI else np.zeros(0,dtype=int)
+    return outP,outV,outI
+
+def stationCuts(simp,axis,dx,vals=None):
+    """ intersections of the simplices with the planes coord = k*dx
+        (stations), returns the simplices, the interpolated vals and the
+        station numbers k (the coordinates closer than 1e-6*dx to the
+        station are snapped to it)"""
+    u       = simp[...,axis]/dx
+    uR      = np.rint(u)
+    u       = np.where(np.abs(u - uR) < 1e-6,uR,u)
+    k0      = np.floor(u.min(axis=1)).astype(int) + 1                   #min(u) < k <= max(u)
+    nK      = np.maximum(np.floor(u.max(axis=1)).astype(int) - k0 + 1,0)
+    idx     = np.repeat(np.arange(len(u)),nK)
+    k       = np.arange(nK.sum()) - np.repeat(np.cumsum(nK) - nK,nK) + k0[idx]
+    outP,outV,src = marchSimplices(simp[idx],u[idx],k,vals[idx] if vals is not None else None)
+    return outP,outV,k[src]
+
+#AREAS==================================================================
+def triNormals(tris):
+    """ (not normalized) normals of the triangles, |n| = 2*area"""
+    return np.cross(tris[:,1] - tris[:,0],tris[:,2] - tris[:,0])
+
+def triAreas(tris):
+    return 0.5*np.sqrt((triNormals(tris)**2).sum(axis=1))
+
+def clipArea(tris,vals,iso):
+    """ area of the parts of the triangles with the (linear) vals >= iso"""
+    areas   = triAreas(tris)
+    above   = vals >= iso
+    nAbove  = above.sum(axis=1)
+    frac    = (nAbove == 3).astype(float)
+    order   = np.argsort(~above,axis=1,kind='mergesort')                #above vertices first
+    v       = vals[np.arange(len(vals))[:,None],order]
+    # -- one vertex above, triangle at the vertex
+    sel     = nAbove == 1
+    frac[sel] = (v[sel,0] - iso)**2/((v[sel,0] - v[sel,1])*(v[sel,0] - v[sel,2]))
+    # -- two vertices above, all but the triangle at the vertex below
+    sel     = nAbove == 2
+    frac[sel] = 1.0 - (iso - v[sel,2])**2/((v[sel,0] - v[sel,2])*(v[sel,1] - v[sel,2]))
+    return (frac*areas).sum()
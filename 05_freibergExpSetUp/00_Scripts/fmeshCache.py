@@ -0,0 +1,104 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Content-addressed cache of the generated meshes
+#~
+#~ The mesh of the case is fully determined by the mesh dictionaries
+#~ (blockMeshDict, snappyHexMeshDict, createPatchDict) and by the mesh
+#~ utilities called in Allrun.pre. The hash of these is the key of the
+#~ mesh in the cache folder (meshCache/<key>/ contains the polyMesh
+#~ files)
+#~
+#~ The cache itself is used by Allrun.pre (MESHCACHE and MESHHASH
+#~ variables filled by the case constructor):
+#~  - cache hit  ... the polyMesh files are copied into the case
+#~                   (cp --reflink=auto), the mesh utilities are not run
+#~  - cache miss ... the mesh is generated and stored in the cache (the
+#~                   first finished case of the given mesh wins)
+#~
+#~ NOTES:
+#~  - the cases of a sweep which differ only in the flow parameters
+#~    (e.g. the liquid properties, the inclination angle) share the mesh
+#~  - the cache folder must be visible from the machine where Allrun.pre
+#~    runs (absolute path, shared file system)
+#~  - the cached polyMesh files are read-only, the case gets its own
+#~    writable copy (the cache is not modified by the utilities run
+#~    with -overwrite in the case)
+#~  - the cache can be deleted any time (the meshes are regenerated)
+#~
+#~ USAGE:
+#~     key = meshHash(caseDir)
+#~     print cachedMesh(meshCache,key)
+
+#LICENSE================================================================
+#  fmeshCache.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import hashlib
+
+#CONSTANTS==============================================================
+meshDicts = [                                                           #dictionaries defining the mesh
+                'constant/polyMesh/blockMeshDict',
+                'system/blockMeshDict',
+                'system/snappyHexMeshDict',
+                'system/createPatchDict',
+                'system/extrudeMeshDict',
+                'system/topoSetDict',
+            ]
+
+meshApps  = [                                                           #utilities generating the mesh
+                'blockMesh','snappyHexMesh','stitchMesh','createPatch',
+                'extrudeMesh','mirrorMesh','refineMesh','topoSet',
+                'transformPoints','surfaceFeatureExtract',
+            ]
+
+#FUNCTIONS==============================================================
+def meshCommands(caseDir,script='Allrun.pre'):
+    """ lines of the script calling the mesh utilities"""
+    if not os.path.isfile(os.path.join(caseDir,script)):
+        return []
+    cmds = []
+    with open(os.path.join(caseDir,script),'r') as file:
+        for line in file:
+            words = line.split()
+            if words and words[0] == 'runApplication':
+                words = words[1:]
+            if words and words[0] in meshApps:
+                cmds.append(' '.join(words))
+    return cmds
+
+def meshHash(caseDir,dictNames=meshDicts,script='Allrun.pre'):
+    """ key of the mesh - hash of the mesh dictionaries and commands"""
+    sha = hashlib.sha1()
+    for name in dictNames:
+        fileName = os.path.join(caseDir,name)
+        if os.path.isfile(fileName):
+            with open(fileName,'rb') as file:
+                sha.update(name.encode() + b'\0' + file.read() + b'\0')
+    for cmd in meshCommands(caseDir,script):
+        sha.update(cmd.encode() + b'\n')
+    return sha.hexdigest()[:16]
+
+def cachedMesh(cacheDir,key):
+    """ is the mesh with the given key already in the cache"""
+    return os.path.isdir(os.path.join(cacheDir,key))
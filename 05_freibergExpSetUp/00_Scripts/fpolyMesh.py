@@ -0,0 +1,218 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Reading of the OpenFOAM polyMesh (points, faces, owner, neighbour)
+#~ and of the internal fields of the time directories into numpy arrays
+#~ and writing of the nonuniform fields
+#~
+#~ NOTES:
+#~  - ascii and binary formats are supported (faceList and
+#~    faceCompactList), compressed files (.gz) are read as well
+#~  - the uncompressed field files are memory-mapped, the binary lists
+#~    are numpy views of the mapped file (no copy, read on demand)
+#~  - the binary label and scalar sizes are taken from the arch entry
+#~    of the header (default label=32, scalar=64)
+#~  - cell centres are approximated by the average of the centres of
+#~    the cell faces (exact for parallelepipeds, i.e. the blockMesh
+#~    hexahedra)
+#~
+#~ USAGE:
+#~     C = cellCentres(caseDir + 'constant/polyMesh')                   #nCells x 3
+#~     mesh  = readMesh(caseDir + 'constant/polyMesh')
+#~     alpha = readInternalField(caseDir + '0.5/alpha.liquid',mesh['nCells'])
+#~     writeInternalField(caseDir + '0.org/alpha.liquid',alpha)
+
+#LICENSE================================================================
+#  fpolyMesh.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import re
+import gzip
+import mmap
+import numpy as np
+
+#IMPORT BLOCK-CUSTOM====================================================
+from ffoamDict import FoamDict
+
+#READING================================================================
+headRe  = re.compile(br'FoamFile\s*\{(.*?)\}',re.DOTALL)
+entryRe = re.compile(br'(\w+)\s+("[^"]*"|[^;]*);')                      #key value; (quoted value may contain ;)
+commRe  = re.compile(br'//[^\n]*|/\*.*?\*/',re.DOTALL)
+skipRe  = re.compile(br'(\s+|//[^\n]*|/\*.*?\*/)*',re.DOTALL)           #whitespace and comments
+sizeRe  = re.compile(br'(\d+)\s*\(')                                    #N(
+endVRe  = re.compile(br'\)\s*\)')                                       #end of the list of vectors
+fieldRe = re.compile(br'internalField\s+(uniform|nonuniform\s+List<\w+>)\s*')
+unifRe  = re.compile(br'\(?([^;()]*)\)?\s*;')                            #uniform value (scalar or vector)
+
+def readRaw(fileName):
+    """ content of the (possibly compressed) file as bytes"""
+    if not os.path.isfile(fileName) and os.path.isfile(fileName + '.gz'):
+        fileName = fileName + '.gz'
+    opener = gzip.open if fileName.endswith('.gz') else open
+    with opener(fileName,'rb') as file:
+        return file.read()
+
+def mapRaw(fileName):
+    """ the file memory-mapped (read-only), compressed files are read
+        to the memory"""
+    if not os.path.isfile(fileName) or os.path.getsize(fileName) == 0:
+        return readRaw(fileName)
+    with open(fileName,'rb') as file:
+        return mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ)
+
+def readHeader(raw):
+    """ header entries and the position of the data"""
+    match  = headRe.search(raw)
+    header = {}
+    for key,val in entryRe.findall(match.group(1)):
+        header[key.decode()] = val.strip().strip(b'"').decode()
+    header['label']  = 32
+    header['scalar'] = 64
+    for item in header.get('arch','').split(';'):
+        if '=' in item:
+            key,val = item.split('=')
+            header[key] = int(val)
+    return header,match.end()
+
+def readList(raw,pos,header,nComp=1,dtype='label'):
+    """ list starting at pos (N followed by the values in brackets),
+        returns the array and the position behind the list"""
+    pos   = skipRe.match(raw,pos).end()
+    match = sizeRe.match(raw,pos)
+    N     = int(match.group(1))
+    pos   = match.end()
+    if header.get('format','ascii') == 'binary':
+        size = header[dtype]//8
+        npTp = ('<i%d' if dtype == 'label' else '<f%d')%size
+        data = np.frombuffer(raw,npTp,N*nComp,pos)                      #view, no copy
+        pos  = pos + N*nComp*size
+    else:
+        if nComp == 1 or N == 0:
+            end = raw.find(b')',pos)
+        else:
+            end = endVRe.search(raw,pos).start() + 1
+        text = raw[pos:end].replace(b'(',b' ').replace(b')',b' ')
+        data = np.array(text.split(),dtype=int if dtype == 'label' else float)
+        pos  = end
+    pos = raw.find(b')',pos) + 1
+    return data.reshape(N,nComp) if nComp > 1 else data,pos
+
+def readField(fileName,nComp=1,dtype='label'):
+    """ list stored in the mesh file (points, owner, neighbour)"""
+    raw        = readRaw(fileName)
+    header,pos = readHeader(raw)
+    return readList(raw,pos,header,nComp,dtype)[0]
+
+def readFaces(fileName):
+    """ faces as (offsets,labels), i-th face is labels[offsets[i]:offsets[i+1]]"""
+    raw        = readRaw(fileName)
+    header,pos = readHeader(raw)
+    if header.get('class') == 'faceCompactList':
+        offsets,pos = readList(raw,pos,header)
+        labels,pos  = readList(raw,pos,header)
+        return offsets,labels
+    raw    = commRe.sub(b'',raw[pos:])
+    start  = raw.index(b'(')
+    faces  = re.findall(br'(\d+)\s*\(([^)]*)\)',raw[start+1:raw.rindex(b')')])
+    sizes  = np.array([int(n) for n,labs in faces],dtype=int)
+    labels = np.array(b' '.join(labs for n,labs in faces).split(),dtype=int)
+    return np.concatenate(([0],np.cumsum(sizes))),labels
+
+def readMesh(meshDir):
+    """ the polyMesh as a dictionary of arrays (points, offsets, labels,
+        owner, neighbour) and sizes (nCells, nPoints)"""
+    mesh = {'points'    : readField(os.path.join(meshDir,'points'),3,'scalar'),
+            'owner'     : readField(os.path.join(meshDir,'owner')),
+            'neighbour' : readField(os.path.join(meshDir,'neighbour'))}
+    mesh['offsets'],mesh['labels'] = readFaces(os.path.join(meshDir,'faces'))
+    mesh['nCells']  = mesh['owner'].max() + 1
+    mesh['nPoints'] = len(mesh['points'])
+    return mesh
+
+def readInternalField(fileName,nCells):
+    """ internal field of the volScalarField or volVectorField (nCells or
+        nCells x 3 array)"""
+    raw        = mapRaw(fileName)
+    header,pos = readHeader(raw)
+    nComp      = 3 if 'Vector' in header.get('class','') else 1
+    match      = fieldRe.search(raw,pos)
+    if match.group(1) == b'uniform':
+        value = np.array(unifRe.match(raw,match.end()).group(1).split(),dtype=float)
+        return np.tile(value,(nCells,1)) if nComp > 1 else np.repeat(value,nCells)
+    return readList(raw,match.end(),header,nComp,'scalar')[0]
+
+def timeDirs(caseDir,fieldName='alpha.liquid'):
+    """ names of the time directories containing the field (sorted by
+        the time, the 0 directory included)"""
+    times = []
+    for name in os.listdir(caseDir):
+        try:
+            time = float(name)
+        except ValueError:
+            continue
+        fileName = os.path.join(caseDir,name,fieldName)
+        if os.path.isfile(fileName) or os.path.isfile(fileName + '.gz'):
+            times.append((time,name))
+    return [name for time,name in sorted(times)]
+
+def cellCentres(meshDir):
+    """ approximate cell centres of the mesh (nCells x 3 array)"""
+    return meshCentres(readMesh(meshDir))
+
+def meshCentres(mesh):
+    """ approximate cell centres of the read mesh (nCells x 3 array)"""
+    points,offsets,labels = mesh['points'],mesh['offsets'],mesh['labels']
+    owner,neighbour       = mesh['owner'],mesh['neighbour']
+    nCells    = mesh['nCells']
+    nInt      = len(neighbour)
+
+    # -- face centres (average of the face points)
+    sizes     = np.diff(offsets)
+    fCentres  = np.add.reduceat(points[labels],offsets[:-1],axis=0)/sizes[:,None]
+
+    # -- cell centres (average of the face centres)
+    nFaces    = np.bincount(owner,minlength=nCells) + np.bincount(neighbour,minlength=nCells)
+    centres   = np.zeros((nCells,3))
+    for k in range(3):
+        centres[:,k] = (np.bincount(owner,fCentres[:,k],nCells) +
+                        np.bincount(neighbour,fCentres[:nInt,k],nCells))
+    return centres/nFaces[:,None]
+
+#WRITING================================================================
+def fmtList(values):
+    """ nonuniform List entry of the scalar or vector values"""
+    values = np.asarray(values)
+    if values.ndim == 1:
+        body = '\n'.join('%.10g'%val for val in values.tolist())
+        tp   = 'scalar'
+    else:
+        body = '\n'.join('(%.10g %.10g %.10g)'%tuple(val) for val in values.tolist())
+        tp   = 'vector'
+    return 'nonuniform List<%s> \n%d\n(\n%s\n)\n'%(tp,len(values),body)
+
+def writeInternalField(fileName,values):
+    """ replace the internalField of the field file (boundaryField and
+        the rest of the file are kept)"""
+    fDict = FoamDict(fileName)
+    fDict.set('internalField',fmtList(values))
+    fDict.write()
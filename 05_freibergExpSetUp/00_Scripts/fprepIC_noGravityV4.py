@@ -35,6 +35,12 @@
 #    throughout its derivation
 #  - prepares also the inlet part of the geometry (based on an
 #    approximated empirical model
+#  - if the mesh is already available (meshDir, e.g. from the mesh
+#    cache), the same regions are evaluated directly at the cell
+#    centres and written as nonuniform internalField of alpha.liquid, U
+#    and p_rgh in 0.org, setFieldsDict is emptied (setFields has to
+#    test each region against each cell, which is very slow for the
+#    fine meshes)
 #
 # USAGE:
 #  - it is a function callable by caseConstructor
@@ -66,55 +72,58 @@ def fprepIC_noGravity(caseDir,                                          #case di
             liqName,l,                                                  #model defining properties
             alpha,L,nCellsX,H,nCellsZ,                                  #geometrical and meshing parameters
             pltFlag,                                                    #output plots
+            meshDir=None,                                               #polyMesh for the direct initialization
+            tabDir=None,                                                #tabulated model solutions
         ):
     #IMPORT BLOCK=======================================================
     import math
     import numpy as np
     #~ from scipy.optimize import fsolve                                   #NAE solver
-    from scipy.integrate import odeint                                      #ODE solver
     import matplotlib.pyplot as plt
     
     #IMPORT BLOCK-CUSTOM================================================
     from dfluidData import dfluidData
+    from ffoamDict import FoamDict
+    from fpolyMesh import cellCentres,writeInternalField
+    from frivuletWidth import rivuletWidth                              #model ODE (solved or tabulated)
     
     #LOCAL FUNCTIONS====================================================
-    def writeCylinder(h,a,x,deltaX):
-        # function returning list o strings to write cylinderToCell entry
-        # into setFieldsDict file
+    def bulkFormat(template,*cols):
+        # function formatting the template by each row of the columns
+        # at once (the columns are arrays of the same length)
+        rows = np.column_stack(cols)
+        return (template*len(rows))%tuple(rows.ravel().tolist())
+        
+    def writeCylinders(h,a,x,deltaX):
+        # function returning list of strings to write cylinderToCell
+        # entries into setFieldsDict file (h,a,x are arrays)
         R   = h/2.0 + a**2.0/(2.0*h)                                    #cylinder diameter
         d   = R - h                                                     #how much bellow the plate is the cylinder center
         
-        # -- create the strings to return
-        cellStr = []
-        cellStr.append('\tcylinderToCell\n\t\t{\n')                     #entry openning lines
-        
-        cellStr.append('\t\t\tp1 (%5.5e %5.5e %5.5e);\n'%(x,0.0,-d))
-        cellStr.append('\t\t\tp2 (%5.5e %5.5e %5.5e);\n'%(x+deltaX,0.0,-d))
-        cellStr.append('\t\t\tradius %5.5e;\n\n'%R)
-        
-        cellStr.append('\t\t\tfieldValues\n\t\t\t(\n')
-        cellStr.append('\t\t\t\tvolScalarFieldValue alpha.liquid 1\n\t\t\t);\n')
+        cellStr = ('\tcylinderToCell\n\t\t{\n'                        #entry openning lines
+                   '\t\t\tp1 (%5.5e %5.5e %5.5e);\n'
+                   '\t\t\tp2 (%5.5e %5.5e %5.5e);\n'
+                   '\t\t\tradius %5.5e;\n\n'
+                   '\t\t\tfieldValues\n\t\t\t(\n'
+                   '\t\t\t\tvolScalarFieldValue alpha.liquid 1\n\t\t\t);\n'
+                   '\t\t}\n')                                         #entry ending line
         
-        cellStr.append('\t\t}\n')                                       #entry ending line
-            
-        return cellStr
-        
-    def writeBox(h,deltah,a,x,deltaX,UVec,p_rgh):
-        # function returning list of strings to write boxToCell entry into
-        # setFieldsDict file
-        
-        cellStr = []
-        cellStr.append('\tboxToCell\n\t\t{\n')                              #entry openning lines
-        
-        cellStr.append('\t\t\tbox (%5.5e %5.5e %5.5e) (%5.5e %5.5e %5.5e);\n\n'%(x,-a,h,x+deltaX,a,h+deltah))
-        
-        cellStr.append('\t\t\tfieldValues\n\t\t\t(\n')
-        cellStr.append('\t\t\t\tvolVectorFieldValue U (%5.5e %5.5e %5.5e)\n'%tuple(UVec))
-        cellStr.append('\t\t\t\tvolScalarFieldValue p_rgh %5.5e\n\t\t\t);\n'%p_rgh)
+        zero = np.zeros(len(x))
+        return [bulkFormat(cellStr,x,zero,-d,x+deltaX,zero,-d,R)]
         
-        cellStr.append('\t\t}\n')                                           #entry ending line
+    def writeBoxes(h,deltah,a,x,deltaX,u,p_rgh):
+        # function returning list of strings to write boxToCell entries
+        # into setFieldsDict file (all the arguments except of deltah and
+        # deltaX are arrays, u is the x component of the velocity)
+        cellStr = ('\tboxToCell\n\t\t{\n'                             #entry openning lines
+                   '\t\t\tbox (%5.5e %5.5e %5.5e) (%5.5e %5.5e %5.5e);\n\n'
+                   '\t\t\tfieldValues\n\t\t\t(\n'
+                   '\t\t\t\tvolVectorFieldValue U (%5.5e %5.5e %5.5e)\n'
+                   '\t\t\t\tvolScalarFieldValue p_rgh %5.5e\n\t\t\t);\n'
+                   '\t\t}\n')                                         #entry ending line
         
-        return cellStr
+        zero = np.zeros(len(x))
+        return [bulkFormat(cellStr,x,-a,h,x+deltaX,a,h+deltah,u,zero,zero,p_rgh)]
         
     def writeBoxAlpha(h,deltah,a,x,deltaX,alpha):
         # function returning list of strings to write boxToCell entry into
@@ -151,6 +160,55 @@ def fprepIC_noGravity(caseDir,                                          #case di
         
         return cellStr
 
+    def uniformValue(fileName):
+        # function returning the uniform value of the internalField
+        # (0 if the field is not uniform)
+        val = FoamDict(fileName).get('internalField','uniform 0').split(None,1)
+        if val[0] != 'uniform':
+            return 0.0
+        return np.array(val[1].strip('()').split(),dtype=float)
+        
+    def directIC(C,x,aList,h0List,betaList,h):
+        # function evaluating the regions of setFieldsDict directly at the
+        # cell centres C, returns alpha.liquid, U and p_rgh
+        xC,yC,zC= C[:,0],C[:,1],C[:,2]
+        
+        # -- fill in the inlet by liquid (rotatedBoxToCell)
+        origin  = np.array([-h,-10.0,0.0])
+        edges   = np.array([[-10/np.tan(alpha),0,-10],[0,20,0],[10,0,-10/np.tan(alpha)]]).T
+        stu     = np.linalg.solve(edges,(C - origin).T)                  #coordinates in the box edges
+        alphaL  = np.all((stu >= 0.0) & (stu <= 1.0),axis=0).astype(float)
+        
+        U       = np.tile(uniformValue(caseDir + './0.org/U'),(len(C),1))
+        p_rgh   = uniformValue(caseDir + './0.org/p_rgh')*np.ones(len(C))
+        
+        # -- slices of the rivulet containing the cell, the neighbouring
+        #    slices may overlap (the later one wins, as in setFields)
+        iLast   = np.searchsorted(x,xC,'right') - 1
+        nBack   = int(math.ceil(deltaX/np.min(np.diff(x))))
+        for k in range(nBack,-1,-1):
+            i       = iLast - k
+            inX     = (i >= 0) & (i < nCellsX)
+            i       = np.clip(i,0,nCellsX-1)
+            inX    &= xC <= x[i] + deltaX
+            a,h0,beta = aList[i],h0List[i],betaList[i]
+            
+            # -- phase fraction (cylinderToCell)
+            R       = h0/2.0 + a**2.0/(2.0*h0)                          #cylinder diameter
+            d       = R - h0                                            #how much bellow the plate is the cylinder center
+            alphaL[inX & (yC**2.0 + (zC + d)**2.0 <= R**2.0)] = 1.0
+            
+            # -- velocity and pressure (boxToCell)
+            j       = np.floor(zC/deltaZ)
+            zJ      = j*deltaZ                                          #bottom of the box
+            with np.errstate(invalid='ignore'):
+                c   = np.sqrt((R-(h0-zJ)/2.0)*8.0*(h0-zJ))              #current rivulet width
+            inBox   = inX & (j >= 1) & (j < np.ceil(nCellsZ*h0/H)) & (np.abs(yC) <= c)
+            U[inBox,0]   = (rho*g*np.sin(alpha)/(2.0*mu)*(2.0*h0*zJ - zJ**2.0))[inBox]
+            p_rgh[inBox] = (np.tan(beta)/a*sigma)[inBox]
+        
+        return alphaL,U,p_rgh
+
     ##CONSTANTS=========================================================
     # -- other physical properties
     g       = 9.81                                                      #gravity
@@ -165,21 +223,11 @@ def fprepIC_noGravity(caseDir,                                          #case di
     #MODEL DEFINITION=======================================================
     # -- constants
     psi     = np.power(105.0*mu*Q0 / (4.0*rho*g*np.sin(alpha)),0.3333)
-    varpi   = 2.0*mu/(rho*g*np.sin(alpha)*l**2.0)
     
     # -- functions
     betaFunc= lambda a      : np.arctan(np.divide(psi,a**1.3333))
     h0Func  = lambda a,beta : 2.0*np.multiply(a,np.tan(beta)/2.0)
-    
-    # -- model ODE (to be solved numerically)
-    def model(a,x):
-        beta = betaFunc(a)
-        dadx = 1.0*beta**3.0*sigma*varpi/(9.0*mu*np.log(a/(2.0*np.exp(2.0)*l)))
-        return dadx
-        
-    def jac(a,x):
-        dfun = -(1.0/9.0)*np.arctan(psi/a**4.0)**2.0*sigma*(np.arctan(psi/a**4.0)*(a**8.0+psi**2.0)-12.0*a**4.0*psi*(ln(2.0)+2.0-ln(a/l)))*varpi/(mu*(ln(2.0)+2.0-ln(a/l))**2.0*(a**8.0+psi**2.0)*a)
-        return dfun
+
     
     #SETFIELDSDICT EDITING==============================================
     with open(caseDir + './system/setFieldsDict', 'r') as file:
@@ -205,36 +253,57 @@ def fprepIC_noGravity(caseDir,                                          #case di
     #~ # -- connect the liquid in inlet with the liquid in rivulet
     #~ auxData.extend(writeRotBoxAlpha([0,-a0,h],[-10*np.tan(alpha),0,-10],[0,2*a0,0],[10,0,-10*np.tan(alpha)],1.0))
     
-    # -- solve the model ODE
+    # -- solve the model ODE (a(-h) = a0, interpolated if tabulated)
     x       = np.linspace(-h,L,nCellsX+int(round(nCellsX*h/L))+1)       #create solution grid
-    aList   = odeint(model,a0,x,Dfun=jac,printmessg=True)               #solve the system
+    aList   = rivuletWidth(x,Q0,alpha,liqName,l,tabDir=tabDir)          #solve the system
     
     # -- auxiliary calculations
     betaList = betaFunc(aList)
     h0List   = h0Func(aList,betaList)
             
-    # -- extend the list by the cylinders (gas-liquid interface position)
-    for i in range(nCellsX):
-        # -- prepare the phase fraction fields
-        cellStr = writeCylinder(h0List[i],aList[i],x.item(i),deltaX)
-        auxData.extend(cellStr)
-        # -- prepare the velocity field - as boxes
-        R = h0List.item(i)/2.0 + aList.item(i)**2.0/(2.0*h0List.item(i))
-        for j in range(1,int(math.ceil(nCellsZ*h0List.item(i)/H))):
-            uVec    = [rho*g*np.sin(alpha)/(2.0*mu)*(2.0*h0List.item(i)*j*deltaZ - (j*deltaZ)**2.0),0.0,0.0]
-            #~ p_rgh   = rho*g*np.cos(alpha)*(h0List.item(i) - (j*deltaZ)) + np.tan(betaList.item(i))/aList.item(i)*sigma
-            p_rgh   = np.tan(betaList.item(i))/aList.item(i)*sigma
-            # -- get the current rivulet width (at height j*deltaZ)
-            c       = np.sqrt((R-(h0List.item(i)-j*deltaZ)/2.0)*8.0*(h0List.item(i)-j*deltaZ))
-            cellStr = writeBox(j*deltaZ,deltaZ,c,x.item(i),deltaX,uVec,p_rgh)
-            auxData.extend(cellStr)
-        
-    # -- extend the list by the rest of the lines
-    auxData.extend(data[regsLine+2::])
-    
-    # rewrite the setFieldsDict file
-    with open(caseDir + './system/setFieldsDict', 'w') as file:
-        file.writelines( auxData )
+    # -- direct initialization (the mesh is available)
+    if meshDir is not None:
+        C       = cellCentres(meshDir)
+        alphaL,U,p_rgh = directIC(C,x,aList.ravel(),h0List.ravel(),betaList.ravel(),h)
+        writeInternalField(caseDir + './0.org/alpha.liquid',alphaL)
+        writeInternalField(caseDir + './0.org/U',U)
+        writeInternalField(caseDir + './0.org/p_rgh',p_rgh)
+        
+        fDict   = FoamDict(caseDir + './system/setFieldsDict')          #nothing left for setFields
+        fDict.set('defaultFieldValues','(\n)')
+        fDict.set('regions','(\n)')
+        fDict.write()
+    else:
+        # -- extend the list by the cylinders (gas-liquid interface position)
+        xS      = x[:nCellsX]                                           #start of the slices
+        aS      = aList.ravel()[:nCellsX]
+        h0S     = h0List.ravel()[:nCellsX]
+        betaS   = betaList.ravel()[:nCellsX]
+        auxData.extend(writeCylinders(h0S,aS,xS,deltaX))
+        
+        # -- prepare the velocity field - as boxes, (i,j) pairs of all the
+        #    slices and of the heights bellow the rivulet surface
+        #    (cylinders only set alpha.liquid and boxes only U and p_rgh,
+        #    so the boxes may follow all the cylinders)
+        nJ      = np.ceil(nCellsZ*h0S/H).astype(int)                    #boxes in the slice: j = 1,...,nJ-1
+        jAll    = np.arange(1,max(nJ.max(),1))
+        I,J     = np.nonzero(jAll[None,:] < nJ[:,None])
+        J       = jAll[J]
+        h0,a    = h0S[I],aS[I]
+        R       = h0/2.0 + a**2.0/(2.0*h0)
+        u       = rho*g*np.sin(alpha)/(2.0*mu)*(2.0*h0*J*deltaZ - (J*deltaZ)**2.0)
+        #~ p_rgh   = rho*g*np.cos(alpha)*(h0 - (J*deltaZ)) + np.tan(betaS[I])/a*sigma
+        p_rgh   = np.tan(betaS[I])/a*sigma
+        # -- get the current rivulet width (at height j*deltaZ)
+        c       = np.sqrt((R-(h0-J*deltaZ)/2.0)*8.0*(h0-J*deltaZ))
+        auxData.extend(writeBoxes(J*deltaZ,deltaZ,c,xS[I],deltaX,u,p_rgh))
+        
+        # -- extend the list by the rest of the lines
+        auxData.extend(data[regsLine+2::])
+        
+        # rewrite the setFieldsDict file
+        with open(caseDir + './system/setFieldsDict', 'w') as file:
+            file.writelines( auxData )
         
     # PLOTTING THE CHARACTERISTICS OF PRESET SOLUTION===================
     if pltFlag:
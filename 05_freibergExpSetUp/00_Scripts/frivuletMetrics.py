@@ -0,0 +1,214 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Rivulet post-processing without ParaView - the outputs of
+#~ rivuletPostProcSaveData.py (Sgl, aLaRVec, h0Vec, epsVec, betaVec)
+#~ and the wetted area ratio aW/aT of postProcSaveData.py computed
+#~ directly from the case files (fpolyMesh reader + fisoSurface)
+#~
+#~ PROGRAM STRUCTURE (as in rivuletPostProcSaveData.py):
+#~ 1.  interface alpha.liquid = 0.5 (triangles)
+#~ 2.  outliers bounds
+#~     - zCoordMax from the interface at y = 0
+#~     - yCoordMax from the rivulet width at z = l in the middle of
+#~       the plate and its derivative (xHalf +- 5 mm)
+#~ 3.  int2Store, the interface without outliers at x >= 0
+#~     - Sgl, area of int2Store
+#~     - aLaRVec, rivulet width at z = l (aL + aR)
+#~     - h0Vec, rivulet height at y = 0
+#~     - epsVec = h0Vec./aLaRVec
+#~     - betaVec, contact angle at the rivulet edges
+#~
+#~ NOTES:
+#~  - the data are evaluated at the 1 mm stations (intersections of the
+#~    interface lines with the planes x = k*dx), only the stations
+#~    with all the data available are stored (x <= xMax - xEOmit)
+#~  - the outliers are removed by the triangle centroids (ParaView
+#~    clips the liquid and recomputes the isosurface), the height bounds
+#~    are at least 1e-3*meanMaxH above the mean height (flat interface)
+#~  - betaVec is the angle between the interface and the plate at the
+#~    edges (band 7*l <= z <= 10*l used in ParaView), the positions of
+#~    both the edges y(z) are found at 4 levels of the band and fitted
+#~    by a line (least squares), beta = atan2(1,-dy/dz) at the right
+#~    edge (mean of the two edges, > pi/2 for an overhanging edge), the
+#~    normals of the isosurface triangles are not used (jagged, biased
+#~    and mesh dependent), betaVecSm is the smoothed betaVec (splrep,
+#~    s = 0.03)
+#~  - aW is the area of the liquid (alpha.liquid >= 0.5) at z = zLev
+#~  - the case has to be reconstructed (no processor* directories)
+#~
+#~ USAGE:
+#~     python frivuletMetrics.py [caseDir [time]]                      #last time by default
+#~     res  = rivuletMetrics(mesh,alpha)
+#~     aWaT = wettedArea(mesh,alpha)
+
+#LICENSE================================================================
+#  frivuletMetrics.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import sys
+import glob
+import numpy as np
+from functools import reduce                                            #builtin in python 2 only
+from scipy.interpolate import splrep,splev                             #betaVec smoothing
+
+#IMPORT BLOCK-CUSTOM====================================================
+from fpolyMesh import readMesh,meshCentres,readInternalField,timeDirs
+from fisoSurface import (pointValues,isoSurface,marchSimplices,
+                         stationCuts,triAreas,clipArea)
+
+#PARAMETERS=============================================================
+lWet    = 3e-5                                                          #"wetting level, m"
+xEOmit  = 3e-3                                                          #distance from the plate end to omit
+dx      = 1e-3                                                          #distance of the stations
+# -- folder for saving the output data
+outDataFolder = "../05_PlateDCases/20_evPrep/10_postProcOutputs/"
+
+#AUXILIARY FUNCTIONS====================================================
+def stationValues(pts,axis,k,func):
+    """ values pts[:,axis] reduced by func (np.maximum, np.minimum,
+        np.add) for each station k, returns stations and values"""
+    stations,inv = np.unique(k,return_inverse=True)
+    init    = {np.maximum:-np.inf,np.minimum:np.inf,np.add:0.0}[func]
+    vals    = np.full(len(stations),init)
+    func.at(vals,inv,pts[:,axis])
+    return stations,vals
+
+#METRICS================================================================
+def rivuletMetrics(mesh,alpha,lWet=lWet,xEOmit=xEOmit,dx=dx,iso=0.5):
+    """ rivulet metrics of the alpha.liquid field, returns dictionary
+        with Sgl and the vectors xVec,aLaRVec,h0Vec,epsVec,betaVec,
+        betaVecSm"""
+    centres = meshCentres(mesh)
+    tris    = isoSurface(mesh,centres,pointValues(mesh,alpha),alpha,iso)[0]
+    xMax    = mesh['points'][:,0].max()
+    xHalf   = xMax/2
+
+    # -- 1. proper scaling for zCoord (interface at y = 0)
+    y0Pts   = marchSimplices(tris,tris[...,1],0.0)[0].reshape(-1,3)
+    y0Pts   = y0Pts[y0Pts[:,2] >= 0.0]
+    meanMaxH,sigMaxH = y0Pts[:,2].mean(),y0Pts[:,2].std()
+    hTol    = 1e-3*meanMaxH                                             #flat interface, sigMaxH ~ roundoff
+    zCoordMax = meanMaxH + max(30*3*sigMaxH,hTol)
+
+    # -- 2. proper scaling for yCoord (width and its derivative at xHalf)
+    lev     = marchSimplices(tris,tris[...,2],lWet)[0]                  #interface at z = l
+    aHalf   = np.abs(marchSimplices(lev,lev[...,0],xHalf)[0][:,0,1]).mean()
+    mid     = lev.mean(axis=1)
+    dxSeg   = lev[:,1,0] - lev[:,0,0]
+    stripe  = (np.abs(mid[:,0] - xHalf) <= 5e-3)&(dxSeg != 0.0)
+    dadx    = np.abs((lev[stripe,1,1] - lev[stripe,0,1])/dxSeg[stripe])
+    dadx    = dadx[dadx <= 0.1]                                         #abs(DaDx) <= 0.1
+    yCoordMax = aHalf + (dadx.mean() + 3*dadx.std())*xHalf
+
+    # -- 3. interface without outliers (int2Store)
+    cent    = tris.mean(axis=1)
+    keep    = (cent[:,0] >= 0.0)&(cent[:,2] <= zCoordMax)&(np.abs(cent[:,1]) <= yCoordMax)
+    keep    = keep&(triAreas(tris) > 0.0)                               #degenerated triangles
+    int2Store = tris[keep]
+    Sgl     = triAreas(int2Store).sum()
+    kMax    = np.floor((xMax - xEOmit)/dx + 1e-6)                        #omit the plate end
+
+    # -- aLaRVec (width at z = l)
+    lev     = marchSimplices(int2Store,int2Store[...,2],lWet)[0]
+    pts,_,k = stationCuts(lev,0,dx)
+    kA,yMax = stationValues(pts[:,0],1,k,np.maximum)
+    kA,yMin = stationValues(pts[:,0],1,k,np.minimum)
+    both    = (yMax > 0.0)&(yMin < 0.0)                                 #both edges found
+    kA,aLaR = kA[both],(yMax - yMin)[both]
+
+    # -- h0Vec (height at y = 0, without the waves)
+    y0      = marchSimplices(int2Store,int2Store[...,1],0.0)[0]
+    y0      = y0[y0[...,2].max(axis=1) <= meanMaxH + max(3*3*sigMaxH,hTol)]
+    pts,_,k = stationCuts(y0,0,dx)
+    kH,h0   = stationValues(pts[:,0],2,k,np.maximum)
+
+    # -- betaVec (angle of the interface at the edges, slope of the edge
+    #    positions y(z) fitted across the band 7*l <= z <= 10*l)
+    zBand   = lWet*np.linspace(7.0,10.0,4)                              #levels of the band
+    edges   = []
+    for zLev in zBand:
+        lev     = marchSimplices(int2Store,int2Store[...,2],zLev)[0]
+        pts,_,k = stationCuts(lev,0,dx)
+        kZ,yMax = stationValues(pts[:,0],1,k,np.maximum)
+        kZ,yMin = stationValues(pts[:,0],1,k,np.minimum)
+        both    = (yMax > 0.0)&(yMin < 0.0)
+        edges.append((kZ[both],yMax[both],yMin[both]))
+    kB      = reduce(np.intersect1d,[kZ for kZ,yMax,yMin in edges]) #edges found at all the levels
+    yR      = np.array([yMax[np.searchsorted(kZ,kB)] for kZ,yMax,yMin in edges])
+    yL      = np.array([yMin[np.searchsorted(kZ,kB)] for kZ,yMax,yMin in edges])
+    zDev    = (zBand - zBand.mean())[:,None]
+    dydzR   = (zDev*yR).sum(axis=0)/(zDev**2).sum()                     #least squares slopes
+    dydzL   = (zDev*yL).sum(axis=0)/(zDev**2).sum()
+    beta    = 0.5*(np.arctan2(1.0,-dydzR) + np.arctan2(1.0,dydzL))      #mean of the two edges
+
+    # -- stations with all the data
+    kAll    = np.intersect1d(np.intersect1d(kA,kH),kB)
+    kAll    = kAll[(kAll >= 0)&(kAll <= kMax)]
+    aLaRVec = aLaR[np.searchsorted(kA,kAll)]
+    h0Vec   = h0[np.searchsorted(kH,kAll)]
+    betaVec = beta[np.searchsorted(kB,kAll)]
+    xVec    = kAll*dx
+    betaVecSm = betaVec.copy()
+    if len(xVec) > 3:
+        betaVecSm = splev(xVec,splrep(xVec,betaVec,k=3,s=0.03,quiet=1),der=0,ext=0)
+
+    return {'Sgl':Sgl,'xVec':xVec,'aLaRVec':aLaRVec,'h0Vec':h0Vec,
+            'epsVec':h0Vec/aLaRVec,'betaVec':betaVec,'betaVecSm':betaVecSm}
+
+def wettedArea(mesh,alpha,zLev=1.0e-6,iso=0.5):
+    """ wetted to total area ratio aW/aT (liquid at z = zLev, slightly
+        above the plate level, rectangular and non-textured plate)"""
+    centres = meshCentres(mesh)
+    points  = mesh['points']
+    tris,vals = isoSurface(mesh,centres,points[:,2],centres[:,2],zLev,
+                           pointValues(mesh,alpha),alpha)
+    aW      = clipArea(tris,vals,iso)
+    aT      = np.ptp(points[:,0])*np.ptp(points[:,1])
+    return aW/aT
+
+#RESULTS STORING========================================================
+def saveMetrics(res,caseName,outDataFolder=outDataFolder):
+    """ postProcVecs_ file and Sgl_ file (as rivuletPostProcSaveData)"""
+    colNames = ['xVec','aLaRVec','h0Vec','epsVec','betaVec','betaVecSm']
+    with open(outDataFolder + 'postProcVecs_' + caseName,'w') as file:
+        file.write('\t'.join(colNames) + '\t\n')
+        for row in zip(*[res[colName] for colName in colNames]):
+            file.write('\t'.join("%5.5e"%el for el in row) + '\t\n')
+    for fileNm in glob.glob("Sgl_*"):                                   #clear previous results
+        os.remove(fileNm)
+    open("Sgl_%.6f_m2"%res['Sgl'],'w').close()
+
+#PROGRAM ITSELF=========================================================
+if __name__ == '__main__':
+    caseDir = sys.argv[1] if len(sys.argv) > 1 else '.'
+    os.chdir(caseDir)
+    time    = sys.argv[2] if len(sys.argv) > 2 else timeDirs('.')[-1]   #last time by default
+    mesh    = readMesh('constant/polyMesh')
+    alpha   = readInternalField(os.path.join(time,'alpha.liquid'),mesh['nCells'])
+    res     = rivuletMetrics(mesh,alpha)
+    caseName= [name.split('.OpenFOAM')[0] for name in glob.glob('*.OpenFOAM')]
+    caseName= caseName[0] if caseName else os.path.basename(os.getcwd())
+    if os.path.isdir(outDataFolder):
+        saveMetrics(res,caseName)
+    print('time %s, Sgl = %.6e m2, aW/aT = %5.5f'%(time,res['Sgl'],wettedArea(mesh,alpha)))
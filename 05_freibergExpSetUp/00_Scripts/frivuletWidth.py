@@ -0,0 +1,154 @@
+#!/usr/bin/python
+
+#FILE DESCRIPTION=======================================================
+#~ Rivulet half width evolution a(x) of the surrogate model used in
+#~ fprepIC_noGravity (ISOZ), solved for many parameter sets at once and
+#~ tabulated on the disk
+#~
+#~ MODEL:
+#~     da/dx  = beta**3*sigma*varpi/(9*mu*ln(a/(2*e**2*l)))
+#~     beta   = arctan(psi/a**(4/3))
+#~     psi    = (105*mu*Q0/(4*rho*g*sin(alpha)))**(1/3)
+#~     varpi  = 2*mu/(rho*g*sin(alpha)*l**2)
+#~     a(-h)  = 2*h*sqrt(3)/3, h = 2*pi/(5*alpha)*(6*Q0**2/g)**0.2
+#~
+#~ NOTES:
+#~  - the right hand side does not depend on x, the solution is stored
+#~    as a function of the distance from the inlet s = x - x[0]
+#~  - solveWidth solves all the parameter sets as one system with
+#~    the diagonal (banded) analytic Jacobian
+#~  - tables: one file per liquid and l, grid of Q0 x alpha, a(s) is
+#~    interpolated linearly in (log(Q0),alpha) and in s (the default
+#~    table: relative error of a bellow 0.2 %), the loaded tables are
+#~    kept in memory
+#~  - the direct solution of one case takes ~1 ms, the tables are
+#~    meant for the parameter scans and the large sweeps
+#~  - rivuletWidth uses the table if it exists and covers the case,
+#~    otherwise the model is solved directly
+#~
+#~ USAGE:
+#~     tabulate('DC05',3e-5,np.logspace(-7.5,-5,101),np.linspace(0.2,1.5,65),0.32,401,tabDir)
+#~     aList = rivuletWidth(x,Q0,alpha,'DC05',3e-5,tabDir=tabDir)
+
+#LICENSE================================================================
+#  frivuletWidth.py
+#
+#  Copyright 2016 Martin Isoz <martin@Poctar>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#
+
+#IMPORT BLOCK===========================================================
+import os
+import math
+import numpy as np
+from scipy.integrate import odeint                                      #ODE solver
+
+#IMPORT BLOCK-CUSTOM====================================================
+from dfluidData import dfluidData
+
+#CONSTANTS==============================================================
+g       = 9.81                                                          #gravity
+tables  = {}                                                            #loaded tables (by file name)
+
+#MODEL==================================================================
+def modelPars(Q0,alpha,liqName,l):
+    """ psi and K = sigma*varpi/(9*mu) of the model (arrays for arrays)"""
+    [sigma,rho,mu,_,_,_] = dfluidData(liqName)
+    Q0,alpha= np.asarray(Q0,dtype=float),np.asarray(alpha,dtype=float)
+    psi     = np.power(105.0*mu*Q0/(4.0*rho*g*np.sin(alpha)),0.3333)
+    varpi   = 2.0*mu/(rho*g*np.sin(alpha)*l**2.0)
+    return psi,sigma*varpi/(9.0*mu)
+
+def inletWidth(Q0,alpha):
+    """ height of the liquid surface at the inlet and initial half width"""
+    h       = 2.0*math.pi/(5.0*np.asarray(alpha))*(6.0*np.asarray(Q0)**2.0/g)**0.2
+    return h,2.0*h*np.sqrt(3.0)/3.0
+
+def rhs(a,x,psi,K,l):
+    """ da/dx (vectorized over the parameter sets)"""
+    beta = np.arctan(psi/a**1.3333)
+    return K*beta**3.0/np.log(a/(2.0*np.exp(2.0)*l))
+
+def jac(a,x,psi,K,l):
+    """ d(da/dx)/da, the diagonal of the Jacobian (row of the banded
+        matrix for odeint with ml = mu = 0)"""
+    beta = np.arctan(psi/a**1.3333)
+    lnA  = np.log(a/(2.0*np.exp(2.0)*l))
+    dBeta= -1.3333*psi*a**(-2.3333)/(1.0 + psi**2.0*a**(-2.6666))
+    return (K*(3.0*beta**2.0*dBeta/lnA - beta**3.0/(a*lnA**2.0))).reshape(1,-1)
+
+def solveWidth(s,a0,psi,K,l):
+    """ a(s) for all the parameter sets (a0,psi,K arrays of the same
+        length), returns len(s) x len(a0) array"""
+    a0,psi,K = np.broadcast_arrays(np.atleast_1d(a0),np.atleast_1d(psi),np.atleast_1d(K))
+    return odeint(rhs,a0,s,args=(psi,K,l),Dfun=jac,ml=0,mu=0)
+
+#TABLES=================================================================
+def tableName(tabDir,liqName,l):
+    return os.path.join(tabDir,'rivuletWidth_%s_l%g.npz'%(liqName,l))
+
+def tabulate(liqName,l,Q0s,alphas,sMax,nS,tabDir):
+    """ solve the model on the Q0s x alphas grid and store it"""
+    Q0,alpha = [arr.ravel() for arr in np.meshgrid(Q0s,alphas,indexing='ij')]
+    psi,K    = modelPars(Q0,alpha,liqName,l)
+    s        = np.append(0.0,np.geomspace(1e-3*sMax,sMax,nS-1))        #dense near the inlet
+    aTab     = solveWidth(s,inletWidth(Q0,alpha)[1],psi,K,l)
+    if not os.path.isdir(tabDir):
+        os.makedirs(tabDir)
+    np.savez(tableName(tabDir,liqName,l),Q0s=Q0s,alphas=alphas,s=s,
+             a=aTab.T.reshape(len(Q0s),len(alphas),nS))
+
+def interpWidth(table,s,Q0,alpha):
+    """ a(s) interpolated from the table (None if out of the range)"""
+    lQ0s,alphas = np.log(table['Q0s']),table['alphas']
+    if (not lQ0s[0] <= np.log(Q0) <= lQ0s[-1] or not alphas[0] <= alpha <= alphas[-1]
+            or s[-1] > table['s'][-1]):
+        return None
+    i    = int(np.clip(np.searchsorted(lQ0s,np.log(Q0)) - 1,0,len(lQ0s)-2))
+    j    = int(np.clip(np.searchsorted(alphas,alpha) - 1,0,len(alphas)-2))
+    wQ   = (np.log(Q0) - lQ0s[i])/(lQ0s[i+1] - lQ0s[i])
+    wA   = (alpha - alphas[j])/(alphas[j+1] - alphas[j])
+    aS   = ((1-wQ)*(1-wA)*table['a'][i,j] + wQ*(1-wA)*table['a'][i+1,j] +
+            (1-wQ)*wA*table['a'][i,j+1] + wQ*wA*table['a'][i+1,j+1])
+    return np.interp(s,table['s'],aS)
+
+def rivuletWidth(x,Q0,alpha,liqName,l,a0=None,tabDir=None):
+    """ rivulet half width at x (x[0] is the inlet), from the table in
+        tabDir or solved (always solved for the non-default a0)"""
+    s  = np.asarray(x) - x[0]
+    if a0 is None:
+        a0 = inletWidth(Q0,alpha)[1]
+        fileName = tableName(tabDir,liqName,l) if tabDir else ''
+        if fileName not in tables and os.path.isfile(fileName):
+            with np.load(fileName) as table:
+                tables[fileName] = dict((key,table[key]) for key in table.files)
+        if fileName in tables:
+            aList = interpWidth(tables[fileName],s,Q0,alpha)
+            if aList is not None:
+                return aList
+    psi,K = modelPars(Q0,alpha,liqName,l)
+    return solveWidth(s,a0,psi,K,l)[:,0]
+
+#PROGRAM ITSELF=========================================================
+if __name__ == '__main__':
+    # -- precompute the tables for the liquids used in the sweeps
+    tabDir  = '../rivuletTables/'
+    for liqName in ['DC05','DC10']:
+        tabulate(liqName,3.0e-5,np.logspace(-7.5,-5.0,101),np.linspace(10,90,65)*math.pi/180,
+                 0.32,401,tabDir)
+        print('table ' + tableName(tabDir,liqName,3.0e-5) + ' written')
@@ -28,9 +28,17 @@
     #~ - still unfinished BUT improvement
     #~ - colors the rivulet by its hFun (same as in exp Data)
     #~ - coloring, <0,1.93> mm (corresponds to calibration cell)
+    #~ - run by pvbatch (no GUI), the script opens the case itself and
+    #~   only computes and stores the data (parts 1-3), no views and
+    #~   representations are created and nothing is rendered
+    #~ - timeSeries = True (pvbatch), the metrics are evaluated in all the
+    #~   written times with the same pipeline (part E)
+    #~ - the slices are fetched from the pipeline directly to numpy
+    #~   (no temporary csv files in the case directory)
     
 #~ USAGE:
    #~ paraFoam --script=./rivuletPostProcSaveData.py
+   #~ pvbatch ./rivuletPostProcSaveData.py
 
 #~ OUTPUT:
     #~ modified row in iF_scalDataFile
@@ -39,6 +47,9 @@
     #~ postProcVecs_iF_caseSpec
         #~ ... file containing the vector outputs that I am interested in
             #~ aLaRVec,h0Vec,epsVec,betaLVec,betaRVec
+    #~ postProcTS_iF_caseSpec (timeSeries = True)
+        #~ ... time, Sgl, xVec, aLaRVec, h0Vec, epsVec, betaVec for all
+            #~ the written times (one row per time and xVec)
     #~ File content and structure:
         #~ Q0 = NUM (in m3/s)
         #~ Sgl = NUM (in m2)
@@ -89,114 +100,183 @@ xEOmit = 3e-3                                                           #distanc
 outDataFolder = "../05_PlateDCases/20_evPrep/10_postProcOutputs/"
 # -- file for saving the scalar outputs
 scalDataFile  = "iF_scalDataFile"
+# -- pvbatch, metrics in all the written times (time series file)
+timeSeries    = False
 
 #=======================================================================
 # IMPORT BLOCK
-#~ try: paraview.simple
-#~ except: from paraview.simple import *
+try: paraview.simple                                                    #paraFoam --script
+except NameError: from paraview.simple import *                         #pvbatch
 import math
 import glob
 import os
-# csv files handling
-import sys
-import csv
-import operator
 # function data smoothing (betaVec)
 from scipy.interpolate import splrep,splev
 import numpy as np
+# vtk arrays -> numpy arrays
+try: from paraview.vtk.util import numpy_support
+except ImportError: from vtk.util import numpy_support
 
 #=======================================================================
 # FUNCTIONS DEFINITIONS
 # FUNCTION TO EXTRACT DATA FROM PARAVIEW SOURCE
 def fExtractVec(source2Write,dataType,sortColName,intColsNames):
-    # function will go through the source2Write paraview source, sort it
-    # in accordance to sortCol and return sortCol as list and intCols as
-    # list of lists
+    # function will fetch the source2Write paraview source, reduce it to
+    # the 1 mm stations of sortCol, sort it in accordance to sortCol and
+    # return sortCol and intCols as numpy arrays
     #
     # INPUTS:
     #   source2Write    ... paraview source
-    #   dataType        ... what to write, can be "Points" or "Cells"
+    #   dataType        ... what to extract, "Point Data" or "Cell Data"
     #   sortColName     ... name of the column to sort the data
     #   intColsNames    ... name of the columns that I am interested in
+    #                       (names as in the csv export - 'Points:0',
+    #                       'U:2', 'hFun', ...)
     #
     # OUTPUTS:
     #   outs            ... list with sortCol as 1st element and intCols
     #                       as rest of the values
     #
-    # NOTE: The function creates a temporary csv file
-    fileNm   = "./tempFile.csv"
+    # NOTE: sortCol is returned at the stations (exact multiples of mm),
+    #       the points with the same station keep their original order
+    data   = fFetch(source2Write)                                       #vtkPolyData (in memory)
+    points = data.GetPoints()
+    fields = data.GetCellData() if dataType == "Cell Data" else data.GetPointData()
     
-    dataWriter = CreateWriter(fileNm,source2Write)                           #create writer object
-    dataWriter.FieldAssociation = "Points" # or "Cells"
-    dataWriter.UpdatePipeline()
+    def fColumn(colName):
+        arrName,sep,comp = colName.partition(':')                      #'U:2' -> 'U', 2
+        if arrName == 'Points':
+            arr = points.GetData() if points else None
+        else:
+            arr = fields.GetArray(arrName)
+        if arr is None or arr.GetNumberOfTuples() == 0:
+            return np.zeros(0)
+        arr = numpy_support.vtk_to_numpy(arr)
+        return arr[:,int(comp)] if sep else arr
     
-    del dataWriter
+    xMM    = 1e3*fColumn(sortColName).astype(np.float64)               #sortCol in mm (float32 points)
+    station= np.rint(xMM)
+    onSt   = np.abs(xMM - station) < 1e-3                               #data every mm (!! MESH SIZE !!)
+    order  = np.argsort(station[onSt],kind='mergesort')                 #numerical sort, stable
     
-    # -- modify the resulting csv file (standard python)
-    # Note: 1. I need to sort the data by x-coordinate (column end-2)
-    #       2. I need to add always 2 values of aFunRes
-    
-    
-    with open("tempFile0.csv","rb") as csvfile:
-        reader = csv.reader(csvfile, delimiter=",")
-        colTitles = reader.next()                                       #save column names
-        sortCol   = colTitles.index(sortColName)                        #I want to sort by sortColName
-        intCols   = [colTitles.index(cNm) for cNm in intColsNames]      #get positions of data that I am interested in
-        
-        prepList  = []                                                      #read the data
-        for row in reader:
-            prepList.append(row)
-            
-    redList = [row for row in prepList if 1e3*float(row[sortCol]) % 1 == 0] #data every mm (!! MESH SIZE !!)
-    
-    # sort columns of the list
-    sortedList = sorted(redList, key=operator.itemgetter(sortCol), reverse=False)
-    
-    # get the informations that I am interested in
-    outCols= [sortCol]                                                  #create list of indexes that I want to return (initiate with independent variable)
-    outCols= [outCols.append(cInd) for cInd in intCols]                 #append the indexes of the colums that I am interested in
-    outs   = [[row[sortCol] for row in sortedList]]                     #initiate outs by putting in the column of independet variable
-    for col in intCols:                                                 #add the columns I am interested in
-        outs.append([row[col] for row in sortedList])
-    
-    os.remove("tempFile0.csv")                                          #remove the temporary file
+    outs   = [1e-3*station[onSt][order]]                                #independent variable
+    for cNm in intColsNames:                                            #add the columns I am interested in
+        outs.append(fColumn(cNm)[onSt][order])
     
     return outs                                                         #return the result
+
+# FUNCTIONS FOR THE DESCRIPTIVE STATISTICS AND OUTPUT VECTORS
+def fStats(descStats):
+    # mean and std. dev. from the primary statistics table
+    RowData = fFetch(descStats).GetRowData()                            #1st table, primary statistics
+    return RowData.GetArray(4).GetValue(0),RowData.GetArray(5).GetValue(0)
+
+def fHalfWidth(aHalfRiv):
+    # mean rivulet half width at the slice (should be only 2 points)
+    aHalfData = fFetch(aHalfRiv).GetPointData().GetArray('aFunPlateLev')#get yCoords/aFun (vtkArray)
+    aHalfVals = [aHalfData.GetTuple1(i) for i in range(aHalfData.GetNumberOfTuples())]
+    return sum(aHalfVals)/len(aHalfVals)                                #calculate mean value
+
+def fRivuletVecs(xVecALARVec,xVecH0Vec,xVecBetaVec):
+    # output vectors from the extracted data (xVec,aLaRVec,h0Vec,epsVec
+    # and betaVec)
+    # CALCULATE EPSVEC (HEIGHT TO WIDTH RIVULET RATIO)==================
+    # Note: purely orientational results, obtained through various not so
+    #       bulletproof methods
+    nData     = min(len(xVecALARVec[0][::2]),len(xVecH0Vec[0]))         #get number of available data
+    xVec      = [float(s) for s in xVecH0Vec[0]]                        #independent variable
+    aLaRVec   = [float(x)+float(y) for (x,y) in zip(xVecALARVec[1][:-1:2],xVecALARVec[1][1::2])]#total rivulet width
+    # Note: I need to sum every 2 elements
+    h0Vec     = [float(s) for s in xVecH0Vec[1]]                        #rivulet height at y=0
+    # -- clip the lists to the same length (nData)
+    xVec,aLaRVec,h0Vec = xVec[:nData],aLaRVec[:nData],h0Vec[:nData]
+    # -- calculate rivulet height to width ratio
+    epsVec    = [h0Vec[i]/aLaRVec[i] for i in range(nData)]             #rivulet height to width ratio
+
+    # -- calculate means of measured values (for each distance from plate top)
+    stations,inv = np.unique(xVecBetaVec[0],return_inverse=True)       #stations of the beta values
+    betaVec   = (np.bincount(inv,xVecBetaVec[1])/np.bincount(inv)).tolist()#mean at each station
+    return xVec,aLaRVec,h0Vec,epsVec,betaVec
+
+# FUNCTIONS FOR THE GUI/BATCH RUNS
+def fFetch(source):
+    # update the source in the current time and fetch its data (the
+    # first leaf block)
+    source.UpdatePipeline(cTime)
+    return fLeafBlock(servermanager.Fetch(source))
+
+def fShow(source,**props):
+    # GUI: show the source and set the properties of its representation
+    # pvbatch: only update the source in the current time (no view)
+    if batchMode:
+        source.UpdatePipeline(cTime)
+        return None
+    representation = Show(source)
+    for prop in props:
+        setattr(representation,prop,props[prop])
+    return representation
+
+def fRender():
+    if not batchMode:
+        Render()
+
+def fLeafBlock(data):
+    # first non-composite block of the fetched data (the depth of the
+    # multiblock tree depends on the OpenFOAM reader)
+    while data.IsA('vtkMultiBlockDataSet'):
+        data = data.GetBlock(0)
+    return data
     
 #=======================================================================
 # POSTPROCESSING INITIATION
 mainCase = glob.glob('./*.OpenFOAM')                                     #works only for the cases with 1 foam file
 
-paraview.simple._DisableFirstRenderCameraReset()
+batchMode = GetActiveSource() is None                                   #pvbatch, nothing opened by paraFoam
+
+if batchMode:
+    # open the case with the OpenFOAM reader, go to the last time step
+    activeSource_OpenFOAM = OpenFOAMReader( FileName=mainCase[0], guiName=mainCase[0][2::] )
+    activeSource_OpenFOAM.CellArrays  = ['alpha.liquid', 'p_rgh', 'U']
+    activeSource_OpenFOAM.MeshRegions = ['internalMesh']
+    activeSource_OpenFOAM.UpdatePipelineInformation()
+    tSteps = list(activeSource_OpenFOAM.TimestepValues)                 #written times
+    cTime  = tSteps[-1]                                                 #last time step
+    cTimeStr = '%g'%cTime                                               #as in the file names
+    activeSource_OpenFOAM.UpdatePipeline(cTime)
+else:
+    paraview.simple._DisableFirstRenderCameraReset()
 
-activeSource_OpenFOAM = GetActiveSource()
+    activeSource_OpenFOAM = GetActiveSource()
 
-# enable all available fields
-activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
+    # enable all available fields
+    activeSource_OpenFOAM.VolumeFields = ['alpha.liquid', 'p_rgh', 'U']
 
-# show all for internal mesh
-activeSource_OpenFOAM.MeshParts = ['internalMesh']
+    # show all for internal mesh
+    activeSource_OpenFOAM.MeshParts = ['internalMesh']
 
-# I dont want to see the main mesh / I do want to see it as transparent wireframe
-allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
-allIntMeshRepresentation.Visibility = 1
-allIntMeshRepresentation.Representation = 'Wireframe'
-allIntMeshRepresentation.Opacity = 0.1
+    # I dont want to see the main mesh / I do want to see it as transparent wireframe
+    allIntMeshRepresentation = GetDisplayProperties( activeSource_OpenFOAM )
+    allIntMeshRepresentation.Visibility = 1
+    allIntMeshRepresentation.Representation = 'Wireframe'
+    allIntMeshRepresentation.Opacity = 0.1
 
-# set up black background (seems prettier)
-RenderView1 = GetRenderView()
-RenderView1.UseTexturedBackground = 0
-RenderView1.Background = [0.0, 0.0, 0.0]
+    # set up black background (seems prettier)
+    RenderView1 = GetRenderView()
+    RenderView1.UseTexturedBackground = 0
+    RenderView1.Background = [0.0, 0.0, 0.0]
 
-Render()
+    Render()
 
-activeSource_OpenFOAM = FindSource( mainCase[0][2::] )                  #remove ./ from the name
+    activeSource_OpenFOAM = FindSource( mainCase[0][2::] )                  #remove ./ from the name
 
-# GO TO THE ANIMATION (TIME RANGE) END==================================
-AnimationScene1 = GetAnimationScene()
-AnimationScene1.GoToLast()
+    # GO TO THE ANIMATION (TIME RANGE) END==============================
+    AnimationScene1 = GetAnimationScene()
+    AnimationScene1.GoToLast()
 
-Render()
+    Render()
+    
+    cTime   = float("%s"%AnimationScene1.GetProperty('AnimationTime'))  #get current time
+    cTimeStr= "%s"%AnimationScene1.GetProperty('AnimationTime')         #as in the file names
 
 # CREATE A SCALAR CLIP - STORE ONLY THE RIVULET=========================
 liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
@@ -204,10 +284,7 @@ liqOnly = Clip( ClipType="Scalar", guiName="liqOnly" )
 liqOnly.Scalars = ['POINTS', 'alpha.liquid']
 liqOnly.Value = 0.5                                                     #alpha.liquid >= 0.5
 
-liqOnlyRepresentation = Show()
-
-liqOnlyRepresentation.Opacity = 1.0
-liqOnlyRepresentation.Visibility = 0
+liqOnlyRepresentation = fShow(liqOnly,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -222,10 +299,7 @@ intOnly = Contour( PointMergeMethod="Uniform Binning", guiName="intOnly" )
 intOnly.ContourBy  = ['POINTS', 'alpha.liquid']
 intOnly.Isosurfaces = [0.501]                                             #alpha.liquid = 0.5
 
-intOnlyRepresentation = Show()
-
-intOnlyRepresentation.Opacity = 1.0
-intOnlyRepresentation.Visibility = 0
+intOnlyRepresentation = fShow(intOnly,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -236,8 +310,7 @@ zBaseLineRiv = Clip( ClipType="Plane", guiName="zBaseLineRiv")
 zBaseLineRiv.ClipType.Origin = [0.0, 0.0, 0.0]
 zBaseLineRiv.ClipType.Normal = [0.0, 0.0, 1.0]
 
-zBaseLineRivRepresentation = Show()
-zBaseLineRivRepresentation.Visibility = 0
+zBaseLineRivRepresentation = fShow(zBaseLineRiv,Visibility=0)
 
 #~ Render()
 
@@ -248,8 +321,7 @@ yBaseLineRiv.SliceOffsetValues = [0.0]
 yBaseLineRiv.SliceType.Origin = [0.0, 0.0, 0.0]
 yBaseLineRiv.SliceType.Normal = [0.0, 1.0, 0.0]
 
-yBaseLineRivRepresentation = Show()
-yBaseLineRivRepresentation.Visibility = 0
+yBaseLineRivRepresentation = fShow(yBaseLineRiv,Visibility=0)
 
 #~ Render()
 
@@ -259,8 +331,7 @@ hFunScale     = Calculator( guiName="hFunScale" )
 hFunScale.Function = 'coordsZ'
 hFunScale.ResultArrayName = 'hFun'
 
-hFunScaleRepresentation = Show()
-hFunScaleRepresentation.Visibility = 0
+hFunScaleRepresentation = fShow(hFunScale,Visibility=0)
 
 #~ Render()
 
@@ -271,12 +342,7 @@ descStatsZ.AttributeMode = 'Point Data'
 descStatsZ.VariablesofInterest = ['hFun']
 descStatsZ.TrainingFraction    = 0.5                                     #use 50% of the available data
 
-sData = servermanager.Fetch(descStatsZ)
-
-RowData = sData.GetBlock(0).GetBlock(0).GetBlock(0).GetRowData()        #there must be a more direct approach
-
-meanMaxH= RowData.GetArray(4).GetValue(0)                               #mean of riv. height at centerline
-sigMaxH = RowData.GetArray(5).GetValue(0)                               #std. dev of riv. height at centerline
+meanMaxH,sigMaxH = fStats(descStatsZ)                                   #mean and std. dev of riv. height at centerline
 zCoordMax  = meanMaxH + 30*3*sigMaxH
 
 #~ Render()
@@ -290,8 +356,7 @@ plateLevel.SliceOffsetValues = [0.0]
 plateLevel.SliceType.Origin = [0.0, 0.0, lWet]
 plateLevel.SliceType.Normal = [0.0, 0.0, 1.0]
 
-plateLevelRepresentation = Show()
-plateLevelRepresentation.Visibility = 0
+plateLevelRepresentation = fShow(plateLevel,Visibility=0)
 
 #~ Render()
 
@@ -301,15 +366,13 @@ aFunRivPlateLev   = Calculator( guiName="aFunRivPlateLev" )
 aFunRivPlateLev.Function = 'abs(coordsY)'
 aFunRivPlateLev.ResultArrayName = 'aFunPlateLev'
 
-aFunRivPlateLevRepresentation = Show()
-aFunRivPlateLevRepresentation.Visibility = 0
+aFunRivPlateLevRepresentation = fShow(aFunRivPlateLev,Visibility=0)
 
 #~ Render()
 
 # GET THE RIVULET WIDTH AT HALF OF THE PLATE============================
 # -- get plate length (xMax)
-allData = servermanager.Fetch(activeSource_OpenFOAM)
-xMax    = allData.GetBlock(0).GetBlock(0).GetBounds()
+xMax    = activeSource_OpenFOAM.GetDataInformation().GetBounds()        #no need to fetch the whole mesh
 xMax    = xMax[1]                                                       #(xMin,xMax,yMin,yMax,zMin,zMax)
 xHalf   = xMax/2                                                        #half of the plate
 # -- use slice at x=xHalf (should be only 2 points)
@@ -320,23 +383,12 @@ aHalfRiv.SliceOffsetValues = [0.0]
 aHalfRiv.SliceType.Origin = [xHalf, 0.0, 0.0]
 aHalfRiv.SliceType.Normal = [1.0, 0.0, 0.0]
 
-aHalfRivRepresentation = Show()
-aHalfRivRepresentation.Visibility = 0
+aHalfRivRepresentation = fShow(aHalfRiv,Visibility=0)
 
 #~ Render()
 
-# -- get values from the container (again, quite ugly way)
-aHalfData = servermanager.Fetch(aHalfRiv)                                     #fetch the variable
-aHalfData = aHalfData.GetBlock(0).GetBlock(0)                                 #extract vtkPolyData
-aHalfData = aHalfData.GetPointData().GetArray(4)                              #get yCoords/aFun (vtkArray)
-
-nVals  = aHalfData.GetNumberOfTuples()                                     #should be 2, but better safe then sorry
-
-aHalfVals = []
-for i in range(nVals):
-    aHalfVals.append(aHalfData.GetTuple1(i))                                  #store the data
-
-aHalfAvg  = sum(aHalfVals)/nVals                                              #calculate mean value
+# -- get values from the container
+aHalfAvg  = fHalfWidth(aHalfRiv)
 
 # PREPARE A THIN STRIPE OF DATA FOR DADX(XHALF) CALCULATION=============
 SetActiveSource(aFunRivPlateLev)                                        #work with aFun at plate level
@@ -346,17 +398,15 @@ aFunRivPlatePartTop = Clip( ClipType="Plane", guiName="aFunRivPlatePartTop")
 aFunRivPlatePartTop.ClipType.Origin = [xHalf-5e-3, 0.0, 0.0]
 aFunRivPlatePartTop.ClipType.Normal = [1.0, 0.0, 0.0]
 
-aFunRivPlatePartTopRepresentation = Show()
-aFunRivPlatePartTopRepresentation.Visibility = 0
-Render()
+aFunRivPlatePartTopRepresentation = fShow(aFunRivPlatePartTop,Visibility=0)
+fRender()
 # -- prepare the bottom clip
 aFunRivPlatePartBot = Clip( ClipType="Plane", guiName="aFunRivPlatePartBot")
 
 aFunRivPlatePartBot.ClipType.Origin = [xHalf+5e-3, 0.0, 0.0]
 aFunRivPlatePartBot.ClipType.Normal = [-1.0, 0.0, 0.0]
 
-aFunRivPlatePartBotRepresentation = Show()
-aFunRivPlatePartBotRepresentation.Visibility = 0
+aFunRivPlatePartBotRepresentation = fShow(aFunRivPlatePartBot,Visibility=0)
 
 #~ Render()
 
@@ -366,8 +416,7 @@ aFunRivPlateLevGrad  = GradientOfUnstructuredDataSet( guiName="aFunRivPlateLevGr
 aFunRivPlateLevGrad.ScalarArray     = ['POINTS','aFunPlateLev']
 aFunRivPlateLevGrad.ResultArrayName = 'aFunPlateLevGrad'
 
-aFunRivPlateLevGradRepresentation = Show()
-aFunRivPlateLevGradRepresentation.Visibility = 0
+aFunRivPlateLevGradRepresentation = fShow(aFunRivPlateLevGrad,Visibility=0)
 
 #~ Render()
 
@@ -377,8 +426,7 @@ dadxABS     = Calculator( guiName="dadxABS" )
 dadxABS.Function = 'abs(aFunPlateLevGrad_X)'
 dadxABS.ResultArrayName = 'dadxABS'
 
-dadxABSRepresentation = Show()
-dadxABSRepresentation.Visibility = 0
+dadxABSRepresentation = fShow(dadxABS,Visibility=0)
 
 #~ Render()
 
@@ -389,10 +437,7 @@ dadxABSle1.Scalars = ['POINTS', 'dadxABS']
 dadxABSle1.Value = 0.1                                                  #abs(DaDx) <= 0.1
 dadxABSle1.InsideOut = 1
 
-dadxABSle1Representation = Show()
-
-dadxABSle1Representation.Opacity = 1.0
-dadxABSle1Representation.Visibility = 0
+dadxABSle1Representation = fShow(dadxABSle1,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -403,12 +448,7 @@ descStatsY.AttributeMode = 'Point Data'
 descStatsY.VariablesofInterest = ['dadxABS']
 descStatsY.TrainingFraction    = 1.0                                     #use 50% of the available data
 
-sData = servermanager.Fetch(descStatsY)
-
-RowData = sData.GetBlock(0).GetBlock(0).GetBlock(0).GetRowData()        #there must be a more direct approach
-
-meanDaDx= RowData.GetArray(4).GetValue(0)                               #mean of riv. height at centerline
-sigDaDx = RowData.GetArray(5).GetValue(0)                               #std. dev of riv. height at centerline
+meanDaDx,sigDaDx = fStats(descStatsY)                                   #mean and std. dev of abs(DaDx)
 dadxMax  = meanDaDx + 3*sigDaDx
 
 #~ Render()
@@ -427,8 +467,7 @@ hFunRiv     = Calculator( guiName="hFunRiv" )
 hFunRiv.Function = 'coordsZ'
 hFunRiv.ResultArrayName = 'hFun'
 
-hFunRivRepresentation = Show()
-hFunRivRepresentation.Visibility = 0
+hFunRivRepresentation = fShow(hFunRiv,Visibility=0)
 
 #~ Render()
 
@@ -439,10 +478,7 @@ rivWOZOut.Scalars   = ['POINTS', 'hFun']
 rivWOZOut.Value     = zCoordMax                                            #hFun <= zCoordMax
 rivWOZOut.InsideOut = 1
 
-rivWOZOutRepresentation = Show()
-
-rivWOZOutRepresentation.Opacity = 1.0
-rivWOZOutRepresentation.Visibility = 0
+rivWOZOutRepresentation = fShow(rivWOZOut,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -453,8 +489,7 @@ aFunRiv     = Calculator( guiName="aFunRiv" )
 aFunRiv.Function = 'abs(coordsY)'
 aFunRiv.ResultArrayName = 'aFun'
 
-aFunRivRepresentation = Show()
-aFunRivRepresentation.Visibility = 0
+aFunRivRepresentation = fShow(aFunRiv,Visibility=0)
 
 #~ Render()
 # REMOVE OUTLIERS (IN Y-DIRECTION)======================================
@@ -464,10 +499,7 @@ rivWOAOut.Scalars   = ['POINTS', 'aFun']
 rivWOAOut.Value     = yCoordMax                                          #aFun <= yCoordMax
 rivWOAOut.InsideOut = 1
 
-rivWOAOutRepresentation = Show()
-
-rivWOAOutRepresentation.Opacity = 1.0
-rivWOAOutRepresentation.Visibility = 0
+rivWOAOutRepresentation = fShow(rivWOAOut,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -478,10 +510,7 @@ intOnlyWAOoutL = Contour( PointMergeMethod="Uniform Binning", guiName="intOnlyWA
 intOnlyWAOoutL.ContourBy  = ['POINTS', 'alpha.liquid']
 intOnlyWAOoutL.Isosurfaces = [0.501]                                             #alpha.liquid = 0.5
 
-intOnlyWAOoutLRepresentation = Show()
-
-intOnlyWAOoutLRepresentation.Opacity = 1.0
-intOnlyWAOoutLRepresentation.Visibility = 0
+intOnlyWAOoutLRepresentation = fShow(intOnlyWAOoutL,Opacity=1.0,Visibility=0)
 
 #~ Render()
 
@@ -491,20 +520,17 @@ int2Store = Clip( ClipType="Plane", guiName="int2Store" )
 int2Store.ClipType.Origin = [0.0, 0.0, 0.0]
 int2Store.ClipType.Normal = [1.0, 0.0, 0.0]
 
-int2StoreRepresentation = Show()
-int2StoreRepresentation.Visibility = 1
-Render()
+int2StoreRepresentation = fShow(int2Store,Visibility=1)
+fRender()
 
 # WRITE DATA TO CSV FILE================================================
 # -- only current (last) time step
 # -- only the interface (for MATLAB interface size calculation)
 
-cTime   = float("%s"%AnimationScene1.GetProperty('AnimationTime'))      #get current time
-
 fileNm   = ( 
             "./matlabDATA/GLI_"
             +
-            "%s"%AnimationScene1.GetProperty('AnimationTime')
+            cTimeStr
             +
             "s.csv"
           )
@@ -513,7 +539,7 @@ source2Write = int2Store                                                #set whi
 
 dataWriter = CreateWriter(fileNm,source2Write)                           #create writer object
 dataWriter.FieldAssociation = "Points" # or "Cells"
-dataWriter.UpdatePipeline()
+dataWriter.UpdatePipeline(cTime)
 
 del dataWriter
 
@@ -524,6 +550,7 @@ del dataWriter
 SetActiveSource( int2Store )                                            #ensure proper active source
 
 integrateVars = IntegrateVariables( guiName = "integrateVars")          #create the filter
+integrateVars.UpdatePipeline(cTime)
 
 Sgl = integrateVars.GetCellDataInformation().GetArray('Area').GetRange(0)#dig out data
 Sgl = Sgl[0]                                                            #command above returns tupple
@@ -548,8 +575,7 @@ int2StorePlateLevel.SliceType.Origin = [0.0, 0.0, lWet]
 int2StorePlateLevel.SliceType.Normal = [0.0, 0.0, 1.0]
 int2StorePlateLevel.Triangulatetheslice = 0
 
-int2StorePlateLevelRepresentation = Show()
-int2StorePlateLevelRepresentation.Visibility = 0
+int2StorePlateLevelRepresentation = fShow(int2StorePlateLevel,Visibility=0)
 #~ Render()
 
 # -- create filter (clip) at x = L-xEOmit mm (get rid of the plate end)
@@ -558,8 +584,7 @@ int2StorePlateLevelMOD = Clip ( ClipType="Plane", guiName="int2StorePlateLevelMO
 int2StorePlateLevelMOD.ClipType.Origin = [xMax-xEOmit, 0.0, 0.0]
 int2StorePlateLevelMOD.ClipType.Normal = [-1.0, 0.0, 0.0]
 
-int2StorePlateLevelMODRepresentation = Show()
-int2StorePlateLevelMODRepresentation.Visibility = 0
+int2StorePlateLevelMODRepresentation = fShow(int2StorePlateLevelMOD,Visibility=0)
 
 # -- calculate rivulet half widths
 aFunRivRes   = Calculator( guiName="aFunRivRes" )
@@ -567,15 +592,13 @@ aFunRivRes   = Calculator( guiName="aFunRivRes" )
 aFunRivRes.Function = 'abs(coordsY)'
 aFunRivRes.ResultArrayName = 'aFunRes'
 
-aFunRivResRepresentation = Show()
-aFunRivResRepresentation.Visibility = 0
+aFunRivResRepresentation = fShow(aFunRivRes,Visibility=0)
 
 #~ Render()
 
 #-----------------------------------------------------------------------
-# Note: work with vtk poly anything is utterly painful =>
-#       => save the desired data as temporary csv file, work with them
-#          and reload them again after (the data are not that big)
+# Note: the data are fetched from the pipeline and worked with as numpy
+#       arrays (no temporary files)
 # -- exported to a function (will be used multiple times)
 
 xVecALARVec = fExtractVec(aFunRivRes,'Point Data','Points:0',['aFunRes'])
@@ -592,9 +615,8 @@ y0Int.SliceOffsetValues = [0.0]
 y0Int.SliceType.Origin = [0.0, 0.0, 0.0]
 y0Int.SliceType.Normal = [0.0, 1.0, 0.0]
 
-y0IntRepresentation = Show()
-y0IntRepresentation.Visibility = 0
-Render()
+y0IntRepresentation = fShow(y0Int,Visibility=0)
+fRender()
 
 # -- create filter (clip) at x = L-xEOmit mm (get rid of the plate end)
 y0IntMOD = Clip ( ClipType="Plane", guiName="y0IntMOD")
@@ -602,8 +624,7 @@ y0IntMOD = Clip ( ClipType="Plane", guiName="y0IntMOD")
 y0IntMOD.ClipType.Origin = [xMax-xEOmit, 0.0, 0.0]
 y0IntMOD.ClipType.Normal = [-1.0, 0.0, 0.0]
 
-y0IntMODRepresentation = Show()
-y0IntMODRepresentation.Visibility = 0
+y0IntMODRepresentation = fShow(y0IntMOD,Visibility=0)
 
 # -- calculate rivulet height
 hFunRivResPREP     = Calculator( guiName="hFunRivResPREP" )
@@ -611,8 +632,7 @@ hFunRivResPREP     = Calculator( guiName="hFunRivResPREP" )
 hFunRivResPREP.Function = 'coordsZ'
 hFunRivResPREP.ResultArrayName = 'hFunRes'
 
-hFunRivResPREPRepresentation = Show()
-hFunRivResPREPRepresentation.Visibility = 0
+hFunRivResPREPRepresentation = fShow(hFunRivResPREP,Visibility=0)
 
 #~ Render()
 
@@ -625,34 +645,18 @@ hFunRivRes.Scalars   = ['POINTS', 'hFun']
 hFunRivRes.Value     = meanMaxH + 3*3*sigMaxH                        #higher than it should be - waves
 hFunRivRes.InsideOut = 1
 
-hFunRivResRepresentation = Show()
-hFunRivResRepresentation.Visibility = 0
+hFunRivResRepresentation = fShow(hFunRivRes,Visibility=0)
 
 #~ Render()
 
 # -- extract the data and save it as h0Vec (rivulet height at centerline)
 #-----------------------------------------------------------------------
-# Note: work with vtk poly anything is utterly painful =>
-#       => save the desired data as temporary csv file, work with them
-#          and reload them again after (the data are not that big)
+# Note: the data are fetched from the pipeline and worked with as numpy
+#       arrays (no temporary files)
 # -- exported to a function (will be used multiple times)
 
 xVecH0Vec = fExtractVec(hFunRivRes,'Point Data','Points:0',['hFun'])
 
-# CALCULATE EPSVEC (HEIGHT TO WIDTH RIVULET RATIO)======================
-# Note: purely orientational results, obtained through various not so
-#       bulletproof methods
-nData     = min(len(xVecALARVec[0][::2]),len(xVecH0Vec[0]))             #get number of available data
-xVec      = [float(s) for s in xVecH0Vec[0]]                            #independent variable
-aLaRVec   = [float(x)+float(y) for (x,y) in zip(xVecALARVec[1][:-1:2],xVecALARVec[1][1::2])]#total rivulet width
-# Note: I need to sum every 2 elements
-h0Vec     = [float(s) for s in xVecH0Vec[1]]                            #rivulet height at y=0
-# -- clip the lists to the same length (nData)
-xVec,aLaRVec,h0Vec = xVec[:nData],aLaRVec[:nData],h0Vec[:nData]
-# -- calculate rivulet height to width ratio
-epsVec    = [h0Vec[i]/aLaRVec[i] for i in range(nData)]                 #rivulet height to width ratio
-
-
 # CALCULATE BETA#VEC (RIVULET DYNAMIC CONTACT ANGLES====================
 SetActiveSource( int2Store )                                            #ensure proper active source
 
@@ -662,8 +666,7 @@ int2StoreAboveLWet = Clip ( ClipType="Plane", guiName="int2StoreAboveLWet")
 int2StoreAboveLWet.ClipType.Origin = [0.0, 0.0, 7*lWet]
 int2StoreAboveLWet.ClipType.Normal = [0.0, 0.0, 1.0]
 
-int2StoreAboveLWetRepresentation = Show()
-int2StoreAboveLWetRepresentation.Visibility = 0
+int2StoreAboveLWetRepresentation = fShow(int2StoreAboveLWet,Visibility=0)
 
 # -- create filter (clip) for z <= 0.1 mm (only rivulet edges)
 int2StoreAboveLWet = Clip ( ClipType="Plane", guiName="int2StoreAboveLWet")
@@ -671,8 +674,7 @@ int2StoreAboveLWet = Clip ( ClipType="Plane", guiName="int2StoreAboveLWet")
 int2StoreAboveLWet.ClipType.Origin = [0.0, 0.0, 10*lWet]
 int2StoreAboveLWet.ClipType.Normal = [0.0, 0.0, -1.0]
 
-int2StoreAboveLWetRepresentation = Show()
-int2StoreAboveLWetRepresentation.Visibility = 0
+int2StoreAboveLWetRepresentation = fShow(int2StoreAboveLWet,Visibility=0)
 
 # -- calculate rivulet height
 hFunRivBeta     = Calculator( guiName="hFunRivBeta" )
@@ -680,10 +682,9 @@ hFunRivBeta     = Calculator( guiName="hFunRivBeta" )
 hFunRivBeta.Function = 'coordsZ'
 hFunRivBeta.ResultArrayName = 'hFunBeta'
 
-hFunRivBetaRepresentation = Show()
-hFunRivBetaRepresentation.Visibility = 0
+hFunRivBetaRepresentation = fShow(hFunRivBeta,Visibility=0)
 
-Render()
+fRender()
 
 # -- calculate gradients (I need dhdy)
 hFunRivBetaGrad  = GradientOfUnstructuredDataSet( guiName="hFunRivBetaGrad" )
@@ -691,10 +692,9 @@ hFunRivBetaGrad  = GradientOfUnstructuredDataSet( guiName="hFunRivBetaGrad" )
 hFunRivBetaGrad.ScalarArray     = ['POINTS','hFunBeta']
 hFunRivBetaGrad.ResultArrayName = 'hFunBetaGrad'
 
-hFunRivBetaGradRepresentation = Show()
-hFunRivBetaGradRepresentation.Visibility = 0
+hFunRivBetaGradRepresentation = fShow(hFunRivBetaGrad,Visibility=0)
 
-Render()
+fRender()
 
 # -- convert to absolute values and calculate atan (tan\beta = h')
 absBetaRes     = Calculator( guiName="absBetaRes" )
@@ -702,30 +702,21 @@ absBetaRes     = Calculator( guiName="absBetaRes" )
 absBetaRes.Function = 'atan(abs(hFunBetaGrad_Z))'
 absBetaRes.ResultArrayName = 'absBetaRes'
 
-absBetaResRepresentation = Show()
-absBetaResRepresentation.Visibility = 0
+absBetaResRepresentation = fShow(absBetaRes,Visibility=0)
 
-Render()
+fRender()
 
 # -- extract the data and save it as h0Vec (rivulet height at centerline)
 #-----------------------------------------------------------------------
-# Note: work with vtk poly anything is utterly painful =>
-#       => save the desired data as temporary csv file, work with them
-#          and reload them again after (the data are not that big)
+# Note: the data are fetched from the pipeline and worked with as numpy
+#       arrays (no temporary files)
 # -- exported to a function (will be used multiple times)
 
 xVecBetaVec = fExtractVec(absBetaRes,'Point Data','Points:0',['absBetaRes'])
 
-# -- calculate means of measured values (for each distance from plate top)
-betaVec   = []                                                          #dirty but working
-auxVal    = float(xVecBetaVec[1][0])
-for i in range(len(xVecBetaVec[0])-1):
-    if xVecBetaVec[0][i] == xVecBetaVec[0][i+1]:
-        auxVal = auxVal + float(xVecBetaVec[1][i+1])
-    else:
-        betaVec.append(auxVal)
-        auxVal  = 0
-        
+# CALCULATE EPSVEC AND BETAVEC FROM THE EXTRACTED DATA==================
+xVec,aLaRVec,h0Vec,epsVec,betaVec = fRivuletVecs(xVecALARVec,xVecH0Vec,xVecBetaVec)
+
 # -- data smoothing (the cheating part)
 xNpArray = np.array(xVec)                                               #save as np.array
 yNpArray = np.array(betaVec)
@@ -791,128 +782,169 @@ with open(outDataFolder+solver+'_scalDataFile', 'w') as file:
 
 
 
+#=======================================================================
+# E - TIME SERIES OF THE METRICS (PVBATCH, ALL THE WRITTEN TIMES)
+# Note: the pipeline above is reused, only the data dependent values
+#       (outliers bounds, height clip) are recomputed in each time, the
+#       rows are appended to the time series file (times already in the
+#       file are skipped, it can be updated during the simulation)
+if batchMode and timeSeries:
+    tsFile  = outDataFolder + outFile.replace('postProcVecs_','postProcTS_')
+    tsDone  = set()
+    if os.path.isfile(tsFile):
+        with open(tsFile,'r') as file:
+            tsDone = set(line.split('\t')[0] for line in file.readlines()[1:])
+    else:
+        with open(tsFile,'w') as file:
+            file.write('\t'.join(['time','Sgl'] + colNames[:-1]) + '\n')
+    for cTime in tSteps:
+        if '%g'%cTime in tsDone:
+            continue
+        try:
+            # -- outliers bounds in the current time
+            meanMaxH,sigMaxH = fStats(descStatsZ)
+            meanDaDx,sigDaDx = fStats(descStatsY)
+            rivWOZOut.Value  = meanMaxH + 30*3*sigMaxH                  #zCoordMax
+            rivWOAOut.Value  = fHalfWidth(aHalfRiv) + (meanDaDx + 3*sigDaDx)*xHalf#yCoordMax
+            hFunRivRes.Value = meanMaxH + 3*3*sigMaxH
+            # -- metrics
+            integrateVars.UpdatePipeline(cTime)
+            Sgl  = integrateVars.GetCellDataInformation().GetArray('Area').GetRange(0)[0]
+            vecs = fRivuletVecs(
+                fExtractVec(aFunRivRes,'Point Data','Points:0',['aFunRes']),
+                fExtractVec(hFunRivRes,'Point Data','Points:0',['hFun']),
+                fExtractVec(absBetaRes,'Point Data','Points:0',['absBetaRes']))
+        except (ZeroDivisionError,IndexError,AttributeError):
+            print('time %g skipped, no rivulet data'%cTime)             #rivulet not yet developed
+            continue
+        with open(tsFile,'a') as file:
+            for row in zip(*vecs):
+                file.write('%g\t%5.5e\t'%(cTime,Sgl) + '\t'.join('%5.5e'%el for el in row) + '\n')
+
 #=======================================================================
 # D - DATA DESCRIPTION AND GRAPHICAL OUTPUT (FOR CONTROL)
-# SCALAR BAR============================================================
-colorObjectRepresentation = int2StoreRepresentation                #what object will be colored
+# Note: GUI only, pvbatch ends with the stored data
+if not batchMode:
+    # SCALAR BAR========================================================
+    colorObjectRepresentation = int2StoreRepresentation                #what object will be colored
 
-a0_hFun_PVLookupTable = GetLookupTableForArray( "hFun", 0,
-    RGBPoints=[0.0, 0.0, 0.0, 0.0, cellMax, 1.0, 1.0, 1.0],
-    ColorSpace='RGB',
-    ScalarRangeInitialized=1.0 )
+    a0_hFun_PVLookupTable = GetLookupTableForArray( "hFun", 0,
+        RGBPoints=[0.0, 0.0, 0.0, 0.0, cellMax, 1.0, 1.0, 1.0],
+        ColorSpace='RGB',
+        ScalarRangeInitialized=1.0 )
 
-a0_hFun_PiecewiseFunction = CreatePiecewiseFunction( Points=[0.0, 0.0, 0.5, 0.0, 1.0, 1.0, 0.5, 0.0] )
+    a0_hFun_PiecewiseFunction = CreatePiecewiseFunction( Points=[0.0, 0.0, 0.5, 0.0, 1.0, 1.0, 0.5, 0.0] )
 
-colorObjectRepresentation.Representation = 'Surface'
-colorObjectRepresentation.ColorArrayName = ('POINT_DATA', 'hFun')
-colorObjectRepresentation.LookupTable = a0_hFun_PVLookupTable
+    colorObjectRepresentation.Representation = 'Surface'
+    colorObjectRepresentation.ColorArrayName = ('POINT_DATA', 'hFun')
+    colorObjectRepresentation.LookupTable = a0_hFun_PVLookupTable
 
-a0_hFun_PVLookupTable.ScalarOpacityFunction = a0_hFun_PiecewiseFunction
+    a0_hFun_PVLookupTable.ScalarOpacityFunction = a0_hFun_PiecewiseFunction
         
-Render()
-
-ScalarBarWidgetRepresentation = CreateScalarBar( Title='$h(x,y),[\mathrm{m}]$',
- ComponentTitle='',
- LabelFontSize=12,
- Enabled=1,
- LookupTable=a0_hFun_PVLookupTable,
- TitleFontSize=14,
- LabelFormat='$%-#5.2e$')
-RenderView1.Representations.append(ScalarBarWidgetRepresentation)
+    Render()
 
-Render()
+    ScalarBarWidgetRepresentation = CreateScalarBar( Title='$h(x,y),[\mathrm{m}]$',
+     ComponentTitle='',
+     LabelFontSize=12,
+     Enabled=1,
+     LookupTable=a0_hFun_PVLookupTable,
+     TitleFontSize=14,
+     LabelFormat='$%-#5.2e$')
+    RenderView1.Representations.append(ScalarBarWidgetRepresentation)
 
-# ADD CASE TITLE========================================================
-caseTitle = Text( guiName="caseTitle")
+    Render()
 
-caseTitleRepresentation = Show()
+    # ADD CASE TITLE====================================================
+    caseTitle = Text( guiName="caseTitle")
 
-caseTitle.Text = 'Rivulet flow down an inclined plate'
+    caseTitleRepresentation = Show()
 
-caseTitleRepresentation.Bold = 1
-caseTitleRepresentation.Position = [xAll,0.90]
+    caseTitle.Text = 'Rivulet flow down an inclined plate'
 
-Render()
+    caseTitleRepresentation.Bold = 1
+    caseTitleRepresentation.Position = [xAll,0.90]
 
-# ADD CASE DESCRIPTION==================================================
-# Note: this is a major pain in the ass, but paraview cannot process
-#       multilines latex entries
+    Render()
 
-idStr = [   '$\\nu\,\,= ',
-            '$\\gamma\,\,=',
-            '$\\varrho\,\,=',
-            '$Q_0=',
-            #~ '$a_0\,=',
-            #~ '$h_0\,=',
-            #~ '$\\varepsilon\,\,\,=',
-            '$\\alpha\,\,=',
-            ]
+    # ADD CASE DESCRIPTION==============================================
+    # Note: this is a major pain in the ass, but paraview cannot process
+    #       multilines latex entries
+
+    idStr = [   '$\\nu\,\,= ',
+                '$\\gamma\,\,=',
+                '$\\varrho\,\,=',
+                '$Q_0=',
+                #~ '$a_0\,=',
+                #~ '$h_0\,=',
+                #~ '$\\varepsilon\,\,\,=',
+                '$\\alpha\,\,=',
+                ]
          
-nu0     =	[1.11e-05, 1.55e-05]
-gamma0  =	1.79e-02
-rho0    =	[9.40e+02, 1.18e+00]
-Q0      =	2.64e-06
-alpha0  =	  60
-#~ a0      =	1.70e-02
-#~ h0      =	4.26e-04
-#~ eps     =	1.00e-02
+    nu0     =	[1.11e-05, 1.55e-05]
+    gamma0  =	1.79e-02
+    rho0    =	[9.40e+02, 1.18e+00]
+    Q0      =	2.64e-06
+    alpha0  =	  60
+    #~ a0      =	1.70e-02
+    #~ h0      =	4.26e-04
+    #~ eps     =	1.00e-02
          
-valStr = [("[%s]" % ', '.join(("%4.2e" % (e)) for e in nu0)  + '\,\mathrm{m^2s^{-1}}'),
-          ("%4.2e" % (gamma0)   + '\,\mathrm{N\,m^{-1}}'),
-          ("[%s]" % ', '.join(("%4.2f" % (e)) for e in rho0) + '\,\mathrm{kg\,m^{-3}}'),
-          ("%4.2e" % (Q0)       + '\,\,\mathrm{m^{3}s^{-1}}'),
-          #~ ("%4.2e" % (a0)       + '\,\mathrm{m}'),
-          #~ ("%4.2e" % (h0)       + '\,\mathrm{m}'),
-          #~ ("%4.2e" % (eps)      + '\,-'),
-          ("%4.0f" % (alpha0)       + '\mathrm{^\circ{}}'),
-          ]
+    valStr = [("[%s]" % ', '.join(("%4.2e" % (e)) for e in nu0)  + '\,\mathrm{m^2s^{-1}}'),
+              ("%4.2e" % (gamma0)   + '\,\mathrm{N\,m^{-1}}'),
+              ("[%s]" % ', '.join(("%4.2f" % (e)) for e in rho0) + '\,\mathrm{kg\,m^{-3}}'),
+              ("%4.2e" % (Q0)       + '\,\,\mathrm{m^{3}s^{-1}}'),
+              #~ ("%4.2e" % (a0)       + '\,\mathrm{m}'),
+              #~ ("%4.2e" % (h0)       + '\,\mathrm{m}'),
+              #~ ("%4.2e" % (eps)      + '\,-'),
+              ("%4.0f" % (alpha0)       + '\mathrm{^\circ{}}'),
+              ]
          
-caseDesc = []
-caseDescRepresentation = []
+    caseDesc = []
+    caseDescRepresentation = []
 
-for i in range(len(idStr)):
-    caseDesc.append(Text())
-    caseDescRepresentation.append(Show())
+    for i in range(len(idStr)):
+        caseDesc.append(Text())
+        caseDescRepresentation.append(Show())
     
-    caseDesc[i].Text = (idStr[i] + '\t' + valStr[i]) + '$'
+        caseDesc[i].Text = (idStr[i] + '\t' + valStr[i]) + '$'
     
-    caseDescRepresentation[i].FontFamily = 'Courier'
-    caseDescRepresentation[i].FontSize = 16
-    caseDescRepresentation[i].Position = [xAll, 0.7-i*ySkip]
+        caseDescRepresentation[i].FontFamily = 'Courier'
+        caseDescRepresentation[i].FontSize = 16
+        caseDescRepresentation[i].Position = [xAll, 0.7-i*ySkip]
 
-    Render()
-#~ 
-# ADD ANOTATE TIME SOURCE===============================================
-annotTime = AnnotateTime()
+        Render()
+    #~ 
+    # ADD ANOTATE TIME SOURCE===========================================
+    annotTime = AnnotateTime()
 
-annotTimeRepresentation = Show()
+    annotTimeRepresentation = Show()
 
-annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
+    annotTime.Format = '$\mathrm{Time:\,%5.2f\,s}$'
 
-annotTimeRepresentation.FontFamily = 'Courier'
-annotTimeRepresentation.Position = [xAll, 0.025]
-annotTimeRepresentation.Visibility = 1
+    annotTimeRepresentation.FontFamily = 'Courier'
+    annotTimeRepresentation.Position = [xAll, 0.025]
+    annotTimeRepresentation.Visibility = 1
 
-Render()
+    Render()
 
-# POST RUNNING MODIFICATIONS============================================
+    # POST RUNNING MODIFICATIONS========================================
 
-#~ # try to rescale the colors for deltaf
-#~ AnimationScene1 = GetAnimationScene()
-#~ AnimationScene1.GoToLast()
-#~ 
-#~ Render()
+    #~ # try to rescale the colors for deltaf
+    #~ AnimationScene1 = GetAnimationScene()
+    #~ AnimationScene1.GoToLast()
+    #~ 
+    #~ Render()
 
-# camera position
+    # camera position
 
-ResetCamera()
-RenderView1 = GetRenderView()
-RenderView1.CameraViewUp = [-0.8, -0.5, 0]
-RenderView1.CameraFocalPoint = [0.15,-0.1,0]                               #center of the plate
-RenderView1.CameraClippingRange = [5, 5]                                #who knows what it does...
-RenderView1.CameraPosition = [0.2,0.15,0.2]
+    ResetCamera()
+    RenderView1 = GetRenderView()
+    RenderView1.CameraViewUp = [-0.8, -0.5, 0]
+    RenderView1.CameraFocalPoint = [0.15,-0.1,0]                               #center of the plate
+    RenderView1.CameraClippingRange = [5, 5]                                #who knows what it does...
+    RenderView1.CameraPosition = [0.2,0.15,0.2]
 
-Render()
+    Render()
 
 #=======================================================================    
 # DATA STRUCTURES=======================================================
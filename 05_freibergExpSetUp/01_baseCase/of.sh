@@ -28,3 +28,9 @@ cd /scratch/isozm/$caseDir
 # copy all the results back to the home folder (no need for the 'processor*' folders)
 cd ~
 rsync -a /scratch/isozm/$caseDir/ ~/$caseDir/ --exclude "processor*"
+
+# compute-only post-processing of the last time step (pvbatch, no GUI)
+cd ~/$caseDir
+if command -v pvbatch > /dev/null; then
+    pvbatch ./rivuletPostProcSaveData.py
+fi